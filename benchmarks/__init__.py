@@ -0,0 +1,8 @@
+"""End-to-end simulation benchmarks."""
+
+from .scenarios import SCENARIOS, SUITES
+from .runner import BenchmarkRunner, measure, compare_results
+from .memory import ENTITIES, bytes_per_entity
+
+__all__ = ['SCENARIOS', 'SUITES', 'BenchmarkRunner', 'measure', 'compare_results',
+           'ENTITIES', 'bytes_per_entity']
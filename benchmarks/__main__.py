@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Command line for the benchmark suite.
+
+    python -m benchmarks run [--suite quick|full] [--scenario NAME ...] [--output FILE]
+    python -m benchmarks compare BASELINE CURRENT [--threshold 0.1]
+    python -m benchmarks memory [--count 100000]
+
+``compare`` exits with status 1 if any metric regressed.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from utils.logger import setup_logger
+from .scenarios import SCENARIOS, SUITES
+from .runner import BenchmarkRunner, compare_results, load_results, save_results
+from .memory import bytes_per_entity
+
+DEFAULT_BASELINE = str(Path(__file__).parent / 'baseline.json')
+
+
+def run(args, logger) -> int:
+    names = args.scenario or SUITES[args.suite]
+    settings = json.loads(args.settings) if args.settings else {}
+    logger.info(f"Running benchmarks: {', '.join(names)}")
+
+    def report(name, result):
+        rss = f"{result['peak_rss_mb']:.1f} MiB" if result['peak_rss_mb'] is not None else 'n/a'
+        logger.info(f"{name}: {result['bots']} bots, {result['waypoints']} waypoints, "
+                    f"{result['steps_per_sec']:.1f} steps/s, {result['sim_speed']:.1f}x real time, "
+                    f"startup {result['startup_s']:.2f}s, peak RSS {rss}")
+
+    runner = BenchmarkRunner(names, seed=args.seed, repeat=args.repeat, settings=settings)
+    document = runner.run(report)
+    save_results(document, args.output)
+    logger.info(f"Results saved to: {args.output}")
+    if args.save_baseline:
+        save_results(document, args.baseline)
+        logger.info(f"Baseline saved to: {args.baseline}")
+    return 0
+
+
+def compare(args, logger) -> int:
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    if baseline.get('settings') != current.get('settings'):
+        logger.warning(f"Settings differ: baseline {baseline.get('settings')}, "
+                       f"current {current.get('settings')}")
+    rows = compare_results(baseline, current, args.threshold)
+    logger.info(f"{'scenario':<10}{'metric':<15}{'baseline':>12}{'current':>12}{'change':>9}  status")
+    for row in rows:
+        logger.info(f"{row['scenario']:<10}{row['metric']:<15}{row['baseline']:>12.3f}"
+                    f"{row['current']:>12.3f}{row['change']:>+9.1%}  {row['status']}")
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        logger.error(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    logger.info("No regressions")
+    return 0
+
+
+def memory(args, logger) -> int:
+    logger.info(f"Measuring {args.count} entities of each kind")
+    logger.info(f"{'entity':<12}{'bytes':>10}")
+    for kind, size in bytes_per_entity(args.count).items():
+        logger.info(f"{kind:<12}{size:>10.1f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='RAWSim-O end-to-end benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run benchmark scenarios')
+    run_parser.add_argument('--suite', choices=sorted(SUITES), default='quick',
+                            help='Scenario group to run (default: quick)')
+    run_parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                            help='Run only this scenario (repeatable)')
+    run_parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    run_parser.add_argument('--repeat', type=int, default=1,
+                            help='Runs per scenario; the best value of each metric is kept')
+    run_parser.add_argument('--settings', type=str,
+                            help='JSON object of settings overrides, e.g. \'{"execution_mode": "discrete_event"}\'')
+    run_parser.add_argument('--output', type=str, default='results/benchmarks.json',
+                            help='Results file')
+    run_parser.add_argument('--save-baseline', action='store_true',
+                            help='Also store the results as the baseline')
+    run_parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE,
+                            help='Baseline file written by --save-baseline')
+
+    compare_parser = commands.add_parser('compare', help='Compare results against a baseline')
+    compare_parser.add_argument('current', type=str, help='Results file to check')
+    compare_parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE,
+                                help='Baseline results file')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help='Relative change that counts as a regression (default: 0.10)')
+
+    memory_parser = commands.add_parser('memory', help='Measure bytes per simulation entity')
+    memory_parser.add_argument('--count', type=int, default=100000,
+                               help='Entities created per kind (default: 100000)')
+
+    args = parser.parse_args()
+    logger = setup_logger('RAWSim-O-Bench', level=20)
+    if args.command == 'run':
+        return run(args, logger)
+    if args.command == 'memory':
+        return memory(args, logger)
+    return compare(args, logger)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Memory footprint of the simulation entity classes."""
+
+from typing import Callable, Dict, List
+import sys
+import tracemalloc
+
+# Entity kinds measured by ``bytes_per_entity``
+ENTITIES = ('waypoint', 'bot', 'pod', 'order', 'item_bundle', 'event')
+
+
+def _factories() -> Dict[str, Callable[[int], List[object]]]:
+    """Builders creating ``count`` entities of each kind, the way a run holds them.
+
+    Entities are created without an instance rather than registered with
+    one, so only the objects themselves (and what they own) are measured.
+    Waypoints form a 4-connected grid, as laid out by the instance generator.
+    """
+    from core.bot import BotNormal
+    from core.item import ItemBundle
+    from core.order import Order
+    from core.pod import Pod
+    from core.waypoint import Waypoint
+    from simulation.events import EventType, SimulationEvent
+
+    instance = None
+
+    def waypoints(count: int) -> List[object]:
+        columns = max(int(count ** 0.5), 1)
+        created = []
+        for i in range(count):
+            waypoint = Waypoint(instance)
+            waypoint.id = waypoint.volatile_id = i
+            waypoint.x, waypoint.y = 2.0 * (i % columns), 2.0 * (i // columns)
+            if i % columns:
+                waypoint.add_path(created[i - 1])
+            if i >= columns:
+                waypoint.add_path(created[i - columns])
+            created.append(waypoint)
+        return created
+
+    def bots(count: int) -> List[object]:
+        return [BotNormal(i, instance, 0.35, 5.0, 1.0, 1.0, 2.0, 1.57, 5.0, 0.0, 0.0)
+                for i in range(count)]
+
+    def pods(count: int) -> List[object]:
+        return [Pod(instance) for _ in range(count)]
+
+    def orders(count: int) -> List[object]:
+        created = []
+        for i in range(count):
+            order = Order(i)
+            order.add_item(i % 100, 1)
+            order.add_item(i % 100 + 100, 2)
+            created.append(order)
+        return created
+
+    def item_bundles(count: int) -> List[object]:
+        return [ItemBundle(instance) for _ in range(count)]
+
+    def events(count: int) -> List[object]:
+        return [SimulationEvent(EventType.BOT_MOVED, float(i), {'bot_id': i % 100})
+                for i in range(count)]
+
+    return {'waypoint': waypoints, 'bot': bots, 'pod': pods, 'order': orders,
+            'item_bundle': item_bundles, 'event': events}
+
+
+def bytes_per_entity(count: int = 100000) -> Dict[str, float]:
+    """Allocated bytes per entity of each kind, including the containers it owns.
+
+    Measured with ``tracemalloc`` over the creation of ``count`` entities;
+    the list holding them is not counted.
+    """
+    factories = _factories()
+    results: Dict[str, float] = {}
+    for kind in ENTITIES:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        created = factories[kind](count)
+        allocated = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(created)
+        tracemalloc.stop()
+        results[kind] = allocated / count
+        del created
+    return results
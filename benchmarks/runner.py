@@ -0,0 +1,188 @@
+"""Benchmark measurement, result files and baseline comparison."""
+
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import multiprocessing
+import platform
+import sys
+import time
+
+from .scenarios import SCENARIOS
+from .workload import RoamingWorkload
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+RESULTS_VERSION = 1
+
+# Metric name -> True if higher is better
+METRICS: Dict[str, bool] = {
+    'steps_per_sec': True,
+    'sim_speed': True,
+    'startup_s': False,
+    'peak_rss_mb': False,
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(name: str, seed: int = 42, settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build and run one scenario in this process and measure it.
+
+    Idle bots are kept busy by a ``RoamingWorkload``. Startup covers instance
+    generation and the construction of executor and workload. Peak RSS is
+    the peak of the whole process, so run each scenario in a fresh process
+    (as ``BenchmarkRunner`` does) for comparable numbers.
+    """
+    from generator.instance_generator import InstanceGenerator
+    from simulation.executor import SimulationExecutor
+
+    scenario = SCENARIOS[name]
+    start = time.perf_counter()
+    instance = InstanceGenerator(seed=seed).generate_simple_warehouse(**scenario['instance'])
+    instance.setting_config.update(scenario['settings'])
+    instance.setting_config.update(settings or {})
+    instance.setting_config['seed'] = seed
+    executor = SimulationExecutor(instance)
+    workload = RoamingWorkload(executor)
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    executor.begin()
+    workload.attach()
+    steps = executor.advance()
+    executor.finish()
+    wall = time.perf_counter() - start
+
+    return {
+        'bots': len(instance.bots),
+        'waypoints': len(instance.waypoints),
+        'mode': executor.mode,
+        'steps': steps,
+        'sim_time': executor.current_time,
+        'routes': workload.routes,
+        'wall_s': wall,
+        'startup_s': startup,
+        'steps_per_sec': steps / wall if wall > 0 else None,
+        'sim_speed': executor.current_time / wall if wall > 0 else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+class BenchmarkRunner:
+    """Runs scenarios, each in a fresh worker process, and collects a results document.
+
+    With ``repeat`` > 1 the best run per metric is kept, which filters out
+    noise from other load on the machine.
+    """
+
+    def __init__(self, scenarios: List[str], seed: int = 42, repeat: int = 1,
+                 settings: Optional[Dict[str, Any]] = None):
+        unknown = [name for name in scenarios if name not in SCENARIOS]
+        if unknown:
+            raise ValueError(f"Unknown benchmark scenarios: {unknown}")
+        self.scenarios = scenarios
+        self.seed = seed
+        self.repeat = repeat
+        self.settings = settings or {}
+
+    def run(self, progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Run every scenario and return the results document."""
+        results = {}
+        context = multiprocessing.get_context('spawn')
+        for name in self.scenarios:
+            runs = []
+            for _ in range(self.repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    runs.append(pool.submit(measure, name, self.seed, self.settings).result())
+            results[name] = self._best(runs)
+            if progress:
+                progress(name, results[name])
+        return {
+            'version': RESULTS_VERSION,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'code_version': self._code_version(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': self.seed,
+            'settings': self.settings,
+            'results': results,
+        }
+
+    @staticmethod
+    def _best(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        best = dict(runs[0])
+        for run in runs[1:]:
+            for metric, higher_is_better in METRICS.items():
+                if run[metric] is None or best[metric] is None:
+                    continue
+                if (run[metric] > best[metric]) == higher_is_better:
+                    best[metric] = run[metric]
+        best['runs'] = len(runs)
+        return best
+
+    @staticmethod
+    def _code_version() -> str:
+        from simulation.sweep import code_version
+        return code_version()
+
+    def __repr__(self):
+        return f"BenchmarkRunner(scenarios={self.scenarios}, repeat={self.repeat})"
+
+
+def save_results(document: Dict[str, Any], filepath: str):
+    """Write a results document as JSON."""
+    Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def load_results(filepath: str) -> Dict[str, Any]:
+    """Read a results document."""
+    with open(filepath, 'r') as f:
+        document = json.load(f)
+    if document.get('version') != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results version: {document.get('version')}")
+    return document
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Compare two results documents metric by metric.
+
+    Each row carries the relative change (positive is better) and a status:
+    ``regression`` if a metric got worse by more than ``threshold``,
+    ``improvement`` if it got better by more than ``threshold``, else ``ok``.
+    Scenarios present in only one document are skipped.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = reference.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old if higher_is_better else (old - new) / old
+            if change < -threshold:
+                status = 'regression'
+            elif change > threshold:
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append({'scenario': name, 'metric': metric, 'baseline': old,
+                         'current': new, 'change': change, 'status': status})
+    return rows
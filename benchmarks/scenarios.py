@@ -0,0 +1,50 @@
+"""Canonical benchmark scenarios.
+
+Each scenario holds the keyword arguments of
+``InstanceGenerator.generate_simple_warehouse`` (``instance``) and the
+settings overrides to run with (``settings``). The generator lays out one
+waypoint per 2 m x 2 m cell, so a ``length`` x ``width`` warehouse has about
+``length * width / 4`` waypoints. Order generation is off: bots only
+follow the benchmark workload, as in earlier baselines.
+"""
+
+from typing import Any, Dict, List
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'tiny': {
+        'description': '10 bots, 375 waypoints',
+        'instance': {'length': 50.0, 'width': 30.0, 'num_bots': 10, 'num_pods': 50},
+        'settings': {'simulation_duration': 300.0,
+                     'order_generation': {'enabled': False}},
+    },
+    'small': {
+        'description': '50 bots, 1,500 waypoints',
+        'instance': {'length': 100.0, 'width': 60.0, 'num_bots': 50, 'num_pods': 250},
+        'settings': {'simulation_duration': 300.0,
+                     'order_generation': {'enabled': False}},
+    },
+    'medium': {
+        'description': '200 bots, 6,000 waypoints',
+        'instance': {'length': 200.0, 'width': 120.0, 'num_bots': 200, 'num_pods': 1000},
+        'settings': {'simulation_duration': 120.0,
+                     'order_generation': {'enabled': False}},
+    },
+    'large': {
+        'description': '1,000 bots, 40,000 waypoints',
+        'instance': {'length': 400.0, 'width': 400.0, 'num_bots': 1000, 'num_pods': 5000},
+        'settings': {'simulation_duration': 60.0,
+                     'order_generation': {'enabled': False}},
+    },
+    'huge': {
+        'description': '2,000 bots, 250,000 waypoints',
+        'instance': {'length': 1000.0, 'width': 1000.0, 'num_bots': 2000, 'num_pods': 20000},
+        'settings': {'simulation_duration': 30.0,
+                     'order_generation': {'enabled': False}},
+    },
+}
+
+# Named groups of scenarios; 'quick' is meant for every change, 'full' for releases
+SUITES: Dict[str, List[str]] = {
+    'quick': ['tiny', 'small', 'medium'],
+    'full': ['tiny', 'small', 'medium', 'large', 'huge'],
+}
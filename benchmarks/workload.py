@@ -0,0 +1,77 @@
+"""Synthetic workload that keeps the fleet moving during benchmarks."""
+
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.waypoint import Waypoint
+    from simulation.executor import SimulationExecutor
+
+from simulation.events import EventType
+
+
+class RoamingWorkload:
+    """Sends every available bot to a random aisle waypoint nearby.
+
+    Routes go through the executor's path planner, so a benchmark exercises
+    path planning, reservations and bot movement like task execution would,
+    independent of the order and task controllers. Bots busy with a
+    dispatcher task are left alone, should orders be enabled. Goals are drawn from the
+    ``roam_distance`` x ``roam_distance`` cell the bot is in, which keeps the
+    cost of a route comparable between small and huge warehouses.
+    """
+
+    STREAM = 'benchmark_workload'
+
+    def __init__(self, executor: 'SimulationExecutor', roam_distance: float = 20.0):
+        self.executor = executor
+        self.instance = executor.instance
+        self.roam_distance = roam_distance
+        self.routes = 0
+        self._retry_at: Dict[int, float] = {}
+
+        self._cells: Dict[Tuple[int, int], List['Waypoint']] = {}
+        self._by_position: Dict[Tuple[float, float], 'Waypoint'] = {}
+        for waypoint in self.instance.waypoints:
+            if not waypoint.paths:
+                continue
+            self._by_position[(waypoint.x, waypoint.y)] = waypoint
+            if not waypoint.pod_storage_location:
+                self._cells.setdefault(self._cell(waypoint.x, waypoint.y), []).append(waypoint)
+
+        # Generated bots stand on a waypoint but do not reference it yet
+        for bot in self.instance.bots:
+            if bot.current_waypoint is None:
+                bot.current_waypoint = self._by_position.get((bot.x, bot.y))
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.roam_distance), int(y // self.roam_distance)
+
+    def attach(self):
+        """Route available bots now and whenever the clock advances."""
+        self.assign()
+        self.executor.event_manager.subscribe(EventType.TIME_STEP, lambda event: self.assign())
+
+    def assign(self):
+        """Give every available bot a new route."""
+        available = self.executor.active_bots.available
+        if not available:
+            return
+        randomizer = self.instance.randomizer
+        now = self.executor.current_time
+        for bot in list(available):
+            start = bot.current_waypoint
+            if start is None or self._retry_at.get(bot.id, 0.0) > now:
+                continue
+            goal = randomizer.choice(self._cells.get(self._cell(start.x, start.y), []),
+                                     stream=self.STREAM)
+            if goal is None or goal is start:
+                continue
+            path = self.executor.path_planner.plan_path(bot, start, goal)
+            if path and len(path) > 1:
+                bot.path = path[1:]
+                self.routes += 1
+            else:
+                self._retry_at[bot.id] = now + 1.0  # Blocked: try again later
+
+    def __repr__(self):
+        return f"RoamingWorkload(routes={self.routes})"
@@ -1,19 +1,187 @@
 #!/usr/bin/env python3
 """Command-line interface for RAWSim-O simulation."""
 
+import os
 import sys
 import argparse
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from config.loader import ConfigLoader
 from generator.instance_generator import InstanceGenerator
 from simulation.executor import SimulationExecutor
+from simulation.checkpoint import SimulationCheckpoint
+from simulation.events import EventType
+from simulation.sweep import ParameterSweep
+from simulation.event_log import EventLogWriter, EventLogReplayer
+from simulation.control_server import ControlServer
 from statistics.tracker import StatisticsTracker
 from statistics.exporter import StatisticsExporter
+from statistics.metrics import PerformanceMetrics
 from utils.logger import setup_logger
 from utils.randomizer import RandomizerSimple
 
 
+def build_instance(args, logger, seed=None):
+    """Load or generate the instance described by the command-line arguments."""
+    if seed is None:
+        seed = args.seed
+    if args.generate or not args.instance:
+        logger.info("Generating default warehouse instance...")
+        generator = InstanceGenerator(seed=seed)
+        instance = generator.generate_simple_warehouse(
+            length=50.0, width=30.0,
+            num_bots=10, num_pods=50,
+            num_input_stations=2, num_output_stations=3
+        )
+    else:
+        logger.info(f"Loading instance from {args.instance}")
+        loader = ConfigLoader()
+        
+        instance_config = loader.load_instance_config(args.instance)
+        settings_config = loader.load_settings_config(args.setting) if args.setting else {}
+        control_config = loader.load_control_config(args.control) if args.control else {}
+        
+        # For now, generate since we don't have full instance serialization
+        generator = InstanceGenerator(seed=seed)
+        instance = generator.generate_simple_warehouse()
+        instance.setting_config.update(settings_config)
+        instance.controller_config.update(control_config)
+    
+    # Set randomizer
+    instance.randomizer = RandomizerSimple(seed)
+    instance.setting_config['seed'] = seed
+    if args.mode:
+        instance.setting_config['execution_mode'] = args.mode
+    return instance
+
+
+def run_replication(args, seed):
+    """Run one seeded replication and return its summary.
+
+    Module-level so it can be shipped to process pool workers.
+    """
+    logger = logging.getLogger('RAWSim-O.replication')
+    logger.setLevel(logging.WARNING)
+    instance = build_instance(args, logger, seed)
+    stats_tracker = StatisticsTracker(instance)
+    executor = SimulationExecutor(instance)
+    stats_tracker.track(executor)
+    executor.execute()
+    summary = stats_tracker.get_summary()
+    summary['seed'] = seed
+    return summary
+
+
+def run_replications(args, logger):
+    """Run independent replications in parallel and write an aggregate report."""
+    seeds = [args.seed + i for i in range(args.replications)]
+    workers = min(args.workers or os.cpu_count() or 1, len(seeds))
+    logger.info(f"Running {len(seeds)} replications on {workers} worker(s)...")
+    
+    if workers == 1:
+        summaries = [run_replication(args, seed) for seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(run_replication, [args] * len(seeds), seeds))
+    
+    aggregate = PerformanceMetrics.aggregate_replications(
+        [{k: v for k, v in summary.items() if k != 'seed'} for summary in summaries],
+        confidence=args.confidence
+    )
+    
+    output_dir = Path(args.output)
+    StatisticsExporter.export_to_csv(summaries, str(output_dir / 'replications.csv'))
+    StatisticsExporter.export_summary_report(
+        {'replications': len(summaries), 'seeds': seeds, 'metrics': aggregate},
+        str(output_dir / 'summary.json')
+    )
+    
+    logger.info("")
+    logger.info("="*60)
+    logger.info(f"Replication Summary ({len(summaries)} runs, {args.confidence:.0%} CI)")
+    logger.info("="*60)
+    for key, stats in aggregate.items():
+        if stats['ci_low'] is None:
+            logger.info(f"{key}: mean={stats['mean']:.4g}")
+        else:
+            logger.info(f"{key}: mean={stats['mean']:.4g} std={stats['std']:.4g} "
+                        f"CI=[{stats['ci_low']:.4g}, {stats['ci_high']:.4g}]")
+    logger.info("="*60)
+    logger.info(f"Results saved to: {output_dir}")
+
+
+def run_sweep(args, logger):
+    """Run a parameter sweep, reusing cached results, and write a results table."""
+    spec = ConfigLoader.load_json(args.sweep)
+    cache_dir = args.cache_dir or str(Path(args.output) / 'sweep_cache')
+    sweep = ParameterSweep(spec, cache_dir, args.workers)
+    scenarios = sweep.scenarios()
+    logger.info(f"Running sweep {args.sweep}: {len(scenarios)} scenarios, cache at {cache_dir}")
+    
+    def progress(record):
+        status = 'cached' if record['cached'] else 'done'
+        logger.info(f"[{status}] seed={record['seed']} {record['params']}")
+    
+    records = sweep.run(progress)
+    
+    rows = []
+    for record in records:
+        row = dict(record['params'])
+        row['seed'] = record['seed']
+        row['cached'] = record['cached']
+        row['key'] = record['key']
+        row.update(record['summary'])
+        rows.append(row)
+    output_dir = Path(args.output)
+    StatisticsExporter.export_to_csv(rows, str(output_dir / 'sweep_results.csv'))
+    
+    reused = sum(1 for record in records if record['cached'])
+    logger.info(f"Sweep finished: {len(records) - reused} run, {reused} reused from cache")
+    logger.info(f"Results saved to: {output_dir / 'sweep_results.csv'}")
+
+
+def create_control_server(address, executor, stats_tracker, start_paused):
+    """Create a control server for HOST:PORT or unix:PATH."""
+    if address.startswith('unix:'):
+        return ControlServer(executor, stats_tracker, unix_path=address[len('unix:'):],
+                             start_paused=start_paused)
+    host, _, port = address.rpartition(':')
+    return ControlServer(executor, stats_tracker, host=host or '127.0.0.1', port=int(port),
+                         start_paused=start_paused)
+
+
+def run_replay(args, logger):
+    """Rebuild statistics from an event log without re-running the simulation."""
+    logger.info(f"Replaying event log {args.replay}")
+    stats_tracker = StatisticsTracker(None)
+    replayer = EventLogReplayer(args.replay)
+    stats_tracker.attach(replayer.event_manager)
+    count = replayer.run()
+    logger.info(f"Replayed {count} events up to t={replayer.current_time:.1f}s")
+    
+    summary = stats_tracker.get_summary()
+    output_dir = Path(args.output)
+    StatisticsExporter.export_summary_report(summary, str(output_dir / 'replay_summary.json'))
+    for key, value in summary.items():
+        logger.info(f"{key}: {value}")
+    logger.info(f"Results saved to: {output_dir}")
+
+
+def subscribe_checkpoints(executor, stats_tracker, interval, filepath, logger):
+    """Write a checkpoint whenever simulated time crosses a multiple of interval."""
+    def on_time_step(event):
+        SimulationCheckpoint.save(executor, filepath, stats_tracker=stats_tracker)
+        logger.info(f"Checkpoint written at t={event.time:.1f}s to {filepath}")
+    
+    executor.event_manager.subscribe(
+        EventType.TIME_STEP, on_time_step, every_seconds=interval,
+        start=(int(executor.current_time // interval) + 1) * interval
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='RAWSim-O: Robotic Mobile Fulfillment System Simulator (CLI)'
@@ -24,11 +192,42 @@ def main():
     parser.add_argument('--control', type=str, help='Path to control config JSON')
     parser.add_argument('--output', type=str, default='results/', help='Output directory for results')
     parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--mode', choices=['fixed_step', 'discrete_event'],
+                        help='Execution mode (overrides settings config)')
+    parser.add_argument('--checkpoint-every', type=float, metavar='SECONDS',
+                        help='Write a checkpoint every SECONDS of simulated time')
+    parser.add_argument('--checkpoint-file', type=str,
+                        help='Checkpoint path (default: <output>/checkpoint.pkl.gz)')
+    parser.add_argument('--resume', type=str, metavar='PATH',
+                        help='Resume a simulation from a checkpoint file')
+    parser.add_argument('--replications', type=int, default=1, metavar='N',
+                        help='Number of independent replications (seeds seed..seed+N-1)')
+    parser.add_argument('--workers', type=int, metavar='K',
+                        help='Worker processes for replications and sweeps (default: CPU count)')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help='Confidence level for replication intervals')
+    parser.add_argument('--sweep', type=str, metavar='FILE',
+                        help='Run the parameter sweep described in a JSON file')
+    parser.add_argument('--cache-dir', type=str,
+                        help='Sweep result cache directory (default: <output>/sweep_cache)')
+    parser.add_argument('--event-log', type=str, metavar='PATH',
+                        help='Record all events to a binary log (gzip-compressed if PATH ends in .gz)')
+    parser.add_argument('--replay', type=str, metavar='LOG',
+                        help='Rebuild statistics from an event log instead of simulating')
+    parser.add_argument('--control-api', type=str, metavar='ADDRESS',
+                        help='Serve the control API on HOST:PORT or unix:PATH while running')
+    parser.add_argument('--control-api-paused', action='store_true',
+                        help='Start paused and wait for a run command on the control API')
+    parser.add_argument('--profile', nargs='?', const='', metavar='TRACE',
+                        help='Time each phase of the simulation loop, print a breakdown and write '
+                             'a Chrome/Perfetto trace (default: <output>/profile_trace.json)')
     parser.add_argument('--log-file', type=str, help='Log file path')
     parser.add_argument('--generate', action='store_true', help='Generate default instance')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose logging')
     
     args = parser.parse_args()
+    if args.replications > 1 and (args.resume or args.checkpoint_every):
+        parser.error('--replications cannot be combined with checkpointing')
     
     # Setup logging
     log_level = 10 if args.verbose else 20  # DEBUG : INFO
@@ -39,56 +238,69 @@ def main():
     logger.info("="*60)
     
     try:
-        # Load or generate instance
-        if args.generate or not args.instance:
-            logger.info("Generating default warehouse instance...")
-            generator = InstanceGenerator(seed=args.seed)
-            instance = generator.generate_simple_warehouse(
-                length=50.0, width=30.0,
-                num_bots=10, num_pods=50,
-                num_input_stations=2, num_output_stations=3
-            )
+        if args.replay:
+            run_replay(args, logger)
+            return
+        
+        if args.sweep:
+            run_sweep(args, logger)
+            return
+        
+        if args.replications > 1:
+            run_replications(args, logger)
+            return
+        
+        if args.resume:
+            logger.info(f"Resuming from checkpoint {args.resume}")
+            executor, extras = SimulationCheckpoint.load(args.resume)
+            instance = executor.instance
+            stats_tracker = extras['stats_tracker']
+            logger.info(f"Resumed at simulation time {executor.current_time:.1f}s")
         else:
-            logger.info(f"Loading instance from {args.instance}")
-            loader = ConfigLoader()
+            instance = build_instance(args, logger)
             
-            instance_config = loader.load_instance_config(args.instance)
-            settings_config = loader.load_settings_config(args.setting) if args.setting else {}
-            control_config = loader.load_control_config(args.control) if args.control else {}
+            logger.info(f"Instance: {instance.name}")
+            logger.info(f"Bots: {len(instance.bots)}, Pods: {len(instance.pods)}")
+            logger.info(f"Waypoints: {len(instance.waypoints)}")
+            logger.info(f"Simulation duration: {instance.setting_config.get('simulation_duration', 3600)}s")
             
-            # For now, generate since we don't have full instance serialization
-            generator = InstanceGenerator(seed=args.seed)
-            instance = generator.generate_simple_warehouse()
-            instance.setting_config.update(settings_config)
-            instance.controller_config.update(control_config)
-        
-        # Set randomizer
-        instance.randomizer = RandomizerSimple(args.seed)
-        instance.setting_config['seed'] = args.seed
-        
-        logger.info(f"Instance: {instance.name}")
-        logger.info(f"Bots: {len(instance.bots)}, Pods: {len(instance.pods)}")
-        logger.info(f"Waypoints: {len(instance.waypoints)}")
-        logger.info(f"Simulation duration: {instance.setting_config.get('simulation_duration', 3600)}s")
-        
-        # Create statistics tracker
-        stats_tracker = StatisticsTracker(instance)
-        
-        # Create executor
-        executor = SimulationExecutor(instance)
-        
-        # Subscribe to events for statistics
-        executor.event_manager.subscribe(
-            'time_step',
-            lambda event: stats_tracker.record_snapshot(event.time) if int(event.time) % 10 == 0 else None
-        )
+            # Create statistics tracker
+            stats_tracker = StatisticsTracker(instance)
+            
+            # Create executor
+            executor = SimulationExecutor(instance)
+        
+        # Subscribe to events for statistics (subscriptions are not checkpointed)
+        stats_tracker.track(executor)
+        
+        output_dir = Path(args.output)
+        if args.checkpoint_every:
+            checkpoint_file = args.checkpoint_file or str(output_dir / 'checkpoint.pkl.gz')
+            subscribe_checkpoints(executor, stats_tracker, args.checkpoint_every,
+                                  checkpoint_file, logger)
+        
+        event_log = None
+        if args.event_log:
+            event_log = EventLogWriter(args.event_log)
+            event_log.attach(executor.event_manager)
+        
+        profiler = executor.enable_profiling() if args.profile is not None else None
         
         # Run simulation
         logger.info("Starting simulation...")
-        executor.execute()
+        try:
+            if args.control_api:
+                server = create_control_server(args.control_api, executor, stats_tracker,
+                                               args.control_api_paused)
+                asyncio.run(server.serve())
+            else:
+                executor.execute()
+        finally:
+            if event_log is not None:
+                event_log.close()
+                logger.info(f"Event log: {event_log.records} events written to {args.event_log}")
         
         # Export results
-        output_dir = Path(args.output)
         output_dir.mkdir(parents=True, exist_ok=True)
         
         logger.info("Exporting statistics...")
@@ -121,6 +333,14 @@ def main():
             logger.info(f"{key}: {value}")
         logger.info("="*60)
         
+        if profiler is not None:
+            trace_file = args.profile or str(output_dir / 'profile_trace.json')
+            profiler.write_trace(trace_file, {'mode': executor.mode, 'ticks': profiler.ticks})
+            logger.info("Profile (wall time per phase):")
+            for line in profiler.format_table().splitlines():
+                logger.info(line)
+            logger.info(f"Profile trace: {trace_file}")
+        
         logger.info(f"Results saved to: {output_dir}")
         logger.info("Simulation completed successfully!")
         
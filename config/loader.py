@@ -39,6 +39,9 @@ class ConfigLoader:
             'simulation_duration': 3600.0,
             'time_step': 0.1,
             'seed': 42,
+            'execution_mode': 'fixed_step',
+            'kinematics_backend': 'python',
+            'adaptive_step': {'enabled': False},
         }
         for key, value in defaults.items():
             if key not in config:
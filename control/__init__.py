@@ -3,5 +3,6 @@
 from .task_manager import TaskManager
 from .pod_selector import PodSelector
 from .path_planner import PathPlanner
+from .dispatcher import FulfillmentDispatcher
 
-__all__ = ['TaskManager', 'PodSelector', 'PathPlanner']
+__all__ = ['TaskManager', 'PodSelector', 'PathPlanner', 'FulfillmentDispatcher']
@@ -0,0 +1,310 @@
+"""Event-driven order fulfillment."""
+
+from typing import Deque, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+from collections import deque
+
+if TYPE_CHECKING:
+    from core.bot import Bot
+    from core.order import Order
+    from core.pod import Pod
+    from core.station import OutputStation
+    from core.waypoint import Waypoint
+    from simulation.event_queue import ScheduledEvent
+    from simulation.executor import SimulationExecutor
+
+from simulation.events import EventType, SimulationEvent
+
+
+class FulfillmentTask:
+    """One pod trip: fetch a pod, present it at a station, bring it back."""
+
+    TO_POD = 'to_pod'
+    PICKUP = 'pickup'
+    TO_STATION = 'to_station'
+    QUEUED = 'queued'
+    PICKING = 'picking'
+    TO_STORAGE = 'to_storage'
+    SETDOWN = 'setdown'
+
+    def __init__(self, bot: 'Bot', pod: 'Pod', station: 'OutputStation', order: 'Order',
+                 items: Dict[int, int]):
+        self.bot = bot
+        self.pod = pod
+        self.station = station
+        self.order = order
+        self.items = items  # item_description_id -> quantity picked from this pod
+        self.storage: Optional['Waypoint'] = pod.waypoint
+        self.stage = self.TO_POD
+        self.goal: Optional['Waypoint'] = None  # Where the current leg ends
+        self.retry: Optional['ScheduledEvent'] = None  # Pending route retry, if no path was found
+        self.transfer: Optional['ScheduledEvent'] = None  # Pending pod pickup or setdown
+
+    def __repr__(self):
+        return (f"FulfillmentTask(bot={self.bot.id}, pod={self.pod.id}, "
+                f"order={self.order.id}, stage={self.stage})")
+
+
+class FulfillmentDispatcher:
+    """Turns orders into pod trips, reacting only to state changes.
+
+    Nothing is rescanned per tick. Work is done only when something that can
+    unblock it happens:
+
+    - a new order arrives: it is assigned to the least loaded output station
+      with a free slot (``OutputStation.capacity`` open orders), or waits in
+      the backlog
+    - a station slot frees up (an order is completed): the backlog moves on
+    - a bot becomes idle (instance bot listener): it takes the next pod
+      request; bots are chosen by ``TaskManager.assign_task`` and pods by
+      ``PodSelector.select_pod``
+    - a pod returns to storage: requests waiting for a pod are retried
+    - a bot or pod is removed (``forget``): trips that have not picked up
+      their pod yet are cancelled and their items requested again
+
+    Each order is served by one or more trips, each bringing a pod that holds
+    some of the order's remaining items to the station. Picks at a station
+    are processed one trip at a time. Inventory replenishment is not
+    modelled: picking does not deplete pod stock.
+    """
+
+    RETRY_DELAY = 1.0
+
+    def __init__(self, executor: 'SimulationExecutor'):
+        self.executor = executor
+        self.instance = executor.instance
+        self.active_bots = executor.active_bots
+
+        # Orders waiting for a station slot, and (station, order) pairs waiting for a trip
+        self.backlog: Deque['Order'] = deque()
+        self.requests: Deque[Tuple['OutputStation', 'Order']] = deque()
+        self.waiting_for_pod: List[Tuple['OutputStation', 'Order']] = []
+
+        # Items of each open order not yet claimed by a trip, and not yet picked
+        self._unclaimed: Dict[int, Dict[int, int]] = {}
+        self._outstanding: Dict[int, int] = {}
+
+        self.tasks: Dict['Bot', FulfillmentTask] = {}
+        self.busy_pods: Set['Pod'] = set()
+        self._station_queues: Dict['OutputStation', Deque[FulfillmentTask]] = {
+            station: deque() for station in self.instance.output_stations}
+        self._picking: Dict['OutputStation', FulfillmentTask] = {}
+
+        self.trips_completed = 0
+        self.instance.add_bot_listener(self._on_bot_changed)
+
+    # --- Triggers -----------------------------------------------------------
+
+    def order_created(self, order: 'Order'):
+        """A new order entered the order list."""
+        if not order.items:
+            return
+        self.backlog.append(order)
+        self._assign_stations()
+        self._dispatch()
+
+    def _on_bot_changed(self, bot: 'Bot'):
+        task = self.tasks.get(bot)
+        if task is None:
+            if self.requests and bot in self.active_bots.available:
+                self._dispatch()
+        elif (not bot.path and task.retry is None and
+              task.stage in (FulfillmentTask.TO_POD, FulfillmentTask.TO_STATION,
+                             FulfillmentTask.TO_STORAGE)):
+            # The route ran out: the leg is done, or it only reached the end
+            # of the planning window and goes on from there
+            self._route(task, task.goal)
+
+    def forget(self, entity: Union['Bot', 'Pod']):
+        """Cancel the trip of a removed bot, or the trip fetching a removed pod.
+
+        Bots and pods can only be removed while no pod is carried, so the
+        trip has not picked up its pod yet. A bot whose pod was removed stops
+        at the next waypoint of its route and becomes available again.
+        """
+        task = self.tasks.get(entity)
+        if task is not None:
+            self._cancel(task)
+        elif entity in self.busy_pods:
+            task = next(task for task in self.tasks.values() if task.pod is entity)
+            self._cancel(task)
+            self._stop(task.bot)
+            self.active_bots.release(task.bot)
+        else:
+            return
+        self._dispatch()
+
+    # --- Decisions ----------------------------------------------------------
+
+    def _assign_stations(self):
+        """Move backlog orders to stations with free slots."""
+        stations = [station for station in self.instance.output_stations
+                    if station.is_active and station.waypoint is not None]
+        while self.backlog and stations:
+            station = min(stations, key=lambda s: s.get_pending_orders())
+            if station.get_pending_orders() >= station.capacity:
+                return
+            order = self.backlog.popleft()
+            station.assign_order(order)
+            self._unclaimed[order.id] = dict(order.items)
+            self._outstanding[order.id] = order.get_total_items()
+            self.requests.append((station, order))
+
+    def _dispatch(self):
+        """Start trips while there are requests and available bots.
+
+        Bots not standing on a waypoint cannot be routed and are passed over.
+        """
+        unplaced: Set['Bot'] = set()
+        while self.requests and self.active_bots.available:
+            station, order = self.requests[0]
+            unclaimed = self._unclaimed[order.id]
+            pod = self.executor.pod_selector.select_pod(order, station.waypoint, items=unclaimed,
+                                                        exclude=self.busy_pods)
+            if pod is None or pod.waypoint is None:
+                self.waiting_for_pod.append(self.requests.popleft())
+                continue
+            bot = self.executor.task_manager.assign_task(order, station, exclude=unplaced)
+            while bot is not None and bot.current_waypoint is None:
+                unplaced.add(bot)
+                bot = self.executor.task_manager.assign_task(order, station, exclude=unplaced)
+            if bot is None:
+                return
+            self.requests.popleft()
+
+            items = {item_id: count for item_id, count in unclaimed.items() if pod.has_item(item_id, 1)}
+            for item_id in items:
+                del unclaimed[item_id]
+            if unclaimed:
+                self.requests.appendleft((station, order))
+
+            task = FulfillmentTask(bot, pod, station, order, items)
+            self.tasks[bot] = task
+            self.busy_pods.add(pod)
+            self.active_bots.reserve(bot)
+            if self.executor.event_manager.has_subscribers(EventType.TASK_ASSIGNED):
+                self.executor.event_manager.publish(SimulationEvent(
+                    EventType.TASK_ASSIGNED, self.executor.current_time,
+                    {'bot_id': bot.id, 'pod_id': pod.id, 'station_id': station.id,
+                     'order_id': order.id}
+                ))
+            self._route(task, pod.waypoint)
+
+    # --- Trip stages --------------------------------------------------------
+
+    def _route(self, task: FulfillmentTask, goal: 'Waypoint'):
+        """Send the task's bot to a waypoint; retries later if no path exists.
+
+        Routes may stop short of the goal (see ``WHCAvStar``); the bot is
+        routed on when it gets there.
+        """
+        bot = task.bot
+        task.goal = goal
+        task.retry = None
+        start = bot.current_waypoint
+        if start is goal:
+            self._arrived(task)
+            return
+        path = self.executor.path_planner.plan_path(bot, start, goal)
+        if not path or len(path) < 2:
+            task.retry = self.executor.schedule_in(self.RETRY_DELAY, EventType.ROUTE_RETRY,
+                                                   self._route, task, goal)
+            return
+        bot.path = path[1:]
+
+    def _cancel(self, task: FulfillmentTask):
+        """Drop a trip before pickup and give its items back to the order's request."""
+        del self.tasks[task.bot]
+        self.busy_pods.discard(task.pod)
+        for event in (task.retry, task.transfer):
+            if event is not None:
+                event.cancel()
+        self._unclaimed[task.order.id].update(task.items)
+        request = (task.station, task.order)
+        if request not in self.requests and request not in self.waiting_for_pod:
+            self.requests.appendleft(request)
+        # The pod may be free for requests that found none
+        if self.waiting_for_pod:
+            self.requests.extend(self.waiting_for_pod)
+            self.waiting_for_pod = []
+
+    def _stop(self, bot: 'Bot'):
+        """Cut a bot's route short at the next waypoint it reaches."""
+        start = bot.current_waypoint
+        if not bot.path or bot.path[0] is start:
+            bot.path = []
+            return
+        # Planning the last hop again replaces the bot's reservations for the rest of the route
+        path = self.executor.path_planner.plan_path(bot, start, bot.path[0])
+        bot.path = path[1:] if path and len(path) > 1 else bot.path[:1]
+
+    def _arrived(self, task: FulfillmentTask):
+        """The bot reached the end of its current leg."""
+        if task.stage == FulfillmentTask.TO_POD:
+            task.stage = FulfillmentTask.PICKUP
+            task.transfer = self.executor.schedule_pod_pickup(task.bot, task.pod,
+                                                              on_done=self._picked_up)
+        elif task.stage == FulfillmentTask.TO_STATION:
+            task.stage = FulfillmentTask.QUEUED
+            self._station_queues[task.station].append(task)
+            self._next_pick(task.station)
+        elif task.stage == FulfillmentTask.TO_STORAGE:
+            task.stage = FulfillmentTask.SETDOWN
+            task.transfer = self.executor.schedule_pod_setdown(task.bot, task.storage,
+                                                               on_done=self._set_down)
+
+    def _picked_up(self, bot: 'Bot', pod: 'Pod'):
+        task = self.tasks[bot]
+        task.transfer = None
+        task.stage = FulfillmentTask.TO_STATION
+        self._route(task, task.station.waypoint)
+
+    def _next_pick(self, station: 'OutputStation'):
+        """Start picking for the next queued trip if the station is free."""
+        queue = self._station_queues[station]
+        if station in self._picking or not queue:
+            return
+        task = queue.popleft()
+        task.stage = FulfillmentTask.PICKING
+        self._picking[station] = task
+        count = sum(task.items.values())
+        self.executor.schedule_pick(station, task.order, count, on_done=self._picked)
+
+    def _picked(self, station: 'OutputStation', order: 'Order'):
+        task = self._picking.pop(station)
+        self._outstanding[order.id] -= sum(task.items.values())
+        if self._outstanding[order.id] <= 0:
+            self._complete_order(station, order)
+
+        task.stage = FulfillmentTask.TO_STORAGE
+        self._route(task, task.storage)
+        self._next_pick(station)
+
+    def _complete_order(self, station: 'OutputStation', order: 'Order'):
+        del self._outstanding[order.id]
+        del self._unclaimed[order.id]
+        order.complete(self.executor.current_time)
+        station.assigned_orders.remove(order)
+        station.orders_completed += 1
+        if self.executor.event_manager.has_subscribers(EventType.ORDER_COMPLETED):
+            self.executor.event_manager.publish(SimulationEvent(
+                EventType.ORDER_COMPLETED, self.executor.current_time,
+                {'order_id': order.id, 'station_id': station.id}
+            ))
+        # A station slot freed up
+        self._assign_stations()
+
+    def _set_down(self, bot: 'Bot', pod: 'Pod'):
+        del self.tasks[bot]
+        self.busy_pods.discard(pod)
+        self.trips_completed += 1
+
+        # The pod is back: requests that found no pod may find this one
+        if self.waiting_for_pod:
+            self.requests.extend(self.waiting_for_pod)
+            self.waiting_for_pod = []
+        self.active_bots.release(bot)
+        self._dispatch()
+
+    def __repr__(self):
+        return (f"FulfillmentDispatcher(backlog={len(self.backlog)}, requests={len(self.requests)}, "
+                f"trips={len(self.tasks)}, completed_trips={self.trips_completed})")
@@ -1,6 +1,6 @@
 """Path planning controller."""
 
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from core.instance import Instance
@@ -8,40 +8,104 @@ if TYPE_CHECKING:
     from core.waypoint import Waypoint
 
 from pathfinding.astar import AStar
+from pathfinding.contraction import CHPathfinding
+from pathfinding.graph import WaypointGraph
+from pathfinding.path_cache import PathCache
 from pathfinding.whcav_star import WHCAvStar
 from pathfinding.simple_pathfinding import SimplePathfinding
 
 
 class PathPlanner:
-    """Plans paths for bots using various algorithms."""
+    """Plans paths for bots using various algorithms.
 
-    def __init__(self, instance: 'Instance', method: str = 'WHCAvStar'):
+    ``params`` are the ``pathfinding.params`` of the controller config:
+    ``heuristic`` and ``landmarks`` configure the underlying A* search,
+    ``window_size`` the WHCAvStar window.
+
+    Routes of the single-agent methods are kept in a ``PathCache`` of
+    ``cache_size`` entries (default 1024, 0 disables it), keyed by the layout
+    version. Simple routes depend on pod occupancy: the cache follows pod
+    setdowns and pickups on the instance graph and drops only the routes
+    through the changed location or blocked by it. WHCAvStar routes depend
+    on time-varying reservations and are never cached.
+    """
+
+    def __init__(self, instance: 'Instance', method: str = 'WHCAvStar',
+                 params: Optional[Dict[str, Any]] = None):
         self.instance = instance
         self.method = method
+        params = params or {}
 
         if method == 'AStar':
             self.pathfinder = AStar()
         elif method == 'WHCAvStar':
-            self.pathfinder = WHCAvStar()
+            self.pathfinder = WHCAvStar(params.get('window_size', 10))
         elif method == 'Simple':
             self.pathfinder = SimplePathfinding()
+        elif method == 'CH':
+            self.pathfinder = CHPathfinding()
         else:
             self.pathfinder = AStar()  # Default
 
+        astar = self.pathfinder if isinstance(self.pathfinder, AStar) else getattr(self.pathfinder, 'astar', None)
+        if astar is not None:
+            if 'heuristic' in params:
+                astar.heuristic_type = params['heuristic']
+            if 'landmarks' in params:
+                astar.landmarks = params['landmarks']
+
+        cache_size = params.get('cache_size', 1024)
+        self.cache: Optional[PathCache] = None
+        if method != 'WHCAvStar' and cache_size > 0:
+            self.cache = PathCache(cache_size)
+        self._cache_graph: Optional[WaypointGraph] = None
+
     def plan_path(self, bot: 'Bot', start: 'Waypoint', goal: 'Waypoint') -> Optional[List['Waypoint']]:
-        """Plan a path from start to goal for a bot."""
+        """Plan a path from start to goal for a bot.
+
+        WHCAvStar routes may end short of the goal, at the end of the window.
+        """
         if self.method == 'WHCAvStar':
             return self.pathfinder.find_path_cooperative(
                 bot, start, goal, self.instance.current_time
             )
-        else:
+        if self.cache is None:
             return self.pathfinder.find_path(start, goal)
 
+        graph = WaypointGraph.for_instance(self.instance)
+        if graph is not self._cache_graph:
+            # The layout changed: routes of the previous graph no longer apply
+            if self._cache_graph is not None:
+                self._cache_graph.remove_occupancy_listener(self.cache.invalidate)
+            self.cache.clear()
+            graph.add_occupancy_listener(self.cache.invalidate)
+            self._cache_graph = graph
+        variant = graph.topology_version
+        path = self.cache.get(start, goal, variant)
+        if path is not None:
+            return path
+
+        if isinstance(self.pathfinder, SimplePathfinding):
+            encountered: List['Waypoint'] = []
+            path = self.pathfinder.find_path(start, goal, encountered)
+            if path is not None:
+                self.cache.put(start, goal, variant, path, path[1:-1] + encountered)
+        else:
+            path = self.pathfinder.find_path(start, goal)
+            if path is not None:
+                self.cache.put(start, goal, variant, path)
+        return path
+
     def update(self, delta_time: float):
         """Update path planner state."""
         if self.method == 'WHCAvStar':
             # Clear old reservations
             self.pathfinder.clear_old_reservations(self.instance.current_time)
 
+    def forget(self, bot: 'Bot'):
+        """Drop the reservations of a bot that left the instance."""
+        if self.method == 'WHCAvStar':
+            self.pathfinder.table.release(bot.id)
+
     def __repr__(self):
         return f"PathPlanner(method={self.method})"
@@ -1,8 +1,10 @@
 """Pod selection strategies for order fulfillment."""
 
-from typing import List, Optional, TYPE_CHECKING
+from typing import Collection, Dict, List, Optional, TYPE_CHECKING
 import random
 
+from utils.randomizer import RandomizerSimple
+
 if TYPE_CHECKING:
     from core.instance import Instance
     from core.pod import Pod
@@ -16,30 +18,51 @@ class PodSelector:
     def __init__(self, instance: 'Instance', method: str = 'nearest'):
         self.instance = instance
         self.method = method
+        self._pods_by_sku: Optional[Dict[int, Dict['Pod', None]]] = None
 
-    def select_pod(self, order: 'Order', station_waypoint: 'Waypoint') -> Optional['Pod']:
-        """Select best pod for fulfilling an order."""
-        # Get pods that have required items
-        suitable_pods = []
-        
+    def refresh_index(self):
+        """Rebuild the SKU -> pods index (call after restocking pods)."""
+        self._pods_by_sku = {}
         for pod in self.instance.pods:
-            if pod.is_carried():
-                continue
-            
-            # Check if pod has any of the required items
-            has_items = False
-            for item_id, quantity in order.items.items():
-                if pod.has_item(item_id, 1):  # Has at least one
-                    has_items = True
-                    break
-            
-            if has_items:
-                suitable_pods.append(pod)
+            for item_id, count in pod.item_counts.items():
+                if count > 0:
+                    self._pods_by_sku.setdefault(item_id, {})[pod] = None
+
+    def forget(self, pod: 'Pod'):
+        """Drop a removed pod from the SKU index."""
+        if self._pods_by_sku is None:
+            return
+        for item_id in pod.item_counts:
+            pods = self._pods_by_sku.get(item_id)
+            if pods is not None:
+                pods.pop(pod, None)
+
+    def select_pod(self, order: 'Order', station_waypoint: 'Waypoint',
+                   items: Optional[Dict[int, int]] = None,
+                   exclude: Collection['Pod'] = ()) -> Optional['Pod']:
+        """Select best pod for fulfilling an order.
+
+        Only pods holding at least one of ``items`` (default: all items of
+        the order) are considered, looked up through an SKU index instead of
+        scanning every pod. Carried pods and pods in ``exclude`` are skipped.
+        """
+        if self._pods_by_sku is None:
+            self.refresh_index()
+
+        # Get pods that have required items
+        suitable: Dict['Pod', None] = {}
+        for item_id in (items if items is not None else order.items):
+            for pod in self._pods_by_sku.get(item_id, ()):
+                if not pod.is_carried() and pod not in exclude and pod.has_item(item_id, 1):
+                    suitable[pod] = None
+        suitable_pods = list(suitable)
 
         if not suitable_pods:
             return None
 
         if self.method == 'random':
+            if self.instance.randomizer is not None:
+                return self.instance.randomizer.choice(suitable_pods, stream=RandomizerSimple.CONTROLLER)
             return random.choice(suitable_pods)
         elif self.method == 'nearest':
             return self._select_nearest(suitable_pods, station_waypoint)
@@ -1,6 +1,6 @@
 """Task assignment and management for bots."""
 
-from typing import List, Optional, TYPE_CHECKING
+from typing import Collection, List, Optional, TYPE_CHECKING
 import math
 
 if TYPE_CHECKING:
@@ -8,20 +8,29 @@ if TYPE_CHECKING:
     from core.bot import Bot
     from core.order import Order
     from core.station import OutputStation
+    from simulation.active_set import ActiveBotSet
 
 
 class TaskManager:
     """Manages task assignment to bots."""
 
-    def __init__(self, instance: 'Instance', method: str = 'nearest'):
+    def __init__(self, instance: 'Instance', method: str = 'nearest',
+                 active_bots: Optional['ActiveBotSet'] = None):
         self.instance = instance
         self.method = method
+        self.active_bots = active_bots
         self.pending_tasks = []
 
-    def assign_task(self, order: 'Order', station: 'OutputStation') -> Optional['Bot']:
-        """Assign a task to the best available bot."""
-        available_bots = [bot for bot in self.instance.bots 
-                         if bot.is_active and not bot.has_pod() and not bot.path]
+    def assign_task(self, order: 'Order', station: 'OutputStation',
+                    exclude: Collection['Bot'] = ()) -> Optional['Bot']:
+        """Assign a task to the best available bot not in ``exclude``."""
+        if self.active_bots is not None:
+            available_bots = list(self.active_bots.available)
+        else:
+            available_bots = [bot for bot in self.instance.bots
+                             if bot.is_active and not bot.has_pod() and not bot.path]
+        if exclude:
+            available_bots = [bot for bot in available_bots if bot not in exclude]
 
         if not available_bots:
             return None
@@ -31,7 +40,7 @@ class TaskManager:
         elif self.method == 'balanced':
             return self._assign_balanced(available_bots)
         elif self.method == 'priority':
-            return self._assign_priority(order, available_bots)
+            return self._assign_priority(order, station, available_bots)
         else:
             return available_bots[0] if available_bots else None
 
@@ -50,11 +59,12 @@ class TaskManager:
         # Simple: just return first available (can be enhanced with statistics)
         return bots[0]
 
-    def _assign_priority(self, order: 'Order', bots: List['Bot']) -> Optional['Bot']:
+    def _assign_priority(self, order: 'Order', station: 'OutputStation',
+                         bots: List['Bot']) -> Optional['Bot']:
         """Assign based on order priority."""
-        # For high priority orders, prefer fastest/nearest bot
+        # For high priority orders, prefer the bot nearest to the order's station
         if order.priority > 5:
-            return self._assign_nearest(None, bots)
+            return self._assign_nearest(station, bots)
         return bots[0] if bots else None
 
     def __repr__(self):
@@ -8,11 +8,19 @@ if TYPE_CHECKING:
     from .tier import Tier
     from .pod import Pod
     from .waypoint import Waypoint
+    from .fleet import FleetKinematics
 
 
 class Bot:
     """Base class for warehouse robots."""
 
+    __slots__ = ('instance', 'id', 'volatile_id', '_fleet', '_fleet_index', 'tier',
+                 'x', 'y', 'radius', 'orientation', 'max_acceleration', 'max_deceleration',
+                 'max_velocity', 'turn_speed', 'current_velocity', 'pod_transfer_time',
+                 'collision_penalty_time', 'current_pod', 'current_waypoint',
+                 'destination_waypoint', '_path', 'wait_time', '_dwell', '_is_active', '_is_waiting',
+                 'task_start_time')
+
     def __init__(self, instance: 'Instance', radius: float,
                  pod_transfer_time: float, max_acceleration: float,
                  max_deceleration: float, max_velocity: float,
@@ -22,6 +30,10 @@ class Bot:
         self.id: int = 0
         self.volatile_id: int = 0
         
+        # Kinematics backend (None: state is held on the bot itself)
+        self._fleet: Optional['FleetKinematics'] = None
+        self._fleet_index: int = -1
+        
         # Position and movement
         self.tier: Optional['Tier'] = None
         self.x: float = x
@@ -44,13 +56,53 @@ class Bot:
         # Path and destination
         self.current_waypoint: Optional['Waypoint'] = None
         self.destination_waypoint: Optional['Waypoint'] = None
-        self.path: List['Waypoint'] = []
+        self._path: List['Waypoint'] = []
+        # A waypoint repeated in the path holds the bot for wait_time seconds
+        self.wait_time: float = 1.0
+        self._dwell: float = 0.0
         
         # State
-        self.is_active: bool = True
-        self.is_waiting: bool = False
+        self._is_active: bool = True
+        self._is_waiting: bool = False
         self.task_start_time: float = 0.0
 
+    @property
+    def path(self) -> List['Waypoint']:
+        """Remaining waypoints to visit, nearest first."""
+        return self._path
+
+    @path.setter
+    def path(self, path: List['Waypoint']):
+        self._path = path
+        self._dwell = 0.0
+        self.instance.notify_bot_changed(self)
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the bot takes part in the simulation."""
+        return self._is_active
+
+    @is_active.setter
+    def is_active(self, value: bool):
+        if value != self._is_active:
+            self._is_active = value
+            self.instance.notify_bot_changed(self)
+
+    @property
+    def is_waiting(self) -> bool:
+        """Whether the bot is held in place (e.g. blocked or penalized)."""
+        return self._is_waiting
+
+    @is_waiting.setter
+    def is_waiting(self, value: bool):
+        if value != self._is_waiting:
+            self._is_waiting = value
+            self.instance.notify_bot_changed(self)
+
+    def can_move(self) -> bool:
+        """Check if the bot has somewhere to go and is free to drive."""
+        return bool(self._path) and self._is_active and not self._is_waiting
+
     def has_pod(self) -> bool:
         """Check if bot is carrying a pod."""
         return self.current_pod is not None
@@ -61,6 +113,7 @@ class Bot:
             raise ValueError(f"Bot {self.id} already carrying a pod")
         self.current_pod = pod
         pod.carried_by = self
+        self.instance.notify_bot_changed(self)
 
     def setdown_pod(self):
         """Set down the current pod."""
@@ -68,16 +121,50 @@ class Bot:
             raise ValueError(f"Bot {self.id} not carrying a pod")
         self.current_pod.carried_by = None
         self.current_pod = None
+        self.instance.notify_bot_changed(self)
 
     def update(self, delta_time: float):
         """Update bot state for one time step."""
         # To be implemented by subclasses
         pass
 
+    def dwell(self, delta_time: float) -> bool:
+        """Spend time on a wait in the path; True once ``wait_time`` is up."""
+        self._dwell += delta_time
+        if self._dwell < self.wait_time - 1e-9:
+            return False
+        self._dwell = 0.0
+        return True
+
     def distance_to(self, x: float, y: float) -> float:
         """Calculate distance to a point."""
         return math.sqrt((self.x - x)**2 + (self.y - y)**2)
 
+    def travel_time(self, distance: float) -> float:
+        """Time needed to cover a distance from standstill (accelerate, then cruise)."""
+        if distance <= 0.0:
+            return 0.0
+        accel_distance = self.max_velocity ** 2 / (2 * self.max_acceleration)
+        if distance <= accel_distance:
+            return math.sqrt(2 * distance / self.max_acceleration)
+        return (self.max_velocity / self.max_acceleration +
+                (distance - accel_distance) / self.max_velocity)
+
+    def arrive_at(self, waypoint: 'Waypoint'):
+        """Place the bot on a waypoint reached along its path."""
+        dx = waypoint.x - self.x
+        dy = waypoint.y - self.y
+        if dx != 0.0 or dy != 0.0:
+            self.orientation = math.atan2(dy, dx)
+        self.x = waypoint.x
+        self.y = waypoint.y
+        self.current_waypoint = waypoint
+        self.current_velocity = 0.0
+        if self._path and self._path[0] is waypoint:
+            self._path.pop(0)
+            if not self._path:
+                self.instance.notify_bot_changed(self)
+
     def __repr__(self):
         pod_status = "with pod" if self.has_pod() else "idle"
         return f"Bot(id={self.id}, pos=({self.x:.1f}, {self.y:.1f}), {pod_status})"
@@ -86,6 +173,8 @@ class Bot:
 class BotNormal(Bot):
     """Standard bot implementation for advanced pathfinding."""
 
+    __slots__ = ()
+
     def __init__(self, bot_id: int, instance: 'Instance', radius: float,
                  pod_transfer_time: float, max_acceleration: float,
                  max_deceleration: float, max_velocity: float,
@@ -98,44 +187,57 @@ class BotNormal(Bot):
 
     def update(self, delta_time: float):
         """Update bot position and state."""
-        if not self.is_active or self.is_waiting:
+        if not self._is_active or self._is_waiting:
             return
 
-        if self.path and len(self.path) > 0:
+        path = self._path
+        if path:
+            target = path[0]
+            if target is self.current_waypoint:
+                # A wait in the route: stay put until it is over
+                if self.dwell(delta_time):
+                    path.pop(0)
+                    if not path:
+                        self.instance.notify_bot_changed(self)
+                return
+
             # Move towards next waypoint in path
-            target = self.path[0]
             dx = target.x - self.x
             dy = target.y - self.y
             distance = math.sqrt(dx**2 + dy**2)
 
-            if distance < 0.1:  # Reached waypoint
-                self.x = target.x
-                self.y = target.y
-                self.current_waypoint = target
-                self.path.pop(0)
-                self.current_velocity = 0.0
-            else:
-                # Accelerate/move towards target
-                if self.current_velocity < self.max_velocity:
+            if distance >= 0.1:
+                # Accelerate/move towards target, at the average velocity of the tick
+                velocity = self.current_velocity
+                if velocity < self.max_velocity:
                     self.current_velocity = min(
-                        self.current_velocity + self.max_acceleration * delta_time,
+                        velocity + self.max_acceleration * delta_time,
                         self.max_velocity
                     )
 
-                move_distance = self.current_velocity * delta_time
-                if move_distance > distance:
-                    move_distance = distance
-
-                self.x += (dx / distance) * move_distance
-                self.y += (dy / distance) * move_distance
-
+                move_distance = 0.5 * (velocity + self.current_velocity) * delta_time
                 # Update orientation
                 self.orientation = math.atan2(dy, dx)
+                if move_distance < distance - 1e-9:
+                    self.x += (dx / distance) * move_distance
+                    self.y += (dy / distance) * move_distance
+                    return
+
+            # Reached waypoint (within this tick, not on the next one)
+            self.x = target.x
+            self.y = target.y
+            self.current_waypoint = target
+            path.pop(0)
+            self.current_velocity = 0.0
+            if not path:
+                self.instance.notify_bot_changed(self)
 
 
 class BotHazard(Bot):
     """Bot implementation for simple pathfinding with evade distance."""
 
+    __slots__ = ('evade_distance', 'target_orientation')
+
     def __init__(self, instance: 'Instance', radius: float,
                  pod_transfer_time: float, max_acceleration: float,
                  max_deceleration: float, max_velocity: float,
@@ -1,6 +1,6 @@
 """Compound container for multi-tier warehouses."""
 
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .instance import Instance
@@ -14,18 +14,17 @@ class Compound:
         self.instance = instance
         self.id: int = 0
         self.tiers: List['Tier'] = []
+        self._tiers_by_id: Dict[int, 'Tier'] = {}
 
     def add_tier(self, tier: 'Tier'):
         """Add a tier to the compound."""
-        if tier not in self.tiers:
+        if self._tiers_by_id.get(tier.id) is not tier:
             self.tiers.append(tier)
+            self._tiers_by_id.setdefault(tier.id, tier)
 
-    def get_tier_by_id(self, tier_id: int) -> 'Tier':
+    def get_tier_by_id(self, tier_id: int) -> Optional['Tier']:
         """Get a tier by its ID."""
-        for tier in self.tiers:
-            if tier.id == tier_id:
-                return tier
-        return None
+        return self._tiers_by_id.get(tier_id)
 
     def get_total_area(self) -> float:
         """Calculate total warehouse area across all tiers."""
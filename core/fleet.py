@@ -0,0 +1,234 @@
+"""Struct-of-arrays kinematics backend for bot fleets."""
+
+from typing import Dict, Iterable, List, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from .bot import Bot
+
+
+class _FleetAttribute:
+    """Kinematic bot attribute stored in a fleet array."""
+
+    def __init__(self, array_name: str):
+        self.array_name = array_name
+
+    def __get__(self, bot: 'Bot', owner=None):
+        if bot is None:
+            return self
+        return float(getattr(bot._fleet, self.array_name)[bot._fleet_index])
+
+    def __set__(self, bot: 'Bot', value: float):
+        getattr(bot._fleet, self.array_name)[bot._fleet_index] = value
+
+
+class _FleetView:
+    """Mixin turning a bot class into a view of its fleet arrays."""
+
+    __slots__ = ()
+
+    x = _FleetAttribute('x')
+    y = _FleetAttribute('y')
+    orientation = _FleetAttribute('orientation')
+    current_velocity = _FleetAttribute('velocity')
+
+    def __setstate__(self, state):
+        # Kinematic state comes back with the fleet arrays; the fleet may not
+        # be restored yet, so only the other slots are set here
+        _, slots = state
+        for name, value in slots.items():
+            if not isinstance(getattr(_FleetView, name, None), _FleetAttribute):
+                setattr(self, name, value)
+
+
+_VIEW_CLASSES: Dict[type, type] = {}
+
+
+def fleet_view_class(bot_class: type) -> type:
+    """The subclass a bot of ``bot_class`` takes on while bound to a fleet.
+
+    Unbound bots keep their kinematic state in plain slots, so the default
+    python backend pays nothing for the numpy one.
+    """
+    view = _VIEW_CLASSES.get(bot_class)
+    if view is None:
+        name = 'Fleet' + bot_class.__name__
+        view = type(name, (_FleetView, bot_class), {'__slots__': (), '__module__': __name__})
+        _VIEW_CLASSES[bot_class] = view
+        globals()[name] = view
+    return view
+
+
+def __getattr__(name: str) -> type:
+    # Lets pickle find view classes in a fresh process, e.g. ``FleetBotNormal``
+    from . import bot
+    bot_class = getattr(bot, name[len('Fleet'):], None) if name.startswith('Fleet') else None
+    if isinstance(bot_class, type) and issubclass(bot_class, bot.Bot):
+        return fleet_view_class(bot_class)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class FleetKinematics:
+    """Keeps the kinematic state of a bot fleet in contiguous NumPy arrays.
+
+    Bound bots become thin views (see ``fleet_view_class``): reading or
+    writing ``x``, ``y``, ``orientation`` and ``current_velocity`` on a bot
+    goes to the arrays.
+    ``step`` advances every moving bot with one vectorized update that mirrors
+    ``BotNormal.update``, so per-tick cost grows with array length instead of
+    Python call overhead.
+
+    The current target of each bot is the first waypoint of its path. Targets
+    are refreshed through ``refresh``, which is registered as an instance bot
+    listener and therefore runs whenever a path or motion state changes.
+    Active bots the fleet does not know yet, e.g. ones created after the
+    fleet, are bound on their first notification.
+    """
+
+    ARRIVAL_DISTANCE = 0.1
+
+    def __init__(self, bots: Iterable['Bot'] = (), capacity: int = 16):
+        self.bots: List['Bot'] = []
+        self._allocate(max(capacity, 1))
+        for bot in bots:
+            self.add(bot)
+
+    def _allocate(self, capacity: int):
+        """Allocate (or grow) all arrays to the given capacity."""
+        size = len(getattr(self, 'bots', []))
+
+        def grow(name: str, dtype):
+            array = np.zeros(capacity, dtype=dtype)
+            if hasattr(self, name):
+                array[:size] = getattr(self, name)[:size]
+            setattr(self, name, array)
+
+        for name in ('x', 'y', 'orientation', 'velocity', 'max_velocity',
+                     'max_acceleration', 'target_x', 'target_y'):
+            grow(name, np.float64)
+        grow('has_target', np.bool_)
+        grow('movable', np.bool_)
+        self.capacity = capacity
+
+    def add(self, bot: 'Bot'):
+        """Bind a bot to the fleet, moving its kinematic state into the arrays."""
+        if bot._fleet is self:
+            return
+        if bot._fleet is not None:
+            bot._fleet.remove(bot)
+        index = len(self.bots)
+        if index >= self.capacity:
+            self._allocate(self.capacity * 2)
+
+        self.x[index] = bot.x
+        self.y[index] = bot.y
+        self.orientation[index] = bot.orientation
+        self.velocity[index] = bot.current_velocity
+        self.max_velocity[index] = bot.max_velocity
+        self.max_acceleration[index] = bot.max_acceleration
+        self.bots.append(bot)
+        bot._fleet = self
+        bot._fleet_index = index
+        bot.__class__ = fleet_view_class(type(bot))
+        self.refresh(bot)
+
+    def remove(self, bot: 'Bot'):
+        """Unbind a bot, copying its kinematic state back onto the bot."""
+        if bot._fleet is not self:
+            return
+        index = bot._fleet_index
+        x, y = float(self.x[index]), float(self.y[index])
+        orientation, velocity = float(self.orientation[index]), float(self.velocity[index])
+        bot.__class__ = type(bot).__bases__[1]
+        bot.x, bot.y = x, y
+        bot.orientation, bot.current_velocity = orientation, velocity
+        bot._fleet = None
+        bot._fleet_index = -1
+
+        # Move the last bot into the freed slot
+        last = len(self.bots) - 1
+        if index != last:
+            moved = self.bots[last]
+            self.bots[index] = moved
+            moved._fleet_index = index
+            for name in ('x', 'y', 'orientation', 'velocity', 'max_velocity',
+                         'max_acceleration', 'target_x', 'target_y',
+                         'has_target', 'movable'):
+                array = getattr(self, name)
+                array[index] = array[last]
+        self.bots.pop()
+        self.has_target[last] = False
+        self.movable[last] = False
+
+    def refresh(self, bot: 'Bot'):
+        """Re-read a bot's current target and motion state."""
+        if bot._fleet is not self:
+            if bot._fleet is None and bot.is_active:
+                self.add(bot)
+            return
+        index = bot._fleet_index
+        path = bot.path
+        if path:
+            self.target_x[index] = path[0].x
+            self.target_y[index] = path[0].y
+            self.has_target[index] = True
+        else:
+            self.has_target[index] = False
+        self.movable[index] = bot.is_active and not bot.is_waiting
+
+    def step(self, delta_time: float):
+        """Advance all moving bots by one time step."""
+        size = len(self.bots)
+        active = np.flatnonzero(self.has_target[:size] & self.movable[:size])
+        if active.size == 0:
+            return
+
+        dx = self.target_x[active] - self.x[active]
+        dy = self.target_y[active] - self.y[active]
+        distance = np.sqrt(dx * dx + dy * dy)
+        arrived = distance < self.ARRIVAL_DISTANCE
+
+        # Accelerate and move towards the target
+        moving = ~arrived
+        if moving.any():
+            index = active[moving]
+            mdx = dx[moving]
+            mdy = dy[moving]
+            mdist = distance[moving]
+            previous = self.velocity[index]
+            velocity = np.minimum(
+                previous + self.max_acceleration[index] * delta_time,
+                self.max_velocity[index]
+            )
+            self.velocity[index] = velocity
+            # Average velocity of the tick; bots reaching their waypoint arrive now
+            move_distance = 0.5 * (previous + velocity) * delta_time
+            arrived[moving] = move_distance >= mdist - 1e-9
+            move_distance = np.minimum(move_distance, mdist)
+            self.x[index] += (mdx / mdist) * move_distance
+            self.y[index] += (mdy / mdist) * move_distance
+            self.orientation[index] = np.arctan2(mdy, mdx)
+
+        # Snap arrived bots onto their waypoint and advance their paths
+        if arrived.any():
+            index = active[arrived]
+            self.x[index] = self.target_x[index]
+            self.y[index] = self.target_y[index]
+            self.velocity[index] = 0.0
+            for i in index.tolist():
+                bot = self.bots[i]
+                path = bot.path
+                if path[0] is bot.current_waypoint and not bot.dwell(delta_time):
+                    continue  # A wait in the route: stay put until it is over
+                bot.current_waypoint = path.pop(0)
+                if path:
+                    self.refresh(bot)
+                else:
+                    bot.instance.notify_bot_changed(bot)
+
+    def __len__(self):
+        return len(self.bots)
+
+    def __repr__(self):
+        moving = int(np.count_nonzero(self.has_target[:len(self.bots)] & self.movable[:len(self.bots)]))
+        return f"FleetKinematics(bots={len(self.bots)}, moving={moving})"
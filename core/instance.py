@@ -1,6 +1,6 @@
 """Main simulation instance managing all warehouse elements."""
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Union
 import logging
 from datetime import datetime
 
@@ -16,6 +16,33 @@ from .order import Order, OrderList
 from .semaphore import QueueSemaphore
 
 
+class _IdPool:
+    """Allocates non-negative integer ids, reusing released ones.
+
+    Released ids go on a free list and the most recently released one is
+    handed out again before new ones, so allocation and release are O(1)
+    and ids never exceed the peak number in use.
+    """
+
+    def __init__(self):
+        self._next = 0
+        self._free: List[int] = []
+
+    def acquire(self) -> int:
+        """Take a free id."""
+        if self._free:
+            return self._free.pop()
+        self._next += 1
+        return self._next - 1
+
+    def release(self, value: int):
+        """Return an id to the pool."""
+        self._free.append(value)
+
+    def __len__(self) -> int:
+        return self._next - len(self._free)
+
+
 class Instance:
     """The core element of each simulation instance."""
 
@@ -52,9 +79,13 @@ class Instance:
         self._semaphore_id = 0
         
         # Volatile ID tracking
-        self._volatile_bot_ids = set()
-        self._volatile_pod_ids = set()
-        self._volatile_waypoint_ids = set()
+        self._volatile_bot_ids = _IdPool()
+        self._volatile_pod_ids = _IdPool()
+        self._volatile_waypoint_ids = _IdPool()
+        
+        # Positions in the bots/pods lists, for O(1) removal
+        self._bot_index: Dict[Bot, int] = {}
+        self._pod_index: Dict[Pod, int] = {}
         
         # Lookup dictionaries
         self._id_to_bot: Dict[int, Bot] = {}
@@ -70,8 +101,15 @@ class Instance:
         # Randomizer
         self.randomizer = None
         
-        # Waypoint graph (will be initialized by pathfinding module)
+        # Waypoint graph (built on demand by the pathfinding module) and a
+        # counter bumped whenever waypoints or their connections change
         self.waypoint_graph = None
+        self.topology_version: int = 0
+        
+        # Callbacks notified when a bot's path or motion state changes
+        self._bot_listeners: List[Callable[[Bot], None]] = []
+        # Callbacks notified after a bot or pod has been removed
+        self._removal_listeners: List[Callable[[Union[Bot, Pod]], None]] = []
         
         logging.info(f"Instance created: {self.name}")
 
@@ -105,7 +143,7 @@ class Instance:
         tier.relative_position_y = y
         tier.relative_position_z = z
         
-        self.compound.tiers.append(tier)
+        self.compound.add_tier(tier)
         self._id_to_tier[tier.id] = tier
         self._tier_id += 1
         
@@ -137,18 +175,15 @@ class Instance:
         bot.tier = tier
         bot.orientation = orientation
         
+        self._bot_index[bot] = len(self.bots)
         self.bots.append(bot)
         tier.add_bot(bot)
         self._id_to_bot[bot.id] = bot
-        
-        # Assign volatile ID
-        volatile_id = 0
-        while volatile_id in self._volatile_bot_ids:
-            volatile_id += 1
-        bot.volatile_id = volatile_id
-        self._volatile_bot_ids.add(volatile_id)
+        bot.volatile_id = self._volatile_bot_ids.acquire()
         
         self._bot_id = max(self._bot_id, bot_id + 1)
+        # Let running controllers (active sets, fleet arrays) pick the bot up
+        self.notify_bot_changed(bot)
         
         return bot
 
@@ -165,16 +200,11 @@ class Instance:
         pod.orientation = orientation
         pod.capacity = capacity
         
+        self._pod_index[pod] = len(self.pods)
         self.pods.append(pod)
         tier.add_pod(pod)
         self._id_to_pod[pod.id] = pod
-        
-        # Assign volatile ID
-        volatile_id = 0
-        while volatile_id in self._volatile_pod_ids:
-            volatile_id += 1
-        pod.volatile_id = volatile_id
-        self._volatile_pod_ids.add(volatile_id)
+        pod.volatile_id = self._volatile_pod_ids.acquire()
         
         self._pod_id = max(self._pod_id, pod_id + 1)
         
@@ -195,18 +225,66 @@ class Instance:
         self.waypoints.append(waypoint)
         tier.add_waypoint(waypoint)
         self._id_to_waypoint[waypoint.id] = waypoint
-        
-        # Assign volatile ID
-        volatile_id = 0
-        while volatile_id in self._volatile_waypoint_ids:
-            volatile_id += 1
-        waypoint.volatile_id = volatile_id
-        self._volatile_waypoint_ids.add(volatile_id)
+        waypoint.volatile_id = self._volatile_waypoint_ids.acquire()
+        self.topology_version += 1
         
         self._waypoint_id = max(self._waypoint_id, wp_id + 1)
         
         return waypoint
 
+    def remove_bot(self, bot: Bot):
+        """Retire a bot from the instance.
+
+        The bot is deactivated first, so bot listeners drop it from their
+        bookkeeping, then removal listeners are notified. Its volatile ID is
+        freed for reuse. The last bot of ``bots`` takes its place in the list.
+        Bots carrying a pod cannot be removed.
+        """
+        if bot not in self._bot_index:
+            raise ValueError(f"Bot {bot.id} is not part of this instance")
+        if bot.has_pod():
+            raise ValueError(f"Bot {bot.id} is carrying a pod")
+        bot.is_active = False
+        self._swap_remove(self.bots, self._bot_index, bot)
+        bot.tier.remove_bot(bot)
+        if self._id_to_bot.get(bot.id) is bot:
+            del self._id_to_bot[bot.id]
+        self._volatile_bot_ids.release(bot.volatile_id)
+        for listener in list(self._removal_listeners):
+            listener(bot)
+
+    def remove_pod(self, pod: Pod):
+        """Remove a pod from the instance (and from its storage waypoint).
+
+        Removal listeners are notified and the pod's volatile ID is freed
+        for reuse. Carried pods cannot be removed.
+        """
+        if pod not in self._pod_index:
+            raise ValueError(f"Pod {pod.id} is not part of this instance")
+        if pod.is_carried():
+            raise ValueError(f"Pod {pod.id} is being carried")
+        if self.waypoint_graph is not None:
+            self.waypoint_graph.pod_pickup(pod)
+        elif pod.waypoint is not None and pod.waypoint.pod is pod:
+            pod.waypoint.pod = None
+        pod.waypoint = None
+        self._swap_remove(self.pods, self._pod_index, pod)
+        pod.tier.remove_pod(pod)
+        if self._id_to_pod.get(pod.id) is pod:
+            del self._id_to_pod[pod.id]
+        self._volatile_pod_ids.release(pod.volatile_id)
+        for listener in list(self._removal_listeners):
+            listener(pod)
+
+    @staticmethod
+    def _swap_remove(items: List[Any], index: Dict[Any, int], item: Any):
+        """Remove an item in O(1) by moving the last item into its slot."""
+        position = index.pop(item)
+        last = items.pop()
+        if last is not item:
+            items[position] = last
+            index[last] = position
+
     def create_input_station(self, station_id: int, tier: Tier,
                             x: float, y: float, radius: float,
                             capacity: float = 100.0,
@@ -275,6 +353,19 @@ class Instance:
         
         return item
 
+    def create_item_bundle(self, bundle_id: int, item_description: ItemDescription,
+                           item_count: int) -> ItemBundle:
+        """Create a bundle of items of one type."""
+        bundle = ItemBundle(self)
+        bundle.id = bundle_id
+        bundle.item_description = item_description
+        bundle.item_count = item_count
+        self.item_bundles.append(bundle)
+        
+        self._item_bundle_id = max(self._item_bundle_id, bundle_id + 1)
+        
+        return bundle
+
     def create_semaphore(self, sem_id: int, max_count: int) -> QueueSemaphore:
         """Create a queue semaphore for traffic control."""
         semaphore = QueueSemaphore(self, max_count)
@@ -285,6 +376,40 @@ class Instance:
         
         return semaphore
 
+    def add_bot_listener(self, listener: Callable[[Bot], None]):
+        """Register a callback invoked on bot state transitions.
+
+        Listeners fire when a path is assigned or exhausted, when the active or
+        waiting flag changes and when a pod is picked up or set down.
+        """
+        self._bot_listeners.append(listener)
+
+    def remove_bot_listener(self, listener: Callable[[Bot], None]):
+        """Unregister a bot listener."""
+        if listener in self._bot_listeners:
+            self._bot_listeners.remove(listener)
+
+    def add_removal_listener(self, listener: Callable[[Union[Bot, Pod]], None]):
+        """Register a callback invoked after a bot or pod has been removed."""
+        self._removal_listeners.append(listener)
+
+    def remove_removal_listener(self, listener: Callable[[Union[Bot, Pod]], None]):
+        """Unregister a removal listener."""
+        if listener in self._removal_listeners:
+            self._removal_listeners.remove(listener)
+
+    def notify_bot_changed(self, bot: Bot):
+        """Notify all bot listeners about a change of the given bot."""
+        for listener in self._bot_listeners:
+            listener(bot)
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        # Waypoints are pickled with neighbor IDs; resolve them to objects again
+        by_volatile_id = {wp.volatile_id: wp for wp in self.waypoints}
+        for waypoint in self.waypoints:
+            waypoint.paths = tuple(by_volatile_id[wp_id] for wp_id in waypoint.paths)
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get current simulation statistics."""
         return {
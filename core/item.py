@@ -32,6 +32,8 @@ class SimpleItemDescription(ItemDescription):
 class ItemBundle:
     """A bundle of items of the same type."""
 
+    __slots__ = ('instance', 'id', 'item_description', 'item_count')
+
     def __init__(self, instance: 'Instance'):
         self.instance = instance
         self.id: int = 0
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 class Order:
     """Customer order to be fulfilled."""
 
+    __slots__ = ('id', 'items', 'creation_time', 'completion_time', 'priority', 'is_completed')
+
     def __init__(self, order_id: int):
         self.id: int = order_id
         self.items: Dict[int, int] = {}  # item_description_id -> quantity
@@ -13,6 +13,10 @@ if TYPE_CHECKING:
 class Pod:
     """Storage pod that can be moved by bots."""
 
+    __slots__ = ('instance', 'id', 'volatile_id', 'tier', 'x', 'y', 'radius', 'orientation',
+                 'capacity', 'items', 'item_counts', 'waypoint', 'carried_by',
+                 'times_picked', 'times_moved')
+
     def __init__(self, instance: 'Instance'):
         self.instance = instance
         self.id: int = 0
@@ -1,6 +1,6 @@
 """Tier (warehouse floor level) implementation."""
 
-from typing import List, Optional, TYPE_CHECKING
+from typing import Dict, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .instance import Instance
@@ -27,42 +27,45 @@ class Tier:
         self.relative_position_y: float = 0.0
         self.relative_position_z: float = 0.0
         
-        # Elements on this tier
-        self.bots: List['Bot'] = []
-        self.pods: List['Pod'] = []
-        self.waypoints: List['Waypoint'] = []
-        self.input_stations: List['InputStation'] = []
-        self.output_stations: List['OutputStation'] = []
+        # Elements on this tier (insertion-ordered dicts used as sets)
+        self.bots: Dict['Bot', None] = {}
+        self.pods: Dict['Pod', None] = {}
+        self.waypoints: Dict['Waypoint', None] = {}
+        self.input_stations: Dict['InputStation', None] = {}
+        self.output_stations: Dict['OutputStation', None] = {}
 
     def add_bot(self, bot: 'Bot'):
         """Add a bot to this tier."""
-        if bot not in self.bots:
-            self.bots.append(bot)
-            bot.tier = self
+        self.bots[bot] = None
+        bot.tier = self
+
+    def remove_bot(self, bot: 'Bot'):
+        """Remove a bot from this tier."""
+        self.bots.pop(bot, None)
 
     def add_pod(self, pod: 'Pod'):
         """Add a pod to this tier."""
-        if pod not in self.pods:
-            self.pods.append(pod)
-            pod.tier = self
+        self.pods[pod] = None
+        pod.tier = self
+
+    def remove_pod(self, pod: 'Pod'):
+        """Remove a pod from this tier."""
+        self.pods.pop(pod, None)
 
     def add_waypoint(self, waypoint: 'Waypoint'):
         """Add a waypoint to this tier."""
-        if waypoint not in self.waypoints:
-            self.waypoints.append(waypoint)
-            waypoint.tier = self
+        self.waypoints[waypoint] = None
+        waypoint.tier = self
 
     def add_input_station(self, station: 'InputStation'):
         """Add an input station to this tier."""
-        if station not in self.input_stations:
-            self.input_stations.append(station)
-            station.tier = self
+        self.input_stations[station] = None
+        station.tier = self
 
     def add_output_station(self, station: 'OutputStation'):
         """Add an output station to this tier."""
-        if station not in self.output_stations:
-            self.output_stations.append(station)
-            station.tier = self
+        self.output_stations[station] = None
+        station.tier = self
 
     def get_bounds(self):
         """Get the bounds of this tier."""
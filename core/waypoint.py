@@ -1,6 +1,6 @@
 """Waypoint (navigation node) implementation."""
 
-from typing import Optional, List, TYPE_CHECKING
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .instance import Instance
@@ -11,7 +11,17 @@ if TYPE_CHECKING:
 
 
 class Waypoint:
-    """Navigation node in the warehouse graph."""
+    """Navigation node in the warehouse graph.
+
+    Layouts reach hundreds of thousands of waypoints, so the class uses
+    ``__slots__`` and keeps its adjacency in tuples, which are rebuilt by
+    ``add_path`` (the graph is built once and rarely changes).
+    """
+
+    __slots__ = ('instance', 'id', 'volatile_id', 'tier', 'x', 'y', 'radius',
+                 'paths', 'path_distances', 'pod_storage_location', 'is_queue_waypoint',
+                 'input_station', 'output_station', 'elevator', 'pod',
+                 'reserved_by', 'reservation_time')
 
     def __init__(self, instance: 'Instance'):
         self.instance = instance
@@ -25,8 +35,8 @@ class Waypoint:
         self.radius: float = 0.3
         
         # Graph connections
-        self.paths: List['Waypoint'] = []  # Adjacent waypoints
-        self.path_distances: List[float] = []  # Distances to adjacent waypoints
+        self.paths: Tuple['Waypoint', ...] = ()  # Adjacent waypoints
+        self.path_distances: Tuple[float, ...] = ()  # Distances to adjacent waypoints
         
         # Type flags
         self.pod_storage_location: bool = False
@@ -62,14 +72,16 @@ class Waypoint:
                 dy = self.y - waypoint.y
                 distance = (dx**2 + dy**2)**0.5
             
-            self.paths.append(waypoint)
-            self.path_distances.append(distance)
+            self.paths += (waypoint,)
+            self.path_distances += (distance,)
             
             # Add reverse connection
-            waypoint.paths.append(self)
-            waypoint.path_distances.append(distance)
+            waypoint.paths += (self,)
+            waypoint.path_distances += (distance,)
+            if self.instance is not None:
+                self.instance.topology_version += 1
 
-    def get_neighbors(self) -> List['Waypoint']:
+    def get_neighbors(self) -> Tuple['Waypoint', ...]:
         """Get all neighboring waypoints."""
         return self.paths
 
@@ -79,6 +91,18 @@ class Waypoint:
         dy = self.y - other.y
         return (dx**2 + dy**2)**0.5
 
+    def __getstate__(self):
+        # Store neighbors by volatile ID; deep neighbor chains would otherwise
+        # exhaust the recursion limit when pickling large layouts. The owning
+        # Instance re-links them when it is restored.
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['paths'] = tuple(wp.volatile_id for wp in self.paths)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __repr__(self):
         wp_type = "storage" if self.pod_storage_location else "queue" if self.is_queue_waypoint else "normal"
         return f"Waypoint(id={self.id}, pos=({self.x:.1f}, {self.y:.1f}), type={wp_type})"
@@ -20,10 +20,25 @@ class InstanceGenerator:
                                  num_pods: int = 50,
                                  num_input_stations: int = 2,
                                  num_output_stations: int = 3,
-                                 aisle_width: float = 3.0) -> Instance:
-        """Generate a simple warehouse layout."""
+                                 aisle_width: float = 3.0,
+                                 num_skus: int = 100,
+                                 skus_per_pod: int = 4,
+                                 units_per_sku: int = 20,
+                                 cross_aisles: bool = True) -> Instance:
+        """Generate a simple warehouse layout.
+
+        With ``cross_aisles`` (the default) every 3rd column and every 5th row
+        is an aisle, so each storage location borders an aisle. Without, only
+        every 4th column is an aisle, the layout of earlier versions; middle
+        storage columns are then unreachable once pods are placed. Settings
+        include the ``order_generation`` defaults of ``configs/default_settings.json``.
+        """
         instance = Instance.create_instance(
-            setting_config={'time_step': 0.1, 'simulation_duration': 3600.0},
+            setting_config={
+                'time_step': 0.1, 'simulation_duration': 3600.0,
+                'order_generation': {'enabled': True, 'rate': 0.5,
+                                     'items_per_order_min': 1, 'items_per_order_max': 5},
+            },
             controller_config={'pathfinding': {'method': 'WHCAvStar'}}
         )
         instance.name = "GeneratedWarehouse"
@@ -38,6 +53,7 @@ class InstanceGenerator:
         
         cols = int(length / waypoint_spacing)
         rows = int(width / waypoint_spacing)
+        aisle_period = 3 if cross_aisles else 4  # Every aisle_period-th column is an aisle
 
         for i in range(cols):
             for j in range(rows):
@@ -45,7 +61,9 @@ class InstanceGenerator:
                 y = j * waypoint_spacing + waypoint_spacing / 2
                 
                 # Determine if this is a storage location (not in aisles)
-                is_storage = (i % 4 != 0)  # Every 4th column is an aisle
+                is_storage = i % aisle_period != 0
+                if cross_aisles:
+                    is_storage = is_storage and j % 5 != 0
                 
                 wp = instance.create_waypoint(
                     len(waypoints), tier, x, y,
@@ -84,6 +102,8 @@ class InstanceGenerator:
             )
             station.waypoint = wp
             wp.input_station = station
+            wp.add_path(self._nearest_aisle_waypoint(waypoints, cols, rows, waypoint_spacing,
+                                                     aisle_period, wp))
             waypoints.append(wp)
 
         # Place output stations along right edge
@@ -101,8 +121,15 @@ class InstanceGenerator:
             )
             station.waypoint = wp
             wp.output_station = station
+            wp.add_path(self._nearest_aisle_waypoint(waypoints, cols, rows, waypoint_spacing,
+                                                     aisle_period, wp))
             waypoints.append(wp)
 
+        # Item types (SKUs) that orders can ask for
+        for i in range(num_skus):
+            item = instance.create_item_description(i)
+            item.sku = f"SKU-{i:05d}"
+
         # Place pods at storage locations
         storage_waypoints = [wp for wp in waypoints if wp.pod_storage_location]
         for i in range(min(num_pods, len(storage_waypoints))):
@@ -113,11 +140,19 @@ class InstanceGenerator:
             wp.pod = pod
             pod.waypoint = wp
 
+        # Stock each pod with a few SKUs, cycling so that every SKU is stored somewhere
+        if instance.item_descriptions:
+            for pod in instance.pods:
+                for k in range(min(skus_per_pod, num_skus)):
+                    item = instance.item_descriptions[(pod.id * skus_per_pod + k) % num_skus]
+                    pod.add_item_bundle(instance.create_item_bundle(
+                        len(instance.item_bundles), item, units_per_sku))
+
         # Place bots at random non-storage waypoints
         available_waypoints = [wp for wp in waypoints if not wp.pod_storage_location]
         for i in range(num_bots):
             if i < len(available_waypoints):
-                wp = self.randomizer.choice(available_waypoints)
+                wp = self.randomizer.choice(available_waypoints, stream=RandomizerSimple.BOT_PLACEMENT)
                 bot = instance.create_bot(
                     i, tier, wp.x, wp.y, 0.3, 0.0,
                     pod_transfer_time=5.0,
@@ -127,9 +162,18 @@ class InstanceGenerator:
                     turn_speed=1.0,
                     collision_penalty_time=5.0
                 )
+                bot.current_waypoint = wp
 
         return instance
 
+    @staticmethod
+    def _nearest_aisle_waypoint(waypoints, cols: int, rows: int, spacing: float,
+                                aisle_period: int, target):
+        """Grid waypoint in an aisle column (every ``aisle_period``-th) closest to the target."""
+        i = min(range(0, cols, aisle_period), key=lambda col: abs(col * spacing + spacing / 2 - target.x))
+        j = min(max(int(round((target.y - spacing / 2) / spacing)), 0), rows - 1)
+        return waypoints[i * rows + j]
+
     def generate_config_dict(self, instance: Instance) -> Dict[str, Any]:
         """Generate configuration dictionary for an instance."""
         return {
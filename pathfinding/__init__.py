@@ -2,5 +2,9 @@
 
 from .astar import AStar
 from .graph import WaypointGraph
+from .landmarks import LandmarkTable
+from .contraction import ContractionHierarchy, CHPathfinding
+from .reservations import ReservationTable
 
-__all__ = ['AStar', 'WaypointGraph']
+__all__ = ['AStar', 'WaypointGraph', 'LandmarkTable', 'ContractionHierarchy', 'CHPathfinding',
+           'ReservationTable']
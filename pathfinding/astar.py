@@ -1,18 +1,49 @@
 """A* pathfinding algorithm implementation."""
 
-from typing import List, Optional, Callable, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Callable, Sequence, Tuple, TYPE_CHECKING
 import heapq
 import math
 
+from .graph import WaypointGraph
+
 if TYPE_CHECKING:
     from core.waypoint import Waypoint
 
 
 class AStar:
-    """A* pathfinding algorithm for waypoint graphs."""
+    """A* pathfinding algorithm for waypoint graphs.
+
+    Searches run on the integer CSR form of a ``WaypointGraph`` (the one
+    given, or the graph of the start waypoint's instance): edge lengths come
+    precomputed from the graph, and g-scores, parents and closed flags live
+    in buffers allocated once per graph size. Each search gets a new id and
+    a buffer entry only counts if it was written during the current search,
+    so nothing has to be cleared between searches.
+
+    Heuristics: ``'euclidean'``, ``'manhattan'`` or ``'landmarks'`` (ALT).
+    The latter takes the larger of the straight-line distance and the
+    landmark bounds of ``WaypointGraph.landmark_table(landmarks)``, using
+    the ``active_landmarks`` landmarks that bound the start best.
+
+    Waypoints outside any graph, and searches with an ``is_blocked``
+    callback, fall back to the object-based search (where ``'landmarks'``
+    means euclidean).
+    """
 
-    def __init__(self, heuristic: str = 'euclidean'):
+    def __init__(self, heuristic: str = 'euclidean', graph: Optional[WaypointGraph] = None,
+                 landmarks: int = 8, active_landmarks: int = 4):
         self.heuristic_type = heuristic
+        self.graph = graph
+        self.landmarks = landmarks
+        self.active_landmarks = active_landmarks
+        self.nodes_expanded = 0
+
+        # Search buffers (see class docstring)
+        self._g: List[float] = []
+        self._parent: List[int] = []
+        self._seen: List[int] = []
+        self._closed: List[int] = []
+        self._search_id = 0
 
     def heuristic(self, wp1: 'Waypoint', wp2: 'Waypoint') -> float:
         """Calculate heuristic distance between waypoints."""
@@ -21,17 +52,147 @@ class AStar:
 
         if self.heuristic_type == 'manhattan':
             return abs(dx) + abs(dy)
-        elif self.heuristic_type == 'euclidean':
+        elif self.heuristic_type in ('euclidean', 'landmarks'):
             return math.sqrt(dx * dx + dy * dy)
         else:
             return abs(dx) + abs(dy)  # Default to Manhattan
 
+    def graph_for(self, waypoint: 'Waypoint') -> Optional[WaypointGraph]:
+        """Graph to search from a waypoint: the configured one or its instance's."""
+        if self.graph is not None:
+            self.graph.ensure_built()
+            return self.graph
+        if waypoint.instance is None:
+            return None
+        return WaypointGraph.for_instance(waypoint.instance)
+
     def find_path(self, start: 'Waypoint', goal: 'Waypoint',
-                  is_blocked: Callable[['Waypoint'], bool] = None) -> Optional[List['Waypoint']]:
-        """Find shortest path from start to goal using A*."""
+                  is_blocked: Callable[['Waypoint'], bool] = None,
+                  blocked: Optional[Sequence[int]] = None,
+                  encountered: Optional[List['Waypoint']] = None) -> Optional[List['Waypoint']]:
+        """Find shortest path from start to goal using A*.
+
+        Waypoints can be excluded either with a per-node mask ``blocked``
+        indexed like the graph (e.g. ``WaypointGraph.blocked_bytes``) or with
+        an ``is_blocked`` callback; the goal is never excluded. Excluded
+        waypoints the search ran into that could shorten the path if they
+        were freed are appended to ``encountered``.
+        """
         if start == goal:
             return [start]
 
+        if is_blocked is None:
+            graph = self.graph_for(start)
+            if graph is not None:
+                start_index = graph.index.get(start)
+                goal_index = graph.index.get(goal)
+                if start_index is not None and goal_index is not None:
+                    hits: Optional[List[Tuple[int, float]]] = [] if encountered is not None else None
+                    nodes = self.search(graph, start_index, goal_index, blocked, hits)
+                    waypoints = graph.waypoints
+                    if hits:
+                        cost = self._g[goal_index] if nodes is not None else math.inf
+                        encountered.extend(waypoints[i] for i, bound in hits if bound < cost - 1e-9)
+                    if nodes is None:
+                        return None
+                    return [waypoints[i] for i in nodes]
+
+        return self._find_path_objects(start, goal, is_blocked, encountered)
+
+    def search(self, graph: WaypointGraph, start: int, goal: int,
+               blocked: Optional[Sequence[int]] = None,
+               encountered: Optional[List[Tuple[int, float]]] = None) -> Optional[List[int]]:
+        """A* over graph indices; returns the node indices from start to goal.
+
+        Blocked nodes the search runs into are appended to ``encountered``
+        with a lower bound on the length of a path through them. The bound
+        uses the straight-line distance to the goal, whatever the heuristic:
+        Manhattan distance overestimates across diagonal edges.
+        """
+        if start == goal:
+            return [start]
+        neighbor_rows, weight_rows, xs, ys = graph.rows()
+        size = len(xs)
+        if len(self._g) != size:
+            self._g = [0.0] * size
+            self._parent = [-1] * size
+            self._seen = [0] * size
+            self._closed = [0] * size
+        self._search_id += 1
+        search_id = self._search_id
+        g_score, parent, seen, closed = self._g, self._parent, self._seen, self._closed
+
+        goal_x, goal_y = xs[goal], ys[goal]
+        euclidean = self.heuristic_type != 'manhattan'
+        active = None
+        if self.heuristic_type == 'landmarks':
+            active = graph.landmark_table(self.landmarks).active(start, goal, self.active_landmarks) or None
+        sqrt = math.sqrt
+        push, pop = heapq.heappush, heapq.heappop
+
+        g_score[start] = 0.0
+        parent[start] = -1
+        seen[start] = search_id
+        # Priority queue: (f_score, h_score, node); ties go to the node nearer
+        # the goal, and stale entries are skipped when popped
+        open_set = [(0.0, 0.0, start)]
+        expanded = 0
+
+        while open_set:
+            _, _, current = pop(open_set)
+            if closed[current] == search_id:
+                continue
+            if current == goal:
+                self.nodes_expanded += expanded
+                path = [current]
+                while current != start:
+                    current = parent[current]
+                    path.append(current)
+                path.reverse()
+                return path
+            closed[current] = search_id
+            expanded += 1
+
+            base = g_score[current]
+            for neighbor, weight in zip(neighbor_rows[current], weight_rows[current]):
+                if closed[neighbor] == search_id:
+                    continue
+                # Skip blocked waypoints (except goal)
+                if blocked is not None and blocked[neighbor] and neighbor != goal:
+                    if encountered is not None:
+                        dx = xs[neighbor] - goal_x
+                        dy = ys[neighbor] - goal_y
+                        encountered.append((neighbor, base + weight + sqrt(dx * dx + dy * dy)))
+                    continue
+                tentative_g = base + weight
+                if seen[neighbor] == search_id and tentative_g >= g_score[neighbor]:
+                    continue
+                g_score[neighbor] = tentative_g
+                parent[neighbor] = current
+                seen[neighbor] = search_id
+                dx = xs[neighbor] - goal_x
+                dy = ys[neighbor] - goal_y
+                h = sqrt(dx * dx + dy * dy) if euclidean else abs(dx) + abs(dy)
+                if active is not None:
+                    # Triangle inequality bounds; nodes a landmark cannot reach
+                    # give inf/nan terms, which fail the comparisons
+                    for from_row, from_goal, to_row, to_goal in active:
+                        bound = from_goal - from_row[neighbor]
+                        if bound > h:
+                            h = bound
+                        bound = to_row[neighbor] - to_goal
+                        if bound > h:
+                            h = bound
+                push(open_set, (tentative_g + h, h, neighbor))
+
+        # No path found
+        self.nodes_expanded += expanded
+        return None
+
+    def _find_path_objects(self, start: 'Waypoint', goal: 'Waypoint',
+                           is_blocked: Callable[['Waypoint'], bool] = None,
+                           encountered: Optional[List['Waypoint']] = None) -> Optional[List['Waypoint']]:
+        """A* directly on waypoint objects."""
         if is_blocked is None:
             is_blocked = lambda wp: False
 
@@ -45,12 +206,15 @@ class AStar:
         f_score = {start: self.heuristic(start, goal)}
 
         open_set_hash = {start}
+        hits: List[Tuple['Waypoint', float]] = []
 
         while open_set:
             current_f, _, current = heapq.heappop(open_set)
             open_set_hash.remove(current)
 
             if current == goal:
+                if encountered is not None:
+                    encountered.extend(wp for wp, bound in hits if bound < g_score[goal] - 1e-9)
                 # Reconstruct path
                 path = []
                 while current in came_from:
@@ -61,13 +225,17 @@ class AStar:
                 return path
 
             # Check neighbors
-            for neighbor in current.get_neighbors():
+            for neighbor, distance in zip(current.paths, current.path_distances):
                 # Skip blocked waypoints (except goal)
                 if neighbor != goal and is_blocked(neighbor):
+                    if encountered is not None:
+                        # Straight-line bound, admissible with any heuristic
+                        bound = math.hypot(neighbor.x - goal.x, neighbor.y - goal.y)
+                        hits.append((neighbor, g_score[current] + distance + bound))
                     continue
 
                 # Calculate tentative g_score
-                tentative_g = g_score[current] + current.distance_to(neighbor)
+                tentative_g = g_score[current] + distance
 
                 if neighbor not in g_score or tentative_g < g_score[neighbor]:
                     came_from[neighbor] = current
@@ -81,7 +249,15 @@ class AStar:
                         open_set_hash.add(neighbor)
 
         # No path found
+        if encountered is not None:
+            encountered.extend(wp for wp, _ in hits)
         return None
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Search buffers are scratch space; do not carry them into checkpoints
+        state = self.__dict__.copy()
+        state.update(_g=[], _parent=[], _seen=[], _closed=[])
+        return state
+
     def __repr__(self):
         return f"AStar(heuristic={self.heuristic_type})"
@@ -0,0 +1,282 @@
+"""Contraction hierarchies for static shortest-path queries."""
+
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+import heapq
+import math
+
+from .graph import WaypointGraph
+
+if TYPE_CHECKING:
+    from core.waypoint import Waypoint
+
+
+class ContractionHierarchy:
+    """Contraction-hierarchy index over the static topology of a ``WaypointGraph``.
+
+    Preprocessing contracts the nodes one by one, least important first
+    (fewest shortcuts added, fewest neighbours already contracted). When a
+    node is contracted, a shortcut ``u -> w`` replaces each path
+    ``u -> v -> w`` through it unless a local witness search finds a path
+    that is no longer. The position of a node in that order is its
+    ``rank``.
+
+    A query runs Dijkstra forwards from the start and backwards from the
+    goal, both only over edges leading to higher ranks. The two searches
+    meet at the highest node of a shortest path, and shortcuts are unpacked
+    through the contracted node recorded for them. The upward search spaces
+    are small, so queries settle a few hundred nodes instead of the
+    thousands A* expands on large layouts.
+
+    The index ignores pods occupying storage locations and reservations:
+    it answers distances on the layout alone. It is built for one
+    ``topology_version`` of the graph; use ``WaypointGraph.contraction_hierarchy``
+    to get an index that follows layout changes.
+    """
+
+    def __init__(self, graph: WaypointGraph, witness_limit: int = 120):
+        graph.ensure_built()
+        self.version = graph.topology_version
+        self.witness_limit = witness_limit
+        self.size = len(graph)
+        self.shortcuts = 0
+        self.rank: List[int] = [0] * self.size
+        # Upward edges: forward (v -> higher) and backward (higher -> v)
+        self.up_neighbors: List[Tuple[int, ...]] = [()] * self.size
+        self.up_weights: List[Tuple[float, ...]] = [()] * self.size
+        self.down_neighbors: List[Tuple[int, ...]] = [()] * self.size
+        self.down_weights: List[Tuple[float, ...]] = [()] * self.size
+        # Contracted node of each shortcut (u, w)
+        self.middle: Dict[Tuple[int, int], int] = {}
+        self._contract(graph)
+
+    def _contract(self, graph: WaypointGraph):
+        """Order and contract all nodes, recording upward edges and shortcuts."""
+        offsets = graph.offsets.tolist()
+        neighbors = graph.neighbors.tolist()
+        weights = graph.weights.tolist()
+        out_edges: List[Dict[int, float]] = [{} for _ in range(self.size)]
+        in_edges: List[Dict[int, float]] = [{} for _ in range(self.size)]
+        for u in range(self.size):
+            for k in range(offsets[u], offsets[u + 1]):
+                w, weight = neighbors[k], weights[k]
+                if w != u and weight < out_edges[u].get(w, math.inf):
+                    out_edges[u][w] = weight
+                    in_edges[w][u] = weight
+
+        contracted_neighbors = [0] * self.size
+        queue = []
+        for v in range(self.size):
+            shortcuts = self._shortcuts(v, out_edges, in_edges)
+            queue.append((self._priority(v, shortcuts, out_edges, in_edges, contracted_neighbors), v))
+        heapq.heapify(queue)
+
+        rank = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            # Lazy update: the priority may have grown since it was queued
+            shortcuts = self._shortcuts(v, out_edges, in_edges)
+            priority = self._priority(v, shortcuts, out_edges, in_edges, contracted_neighbors)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, v))
+                continue
+
+            self.rank[v] = rank
+            rank += 1
+            outgoing, incoming = out_edges[v], in_edges[v]
+            self.up_neighbors[v] = tuple(outgoing)
+            self.up_weights[v] = tuple(outgoing.values())
+            self.down_neighbors[v] = tuple(incoming)
+            self.down_weights[v] = tuple(incoming.values())
+            for w in outgoing:
+                del in_edges[w][v]
+                contracted_neighbors[w] += 1
+            for u in incoming:
+                del out_edges[u][v]
+                contracted_neighbors[u] += 1
+            for u, w, weight in shortcuts:
+                out_edges[u][w] = weight
+                in_edges[w][u] = weight
+                self.middle[(u, w)] = v
+            self.shortcuts += len(shortcuts)
+            out_edges[v] = in_edges[v] = {}
+
+    @staticmethod
+    def _priority(v: int, shortcuts: List[Tuple[int, int, float]], out_edges: List[Dict[int, float]],
+                  in_edges: List[Dict[int, float]], contracted_neighbors: List[int]) -> int:
+        """Weighted edge difference plus contracted neighbours (spreads contraction evenly)."""
+        return 3 * (len(shortcuts) - len(out_edges[v]) - len(in_edges[v])) + contracted_neighbors[v]
+
+    def _shortcuts(self, v: int, out_edges: List[Dict[int, float]],
+                   in_edges: List[Dict[int, float]]) -> List[Tuple[int, int, float]]:
+        """Shortcuts ``(u, w, length)`` needed to contract v."""
+        shortcuts = []
+        outgoing = out_edges[v]
+        if not outgoing:
+            return shortcuts
+        limit = self.witness_limit
+        inf = math.inf
+        push, pop = heapq.heappush, heapq.heappop
+        for u, to_v in in_edges[v].items():
+            targets = {w: to_v + weight for w, weight in outgoing.items() if w != u}
+            if not targets:
+                continue
+            # Witness search: Dijkstra from u avoiding v, bounded in distance and
+            # size; a target is witnessed once any path reaches it no longer
+            # than the one through v
+            max_distance = max(targets.values())
+            distance = {u: 0.0}
+            heap = [(0.0, u)]
+            settled = 0
+            unwitnessed = len(targets)
+            while heap and settled < limit:
+                d, x = pop(heap)
+                if d > distance[x]:
+                    continue
+                if d > max_distance:
+                    break
+                settled += 1
+                for y, weight in out_edges[x].items():
+                    if y == v:
+                        continue
+                    nd = d + weight
+                    previous = distance.get(y, inf)
+                    if nd < previous:
+                        distance[y] = nd
+                        push(heap, (nd, y))
+                        length = targets.get(y)
+                        if length is not None and nd <= length < previous:
+                            unwitnessed -= 1
+                if not unwitnessed:
+                    break
+            for w, length in targets.items():
+                if distance.get(w, inf) > length:
+                    shortcuts.append((u, w, length))
+        return shortcuts
+
+    def query(self, start: int, goal: int) -> Tuple[float, Optional[List[int]]]:
+        """Shortest distance and node path from start to goal (``inf``, None if unreachable)."""
+        if start == goal:
+            return 0.0, [start]
+        up_neighbors, up_weights = self.up_neighbors, self.up_weights
+        down_neighbors, down_weights = self.down_neighbors, self.down_weights
+        push, pop = heapq.heappush, heapq.heappop
+        forward = {start: 0.0}
+        backward = {goal: 0.0}
+        forward_parent = {start: -1}
+        backward_parent = {goal: -1}
+        forward_heap = [(0.0, start)]
+        backward_heap = [(0.0, goal)]
+        best = math.inf
+        meeting = -1
+
+        while forward_heap or backward_heap:
+            forward_top = forward_heap[0][0] if forward_heap else math.inf
+            backward_top = backward_heap[0][0] if backward_heap else math.inf
+            if min(forward_top, backward_top) >= best:
+                break
+            if forward_top <= backward_top:
+                d, v = pop(forward_heap)
+                distance, other, parent, heap = forward, backward, forward_parent, forward_heap
+                relax_nodes, relax_weights = up_neighbors[v], up_weights[v]
+                stall_nodes, stall_weights = down_neighbors[v], down_weights[v]
+            else:
+                d, v = pop(backward_heap)
+                distance, other, parent, heap = backward, forward, backward_parent, backward_heap
+                relax_nodes, relax_weights = down_neighbors[v], down_weights[v]
+                stall_nodes, stall_weights = up_neighbors[v], up_weights[v]
+            if d > distance[v]:
+                continue
+            through = other.get(v)
+            if through is not None and d + through < best:
+                best = d + through
+                meeting = v
+            # Stall on demand: a higher node reaches v more cheaply, so v's
+            # upward edges cannot be on a shortest path from this side
+            stalled = False
+            for u, weight in zip(stall_nodes, stall_weights):
+                reached = distance.get(u)
+                if reached is not None and reached + weight < d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+            for w, weight in zip(relax_nodes, relax_weights):
+                nd = d + weight
+                if nd < distance.get(w, math.inf):
+                    distance[w] = nd
+                    parent[w] = v
+                    push(heap, (nd, w))
+
+        if meeting < 0:
+            return math.inf, None
+        upward = [meeting]
+        while forward_parent[upward[-1]] >= 0:
+            upward.append(forward_parent[upward[-1]])
+        upward.reverse()
+        node = meeting
+        while backward_parent[node] >= 0:
+            node = backward_parent[node]
+            upward.append(node)
+        return best, self.unpack(upward)
+
+    def unpack(self, nodes: List[int]) -> List[int]:
+        """Expand the shortcuts of a path into the original edges."""
+        middle = self.middle
+        path = [nodes[0]]
+        for u, w in zip(nodes, nodes[1:]):
+            stack = [(u, w)]
+            while stack:
+                a, b = stack.pop()
+                m = middle.get((a, b))
+                if m is None:
+                    path.append(b)
+                else:
+                    stack.append((m, b))
+                    stack.append((a, m))
+        return path
+
+    def distance(self, start: int, goal: int) -> float:
+        """Shortest distance from start to goal (``inf`` if unreachable)."""
+        return self.query(start, goal)[0]
+
+    def __repr__(self):
+        return f"ContractionHierarchy(nodes={self.size}, shortcuts={self.shortcuts})"
+
+
+class CHPathfinding:
+    """Pathfinding on the contraction hierarchy of the instance's waypoint graph.
+
+    Paths and distances follow the layout only, like plain ``AStar`` without
+    a blocked mask; the index is built on first use and after layout changes.
+    """
+
+    def graph_for(self, waypoint: 'Waypoint') -> Optional[WaypointGraph]:
+        """The waypoint's instance graph, if it belongs to one."""
+        if waypoint.instance is None:
+            return None
+        return WaypointGraph.for_instance(waypoint.instance)
+
+    def find_path(self, start: 'Waypoint', goal: 'Waypoint') -> Optional[List['Waypoint']]:
+        """Find a shortest path from start to goal."""
+        if start == goal:
+            return [start]
+        graph = self.graph_for(start)
+        if graph is None or start not in graph.index or goal not in graph.index:
+            return None
+        _, nodes = graph.contraction_hierarchy().query(graph.index[start], graph.index[goal])
+        if nodes is None:
+            return None
+        waypoints = graph.waypoints
+        return [waypoints[i] for i in nodes]
+
+    def distance(self, start: 'Waypoint', goal: 'Waypoint') -> float:
+        """Shortest-path distance from start to goal (``inf`` if unreachable)."""
+        if start == goal:
+            return 0.0
+        graph = self.graph_for(start)
+        if graph is None or start not in graph.index or goal not in graph.index:
+            return math.inf
+        return graph.contraction_hierarchy().distance(graph.index[start], graph.index[goal])
+
+    def __repr__(self):
+        return "CHPathfinding()"
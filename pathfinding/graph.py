@@ -1,25 +1,89 @@
 """Waypoint graph for pathfinding."""
 
-from typing import List, Dict, Set, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 import math
+import numpy as np
+
+from .landmarks import LandmarkTable
 
 if TYPE_CHECKING:
+    from core.instance import Instance
+    from .contraction import ContractionHierarchy
     from core.waypoint import Waypoint
     from core.pod import Pod
 
 
 class WaypointGraph:
-    """Graph structure for waypoint-based navigation."""
+    """Graph structure for waypoint-based navigation.
+
+    Besides the object-level adjacency, the graph keeps a compressed sparse
+    row (CSR) form for search kernels: waypoint ``i`` (``index[waypoint]``)
+    has its outgoing edges at ``offsets[i]:offsets[i + 1]`` of ``neighbors``
+    (target indices) and ``weights`` (edge lengths, from
+    ``Waypoint.path_distances``). ``x``/``y`` hold the coordinates. Python
+    search kernels read the same edges through ``rows`` (per-node tuples),
+    which iterate faster than slicing arrays.
+
+    ``blocked`` is a NumPy boolean view of a ``bytearray`` marking storage
+    locations occupied by a pod. It is kept in sync by ``pod_setdown`` and
+    ``pod_pickup``, which also notify the occupancy listeners (e.g. a
+    ``PathCache``); kernels index the ``bytearray`` (``blocked_bytes``)
+    directly, which is much cheaper than indexing the array from Python.
+    The CSR form is (re)built lazily when the graph changed, and also follows
+    the instance's ``topology_version`` (see ``for_instance``); so do the
+    ``LandmarkTable`` and ``ContractionHierarchy`` returned by
+    ``landmark_table`` and ``contraction_hierarchy``.
+    """
 
     def __init__(self):
         self.waypoints: List['Waypoint'] = []
-        self.adjacency: Dict['Waypoint', List['Waypoint']] = {}
+        self.adjacency: Dict['Waypoint', Tuple['Waypoint', ...]] = {}
+        self.topology_version = 0
+        self._built_version = -1
+        self.source_version = -1  # Instance topology version the graph was built from
+
+        # CSR representation (valid when _built_version == topology_version)
+        self.index: Dict['Waypoint', int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.neighbors = np.zeros(0, dtype=np.int32)
+        self.weights = np.zeros(0, dtype=np.float64)
+        self.x = np.zeros(0, dtype=np.float64)
+        self.y = np.zeros(0, dtype=np.float64)
+        self.blocked_bytes = bytearray()
+        self.blocked = np.zeros(0, dtype=np.bool_)
+        self.blocked_version = 0  # Bumped whenever the blocked mask changes
+        self._rows: Optional[tuple] = None
+        self._predecessors: Optional[Tuple[List[Tuple[int, ...]], List[Tuple[float, ...]]]] = None
+        self._landmarks: Optional[LandmarkTable] = None
+        self._hierarchy = None
+        self._occupancy_listeners: List[Callable[['Waypoint'], None]] = []
+
+    @classmethod
+    def from_waypoints(cls, waypoints: List['Waypoint']) -> 'WaypointGraph':
+        """Build a graph from waypoints and their ``paths``."""
+        graph = cls()
+        for waypoint in waypoints:
+            graph.waypoints.append(waypoint)
+            graph.adjacency[waypoint] = waypoint.paths
+        graph.build()
+        return graph
+
+    @classmethod
+    def for_instance(cls, instance: 'Instance') -> 'WaypointGraph':
+        """The instance's graph, (re)built if the layout changed since."""
+        graph = instance.waypoint_graph
+        if graph is None or graph.source_version != instance.topology_version:
+            graph = cls.from_waypoints(instance.waypoints)
+            graph.source_version = instance.topology_version
+            instance.waypoint_graph = graph
+        return graph
 
     def add(self, waypoint: 'Waypoint'):
         """Add a waypoint to the graph."""
-        if waypoint not in self.waypoints:
+        if waypoint not in self.adjacency:
             self.waypoints.append(waypoint)
-            self.adjacency[waypoint] = []
+            self.adjacency[waypoint] = ()
+            self.topology_version += 1
 
     def add_edge(self, from_wp: 'Waypoint', to_wp: 'Waypoint', bidirectional: bool = True):
         """Add an edge between two waypoints."""
@@ -29,25 +93,143 @@ class WaypointGraph:
             self.add(to_wp)
 
         if to_wp not in self.adjacency[from_wp]:
-            self.adjacency[from_wp].append(to_wp)
+            self.adjacency[from_wp] += (to_wp,)
 
         if bidirectional and from_wp not in self.adjacency[to_wp]:
-            self.adjacency[to_wp].append(from_wp)
+            self.adjacency[to_wp] += (from_wp,)
+        self.topology_version += 1
 
-    def get_neighbors(self, waypoint: 'Waypoint') -> List['Waypoint']:
+    def get_neighbors(self, waypoint: 'Waypoint') -> Tuple['Waypoint', ...]:
         """Get neighboring waypoints."""
-        return self.adjacency.get(waypoint, [])
+        return self.adjacency.get(waypoint, ())
+
+    def build(self):
+        """Build the CSR arrays and blocked mask from the adjacency."""
+        waypoints = self.waypoints
+        index = {waypoint: i for i, waypoint in enumerate(waypoints)}
+        offsets = np.zeros(len(waypoints) + 1, dtype=np.int64)
+        neighbors: List[int] = []
+        weights: List[float] = []
+        for i, waypoint in enumerate(waypoints):
+            distances = dict(zip(waypoint.paths, waypoint.path_distances))
+            for neighbor in self.adjacency[waypoint]:
+                distance = distances.get(neighbor)
+                neighbors.append(index[neighbor])
+                weights.append(distance if distance is not None else self.get_distance(waypoint, neighbor))
+            offsets[i + 1] = len(neighbors)
+
+        self.index = index
+        self.offsets = offsets
+        self.neighbors = np.array(neighbors, dtype=np.int32)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.x = np.array([wp.x for wp in waypoints], dtype=np.float64)
+        self.y = np.array([wp.y for wp in waypoints], dtype=np.float64)
+        self.blocked_bytes = bytearray(self.is_waypoint_blocked(wp) for wp in waypoints)
+        self.blocked = np.frombuffer(self.blocked_bytes, dtype=np.bool_)
+        self.blocked_version += 1
+        self._rows = None
+        self._predecessors = None
+        self._landmarks = None
+        self._hierarchy = None
+        self._built_version = self.topology_version
+
+    def ensure_built(self):
+        """Rebuild the CSR form if the graph changed since it was built."""
+        if self._built_version != self.topology_version:
+            self.build()
+
+    def rows(self) -> Tuple[List[Tuple[int, ...]], List[Tuple[float, ...]], List[float], List[float]]:
+        """``(neighbor_rows, weight_rows, x, y)`` as Python lists for search kernels.
+
+        ``neighbor_rows[i]`` and ``weight_rows[i]`` hold the targets and
+        lengths of the edges of node ``i``.
+        """
+        self.ensure_built()
+        if self._rows is None:
+            offsets = self.offsets.tolist()
+            nodes = list(range(len(self.waypoints)))
+            neighbors = [nodes[j] for j in self.neighbors.tolist()]  # One int object per node
+            weights = self.weights.tolist()
+            neighbor_rows = []
+            weight_rows = []
+            # Most nodes share the same edge lengths; keep one tuple per pattern
+            patterns: Dict[Tuple[float, ...], Tuple[float, ...]] = {}
+            for i in nodes:
+                first, last = offsets[i], offsets[i + 1]
+                neighbor_rows.append(tuple(neighbors[first:last]))
+                lengths = tuple(weights[first:last])
+                weight_rows.append(patterns.setdefault(lengths, lengths))
+            self._rows = (neighbor_rows, weight_rows, self.x.tolist(), self.y.tolist())
+        return self._rows
+
+    def predecessor_rows(self) -> Tuple[List[Tuple[int, ...]], List[Tuple[float, ...]]]:
+        """``(predecessor_rows, weight_rows)`` for backward searches.
+
+        ``predecessor_rows[i]`` holds the nodes with an edge into node ``i``
+        and ``weight_rows[i]`` the lengths of those edges.
+        """
+        self.ensure_built()
+        if self._predecessors is None:
+            neighbor_rows, weight_rows, _, _ = self.rows()
+            predecessors: List[List[int]] = [[] for _ in neighbor_rows]
+            lengths: List[List[float]] = [[] for _ in neighbor_rows]
+            for i, (row, weights) in enumerate(zip(neighbor_rows, weight_rows)):
+                for j, weight in zip(row, weights):
+                    predecessors[j].append(i)
+                    lengths[j].append(weight)
+            self._predecessors = ([tuple(row) for row in predecessors],
+                                  [tuple(row) for row in lengths])
+        return self._predecessors
+
+    def landmark_table(self, count: int = 8) -> LandmarkTable:
+        """Landmark distances for ALT search, computed on first use after a (re)build."""
+        self.ensure_built()
+        table = self._landmarks
+        if table is None or table.requested != count:
+            table = self._landmarks = LandmarkTable(self, count)
+        return table
+
+    def contraction_hierarchy(self) -> 'ContractionHierarchy':
+        """Contraction-hierarchy index of the graph, built on first use after a (re)build."""
+        from .contraction import ContractionHierarchy
+        self.ensure_built()
+        if self._hierarchy is None:
+            self._hierarchy = ContractionHierarchy(self)
+        return self._hierarchy
+
+    def __len__(self) -> int:
+        return len(self.waypoints)
 
     def pod_setdown(self, pod: 'Pod', waypoint: 'Waypoint'):
         """Handle pod being set down at a waypoint."""
         waypoint.pod = pod
         pod.waypoint = waypoint
+        self._update_blocked(waypoint)
 
     def pod_pickup(self, pod: 'Pod'):
         """Handle pod being picked up from a waypoint."""
-        if pod.waypoint:
-            pod.waypoint.pod = None
+        waypoint = pod.waypoint
+        if waypoint:
+            waypoint.pod = None
             pod.waypoint = None
+            self._update_blocked(waypoint)
+
+    def _update_blocked(self, waypoint: 'Waypoint'):
+        i = self.index.get(waypoint)
+        if i is not None:
+            self.blocked_bytes[i] = self.is_waypoint_blocked(waypoint)
+            self.blocked_version += 1
+        for listener in self._occupancy_listeners:
+            listener(waypoint)
+
+    def add_occupancy_listener(self, callback: Callable[['Waypoint'], None]):
+        """Call ``callback(waypoint)`` whenever a pod is set down at or picked up from a waypoint."""
+        self._occupancy_listeners.append(callback)
+
+    def remove_occupancy_listener(self, callback: Callable[['Waypoint'], None]):
+        """Stop notifying a listener added with add_occupancy_listener."""
+        if callback in self._occupancy_listeners:
+            self._occupancy_listeners.remove(callback)
 
     def is_waypoint_blocked(self, waypoint: 'Waypoint') -> bool:
         """Check if waypoint is blocked by a pod."""
@@ -55,7 +237,7 @@ class WaypointGraph:
 
     def get_available_storage_locations(self) -> List['Waypoint']:
         """Get all available storage waypoints."""
-        return [wp for wp in self.waypoints 
+        return [wp for wp in self.waypoints
                 if wp.pod_storage_location and wp.pod is None]
 
     def get_distance(self, wp1: 'Waypoint', wp2: 'Waypoint') -> float:
@@ -64,5 +246,20 @@ class WaypointGraph:
         dy = wp1.y - wp2.y
         return math.sqrt(dx * dx + dy * dy)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The blocked array is a view of the bytearray; rebuild it on restore.
+        # Landmark tables are recomputed on demand; the contraction hierarchy
+        # is costly to rebuild and kept.
+        state = self.__dict__.copy()
+        del state['blocked']
+        state['_rows'] = None
+        state['_predecessors'] = None
+        state['_landmarks'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self.blocked = np.frombuffer(self.blocked_bytes, dtype=np.bool_)
+
     def __repr__(self):
-        return f"WaypointGraph(waypoints={len(self.waypoints)})"
+        return f"WaypointGraph(waypoints={len(self.waypoints)}, edges={len(self.neighbors)})"
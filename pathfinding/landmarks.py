@@ -0,0 +1,102 @@
+"""Landmark (ALT) lower bounds for A*."""
+
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from .graph import WaypointGraph
+
+
+class LandmarkTable:
+    """Shortest-path distances from and to a few landmark waypoints.
+
+    By the triangle inequality, for any landmark ``L`` the distance from
+    ``v`` to ``t`` is at least ``d(L, t) - d(L, v)`` and
+    ``d(v, L) - d(t, L)``. Unlike straight-line distance, these bounds
+    account for the detours that storage blocks force, so A* expands far
+    fewer nodes. The bounds stay admissible when nodes are blocked, as that
+    only makes true distances longer.
+
+    Landmarks are picked by farthest-point selection (each new landmark is
+    the node farthest from those already chosen), which places them on the
+    periphery of the layout. One Dijkstra per landmark (``scipy.sparse.csgraph``)
+    fills ``from_landmark`` and ``to_landmark`` (``count x nodes`` arrays); on
+    symmetric graphs both are the same array.
+    """
+
+    def __init__(self, graph: 'WaypointGraph', count: int = 8):
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import dijkstra
+
+        graph.ensure_built()
+        size = len(graph)
+        self.requested = count
+        matrix = csr_matrix((graph.weights, graph.neighbors, graph.offsets), shape=(size, size))
+        transposed = matrix.T.tocsr()
+        self.symmetric = (matrix != transposed).nnz == 0
+
+        landmarks: List[int] = []
+        from_rows: List[np.ndarray] = []
+        to_rows: List[np.ndarray] = []
+        if size:
+            # Distance to the nearest chosen landmark; unreachable nodes are never picked
+            nearest = dijkstra(matrix, indices=0)
+            while len(landmarks) < min(count, size):
+                candidate = int(np.argmax(np.where(np.isfinite(nearest), nearest, -1.0)))
+                if landmarks and nearest[candidate] <= 0.0:
+                    break
+                distances = dijkstra(matrix, indices=candidate)
+                landmarks.append(candidate)
+                from_rows.append(distances)
+                to_rows.append(distances if self.symmetric else dijkstra(transposed, indices=candidate))
+                nearest = distances if len(landmarks) == 1 else np.minimum(nearest, distances)
+
+        self.landmarks = landmarks
+        self.from_landmark = np.array(from_rows).reshape(len(landmarks), size)
+        self.to_landmark = (self.from_landmark if self.symmetric
+                            else np.array(to_rows).reshape(len(landmarks), size))
+        self._views = self._make_views()
+
+    def _make_views(self) -> List[Tuple[memoryview, memoryview]]:
+        """Per-landmark memoryviews of the distance rows, for Python kernels."""
+        return [(memoryview(self.from_landmark[k]), memoryview(self.to_landmark[k]))
+                for k in range(len(self.landmarks))]
+
+    def bound(self, node: int, goal: int) -> float:
+        """Lower bound on the distance from node to goal."""
+        if not self.landmarks:
+            return 0.0
+        with np.errstate(invalid='ignore'):
+            bounds = np.concatenate((self.from_landmark[:, goal] - self.from_landmark[:, node],
+                                     self.to_landmark[:, node] - self.to_landmark[:, goal]))
+        bounds = bounds[~np.isnan(bounds)]
+        return max(float(bounds.max()), 0.0) if bounds.size else 0.0
+
+    def active(self, start: int, goal: int, count: int = 4) -> List[Tuple[memoryview, float, memoryview, float]]:
+        """The landmarks giving the best bounds for a query, ready for a kernel.
+
+        Returns ``(from_row, from_goal, to_row, to_goal)`` per landmark: the
+        bound at node ``v`` is ``max(from_goal - from_row[v], to_row[v] - to_goal)``.
+        """
+        with np.errstate(invalid='ignore'):
+            quality = np.fmax(self.from_landmark[:, goal] - self.from_landmark[:, start],
+                              self.to_landmark[:, start] - self.to_landmark[:, goal])
+        quality = np.nan_to_num(quality, nan=-np.inf)
+        chosen = np.argsort(-quality, kind='stable')[:count].tolist()
+        return [(self._views[k][0], float(self.from_landmark[k, goal]),
+                 self._views[k][1], float(self.to_landmark[k, goal])) for k in chosen]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_views']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._views = self._make_views()
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    def __repr__(self):
+        return f"LandmarkTable(landmarks={len(self.landmarks)}, symmetric={self.symmetric})"
@@ -0,0 +1,105 @@
+"""LRU cache of planned routes."""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.waypoint import Waypoint
+
+CacheKey = Tuple['Waypoint', 'Waypoint', Hashable]
+
+
+class PathCache:
+    """Size-bounded LRU cache of routes keyed by ``(start, goal, variant)``.
+
+    ``variant`` identifies the graph a route was planned on (e.g. the layout
+    version), so routes planned on different graphs never mix. Each entry
+    lists the waypoints whose occupancy it depends on, typically the
+    waypoints along the route (a pod set down there blocks it) and the
+    occupied storage locations the search ran into (a pod picked up there
+    may open a shorter route). ``invalidate`` drops exactly the entries
+    depending on a waypoint; routes that ignore occupancy have no
+    dependencies and only leave the cache when evicted.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._entries: 'OrderedDict[CacheKey, Tuple[Tuple[Waypoint, ...], Tuple[Waypoint, ...]]]' = OrderedDict()
+        self._dependents: Dict['Waypoint', Set[CacheKey]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, start: 'Waypoint', goal: 'Waypoint', variant: Hashable = None) -> Optional[List['Waypoint']]:
+        """The cached route from start to goal, or None (counted as a miss)."""
+        key = (start, goal, variant)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(entry[0])
+
+    def put(self, start: 'Waypoint', goal: 'Waypoint', variant: Hashable, path: List['Waypoint'],
+            dependencies: Iterable['Waypoint'] = ()):
+        """Cache a route, evicting the least recently used ones beyond capacity."""
+        if self.capacity <= 0:
+            return
+        key = (start, goal, variant)
+        if key in self._entries:
+            self._unlink(key, self._entries.pop(key)[1])
+        dependencies = tuple(set(dependencies))
+        self._entries[key] = (tuple(path), dependencies)
+        for waypoint in dependencies:
+            self._dependents.setdefault(waypoint, set()).add(key)
+        while len(self._entries) > self.capacity:
+            evicted, (_, evicted_dependencies) = self._entries.popitem(last=False)
+            self._unlink(evicted, evicted_dependencies)
+            self.evictions += 1
+
+    def invalidate(self, waypoint: 'Waypoint'):
+        """Drop the routes depending on the occupancy of a waypoint."""
+        for key in self._dependents.pop(waypoint, ()):
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._unlink(key, entry[1])
+                self.invalidations += 1
+
+    def _unlink(self, key: CacheKey, dependencies: Tuple['Waypoint', ...]):
+        for waypoint in dependencies:
+            keys = self._dependents.get(waypoint)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[waypoint]
+
+    def clear(self):
+        """Drop all routes (counters are kept)."""
+        self._entries.clear()
+        self._dependents.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def metrics(self) -> Dict[str, float]:
+        """Counters for reporting."""
+        return {
+            'path_cache_hits': self.hits,
+            'path_cache_misses': self.misses,
+            'path_cache_hit_rate': self.hit_rate,
+            'path_cache_evictions': self.evictions,
+            'path_cache_invalidations': self.invalidations,
+            'path_cache_size': len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return (f"PathCache(size={len(self._entries)}/{self.capacity}, "
+                f"hit_rate={self.hit_rate:.2f}, evictions={self.evictions})")
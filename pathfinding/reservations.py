@@ -0,0 +1,161 @@
+"""Interval-indexed reservation table for cooperative pathfinding."""
+
+from typing import Any, Dict, Hashable, List, Tuple
+import heapq
+import itertools
+import math
+
+from sortedcontainers import SortedList
+
+
+class ReservationTable:
+    """Time intervals during which waypoints and edges are claimed.
+
+    Each waypoint (and each directed edge) keeps its reservations in a
+    ``SortedList`` of ``(start, end, seq, owner)`` ordered by start time.
+    Intervals are half-open, ``[start, end)``, so back-to-back reservations
+    do not conflict. A conflict query only looks at entries starting in
+    ``[start - max_duration, end)``, which is a bisection plus the few
+    entries that can actually overlap; its cost does not grow with the
+    number of reservations elsewhere or far away in time.
+
+    Reservations belong to an owner (e.g. a bot id). An owner never
+    conflicts with itself, and ``release`` drops all its reservations, e.g.
+    before it replans.
+
+    An owner can also ``park`` on a waypoint: an open-ended claim, e.g. of
+    the goal a bot stays on after its route, which lasts until ``release``.
+
+    For expiry, reservations are also filed in a calendar of buckets of
+    ``bucket_width`` seconds by end time, with a heap of the non-empty
+    bucket numbers. ``expire`` pops only the buckets that have fully
+    elapsed, so its cost follows the reservations that actually ended, and
+    the table holds only reservations ending after ``now - bucket_width``.
+    """
+
+    def __init__(self, bucket_width: float = 1.0):
+        self.bucket_width = bucket_width
+        self._vertices: Dict[Hashable, SortedList] = {}
+        self._edges: Dict[Tuple[Hashable, Hashable], SortedList] = {}
+        self._owned: Dict[Any, Dict[tuple, Tuple[Dict, Hashable]]] = {}
+        self._buckets: Dict[int, List[Tuple[Dict, Hashable, tuple]]] = {}
+        self._bucket_heap: List[int] = []
+        self._seq = itertools.count()
+        self.max_duration = 0.0
+        self._count = 0
+        self._parked: Dict[Hashable, Dict[Any, float]] = {}
+        self._parking: Dict[Any, List[Hashable]] = {}
+
+    def _add(self, table: Dict, key: Hashable, start: float, end: float, owner: Any):
+        entry = (start, end, next(self._seq), owner)
+        entries = table.get(key)
+        if entries is None:
+            entries = table[key] = SortedList()
+        entries.add(entry)
+        if end - start > self.max_duration:
+            self.max_duration = end - start
+        if owner is not None:
+            self._owned.setdefault(owner, {})[entry] = (table, key)
+        bucket = math.floor(end / self.bucket_width)
+        filed = self._buckets.get(bucket)
+        if filed is None:
+            filed = self._buckets[bucket] = []
+            heapq.heappush(self._bucket_heap, bucket)
+        filed.append((table, key, entry))
+        self._count += 1
+
+    def _discard(self, table: Dict, key: Hashable, entry: tuple):
+        entries = table.get(key)
+        if entries is not None and entry in entries:
+            entries.remove(entry)
+            self._count -= 1
+            if not entries:
+                del table[key]
+
+    def reserve(self, waypoint: Hashable, start: float, end: float, owner: Any = None):
+        """Claim a waypoint during ``[start, end)``."""
+        self._add(self._vertices, waypoint, start, end, owner)
+
+    def reserve_edge(self, source: Hashable, target: Hashable, start: float, end: float, owner: Any = None):
+        """Claim the move from source to target during ``[start, end)``."""
+        self._add(self._edges, (source, target), start, end, owner)
+
+    def park(self, waypoint: Hashable, start: float, owner: Any):
+        """Claim a waypoint from ``start`` on, until the owner is released."""
+        self._parked.setdefault(waypoint, {})[owner] = start
+        self._parking.setdefault(owner, []).append(waypoint)
+        self._count += 1
+
+    def _conflicts(self, entries: SortedList, start: float, end: float, owner: Any) -> bool:
+        for entry_start, entry_end, _, entry_owner in entries.irange(
+                (start - self.max_duration,), (end,), inclusive=(True, False)):
+            if entry_end > start and (owner is None or entry_owner != owner):
+                return True
+        return False
+
+    def is_free(self, waypoint: Hashable, start: float, end: float, owner: Any = None,
+                parked: bool = True) -> bool:
+        """Whether nobody else holds the waypoint during ``[start, end)``.
+
+        With ``parked=False``, owners parked on the waypoint are ignored.
+        """
+        parked = parked and self._parked.get(waypoint)
+        if parked:
+            for parked_owner, since in parked.items():
+                if since < end and (owner is None or parked_owner != owner):
+                    return False
+        entries = self._vertices.get(waypoint)
+        return entries is None or not self._conflicts(entries, start, end, owner)
+
+    def is_edge_free(self, source: Hashable, target: Hashable, start: float, end: float,
+                     owner: Any = None) -> bool:
+        """Whether a move from source to target during ``[start, end)`` avoids edge conflicts.
+
+        Besides the edge itself, checks the opposite direction: two bots
+        swapping places would pass through each other.
+        """
+        for key in ((source, target), (target, source)):
+            entries = self._edges.get(key)
+            if entries is not None and self._conflicts(entries, start, end, owner):
+                return False
+        return True
+
+    def intervals(self, waypoint: Hashable) -> List[Tuple[float, float]]:
+        """Reserved ``(start, end)`` intervals of a waypoint, by start time."""
+        return [(start, end) for start, end, _, _ in self._vertices.get(waypoint, ())]
+
+    def release(self, owner: Any):
+        """Drop every reservation of an owner, including where it parked."""
+        for entry, (table, key) in self._owned.pop(owner, {}).items():
+            self._discard(table, key, entry)
+        for waypoint in self._parking.pop(owner, ()):
+            parked = self._parked[waypoint]
+            if parked.pop(owner, None) is not None:
+                self._count -= 1
+            if not parked:
+                del self._parked[waypoint]
+
+    def expire(self, now: float):
+        """Drop reservations whose bucket ended by ``now``.
+
+        Reservations ending earlier in the current bucket stay until it
+        elapses; they end before ``now`` and no longer conflict with
+        queries from ``now`` on.
+        """
+        heap = self._bucket_heap
+        last = math.floor(now / self.bucket_width) - 1
+        while heap and heap[0] <= last:
+            for table, key, entry in self._buckets.pop(heapq.heappop(heap)):
+                self._discard(table, key, entry)
+                owned = self._owned.get(entry[3])
+                if owned is not None:
+                    owned.pop(entry, None)
+                    if not owned:
+                        del self._owned[entry[3]]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self):
+        return (f"ReservationTable(reservations={self._count}, waypoints={len(self._vertices)}, "
+                f"parked={len(self._parked)}, buckets={len(self._buckets)})")
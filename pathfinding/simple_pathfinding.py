@@ -14,12 +14,20 @@ class SimplePathfinding:
     def __init__(self):
         self.astar = AStar(heuristic='manhattan')
 
-    def find_path(self, start: 'Waypoint', goal: 'Waypoint') -> Optional[List['Waypoint']]:
-        """Find simple path from start to goal."""
+    def find_path(self, start: 'Waypoint', goal: 'Waypoint',
+                  encountered: Optional[List['Waypoint']] = None) -> Optional[List['Waypoint']]:
+        """Find simple path from start to goal around occupied storage locations.
+
+        Occupied locations the search ran into are appended to ``encountered``.
+        """
+        graph = self.astar.graph_for(start)
+        if graph is not None:
+            return self.astar.find_path(start, goal, blocked=graph.blocked_bytes, encountered=encountered)
+
         def is_blocked(wp: 'Waypoint') -> bool:
             return wp.pod_storage_location and wp.pod is not None
 
-        return self.astar.find_path(start, goal, is_blocked)
+        return self.astar.find_path(start, goal, is_blocked, encountered=encountered)
 
     def __repr__(self):
         return "SimplePathfinding()"
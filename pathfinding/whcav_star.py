@@ -1,77 +1,293 @@
 """Windowed Hierarchical Cooperative A* (WHCAvStar) pathfinding."""
 
-from typing import List, Dict, Optional, Set, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 import heapq
 import math
 
 if TYPE_CHECKING:
     from core.waypoint import Waypoint
     from core.bot import Bot
+    from .graph import WaypointGraph
 
 from .astar import AStar
+from .reservations import ReservationTable
+
+
+class _TravelTimes:
+    """Travel times to a goal, from a Dijkstra search backwards from it.
+
+    The search is resumed only as far as needed to answer a query
+    (Reverse Resumable A*), so planning pays for the part of the layout
+    between start and goal, not the whole graph. Storage locations holding
+    a pod are impassable, except the start the bot stands on. Edge lengths
+    are the weights of the graph's CSR arrays.
+    """
+
+    def __init__(self, predecessors: List[Tuple[int, ...]], lengths: List[Tuple[float, ...]],
+                 edge_time: Callable[[float], float], goal: int, blocked: bytearray, start: int):
+        self.predecessors = predecessors
+        self.lengths = lengths
+        self.edge_time = edge_time
+        self.blocked = blocked
+        self.start = start
+        self.time: Dict[int, float] = {}
+        self._tentative: Dict[int, float] = {goal: 0.0}
+        self._frontier = [(0.0, goal)]
+
+    def __call__(self, node: int) -> Optional[float]:
+        """Seconds from node to the goal, or None if it cannot reach it."""
+        settled = self.time
+        found = settled.get(node)
+        frontier = self._frontier
+        tentative = self._tentative
+        edge_time = self.edge_time
+        while found is None and frontier:
+            t, x = heapq.heappop(frontier)
+            if x in settled:
+                continue
+            settled[x] = t
+            for p, length in zip(self.predecessors[x], self.lengths[x]):
+                if p in settled or (self.blocked[p] and p != self.start):
+                    continue
+                candidate = t + edge_time(length)
+                if candidate < tentative.get(p, math.inf):
+                    tentative[p] = candidate
+                    heapq.heappush(frontier, (candidate, p))
+            found = settled.get(node)
+        return found
 
 
 class WHCAvStar:
-    """Windowed Hierarchical Cooperative A* for multi-agent pathfinding."""
+    """Windowed Hierarchical Cooperative A* for multi-agent pathfinding.
+
+    Plans in space and time: a state is a waypoint at a point in time, and
+    a bot either moves to a neighbour, taking ``bot.travel_time`` for the
+    edge from standstill, or waits in place for ``bot.wait_time`` (one
+    ``step_time`` when planning without a bot). A move holds both of its
+    waypoints and the edge until the bot arrives, and a wait holds the
+    waypoint. The search avoids what other bots hold in the
+    ``ReservationTable``, including swaps along an edge, guided by the
+    travel times of the abstract (reservation-free) search as heuristic.
+
+    A route covers at most ``window_size`` actions: if the goal lies
+    further, it ends where the window does, and the caller plans again
+    from there once the bot arrives. Routes contain a repeated waypoint
+    for each wait, which the executors honour by holding the bot. The
+    route is reserved for the bot, replacing its previous reservations;
+    the bot holds the end of the window for one wait, and parks on the
+    goal until it plans again.
 
-    def __init__(self, window_size: int = 10):
+    Waypoints closer together than two bot radii (e.g. a station next to a
+    storage location) cannot be used at the same time: reserving one also
+    reserves the others. Queue waypoints at the stations are never
+    reserved: bots line up there by design.
+    """
+
+    def __init__(self, window_size: int = 10, step_time: float = 1.0):
         self.window_size = window_size
+        self.step_time = step_time
         self.astar = AStar(heuristic='euclidean')
-        self.reservations: Dict['Waypoint', List[float]] = {}  # waypoint -> list of reserved times
+        self.table = ReservationTable(bucket_width=step_time)
+        self._near_key: Optional[Tuple[int, int, float]] = None
+        self._near: Dict[int, Tuple[int, ...]] = {}
 
-    def reserve_waypoint(self, waypoint: 'Waypoint', time: float, duration: float = 1.0):
+    def reserve_waypoint(self, waypoint: 'Waypoint', time: float, duration: float = 1.0, owner: Any = None):
         """Reserve a waypoint for a specific time window."""
-        if waypoint not in self.reservations:
-            self.reservations[waypoint] = []
-        self.reservations[waypoint].append((time, time + duration))
+        self.table.reserve(waypoint, time, time + duration, owner)
 
     def is_waypoint_available(self, waypoint: 'Waypoint', time: float) -> bool:
         """Check if waypoint is available at a specific time."""
-        if waypoint not in self.reservations:
-            return True
-
-        # Check if time conflicts with any reservation
-        for start_time, end_time in self.reservations[waypoint]:
-            if start_time <= time <= end_time:
-                return False
-        return True
+        return self.table.is_free(waypoint, time, math.nextafter(time, math.inf))
 
     def find_path_cooperative(self, bot: 'Bot', start: 'Waypoint', goal: 'Waypoint',
                              start_time: float = 0.0) -> Optional[List['Waypoint']]:
-        """Find path considering other bots' reservations."""
-        # Use time-extended A* with reservation table
-        current_time = start_time
-
-        def is_blocked(wp: 'Waypoint') -> bool:
-            # Check if waypoint is blocked by static obstacles
-            if wp.pod_storage_location and wp.pod is not None:
-                return True
-            # Check time-based reservations
-            if not self.is_waypoint_available(wp, current_time):
-                return True
-            return False
-
-        # Find basic path
-        path = self.astar.find_path(start, goal, is_blocked)
+        """Find a path considering other bots' reservations.
 
-        if path:
-            # Reserve waypoints along the path
-            time = start_time
-            for wp in path:
-                self.reserve_waypoint(wp, time)
-                time += 1.0  # Assume 1 second per waypoint
+        The path ends at the goal, or at the end of the window if the goal
+        is further away.
+        """
+        owner = bot.id if bot is not None else None
+        if owner is not None:
+            # The new route supersedes whatever the bot had reserved
+            self.table.release(owner)
+        edge_time, wait = self._timing(bot)
+        near: Dict['Waypoint', Tuple['Waypoint', ...]] = {}
 
+        graph = self.astar.graph_for(start)
+        if graph is not None and start in graph.index and goal in graph.index:
+            states = self._search(graph, graph.index[start], graph.index[goal], start_time, owner,
+                                  edge_time, wait)
+            nodes = [graph.index[start]]
+            path = times = None
+            if states is not None:
+                nodes = [node for node, _ in states]
+                path = [graph.waypoints[i] for i in nodes]
+                times = [start_time + g for _, g in states]
+            if bot is not None:
+                close = self._near_nodes(graph, 2.0 * bot.radius)
+                waypoints = graph.waypoints
+                near = {waypoints[i]: tuple(waypoints[j] for j in close[i])
+                        for i in set(nodes) if i in close}
+        else:
+            def is_blocked(wp: 'Waypoint') -> bool:
+                # Static obstacles and reservations at the start time only
+                if wp.pod_storage_location and wp.pod is not None:
+                    return True
+                return not self.is_waypoint_available(wp, start_time)
+
+            path = self.astar.find_path(start, goal, is_blocked)
+            times = None
+            if path:
+                times = [start_time]
+                for source, target in zip(path, path[1:]):
+                    length = source.path_distances[source.paths.index(target)]
+                    times.append(times[-1] + edge_time(length))
+
+        if path:
+            self._reserve_path(path, times, owner, wait, near, path[-1] is goal)
+        elif owner is not None:
+            # Without a route the bot stays where it is
+            self._reserve_path([start], [start_time], owner, wait, near, True)
         return path
 
+    def _near_nodes(self, graph: 'WaypointGraph', clearance: float) -> Dict[int, Tuple[int, ...]]:
+        """Nodes with other nodes closer than ``clearance``, built once per layout."""
+        key = (id(graph), graph.topology_version, clearance)
+        if key != self._near_key:
+            _, _, xs, ys = graph.rows()
+            cells: Dict[Tuple[int, int], List[int]] = {}
+            for i, (x, y) in enumerate(zip(xs, ys)):
+                cells.setdefault((math.floor(x / clearance), math.floor(y / clearance)), []).append(i)
+            near: Dict[int, List[int]] = {}
+            for (cx, cy), members in cells.items():
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        for j in cells.get((cx + dx, cy + dy), ()):
+                            for i in members:
+                                if i != j and math.hypot(xs[i] - xs[j], ys[i] - ys[j]) < clearance:
+                                    near.setdefault(i, []).append(j)
+            self._near = {i: tuple(others) for i, others in near.items()}
+            self._near_key = key
+        return self._near
+
+    def _timing(self, bot: Optional['Bot']) -> Tuple[Callable[[float], float], float]:
+        """Seconds to drive an edge of a given length, and to wait, for a bot."""
+        if bot is None:
+            step = self.step_time
+            return (lambda distance: step), step
+        times: Dict[float, float] = {}
+        travel_time = bot.travel_time
+
+        def edge_time(distance: float) -> float:
+            # Layouts have few distinct edge lengths
+            t = times.get(distance)
+            if t is None:
+                t = times[distance] = travel_time(distance)
+            return t
+
+        return edge_time, bot.wait_time
+
+    def _search(self, graph: 'WaypointGraph', start: int, goal: int, start_time: float,
+                owner: Any, edge_time: Callable[[float], float],
+                wait: float) -> Optional[List[Tuple[int, float]]]:
+        """Space-time A* over ``(node, time)``, up to the goal or the end of the window.
+
+        Returns the ``(node, elapsed seconds)`` states of the route.
+        """
+        blocked = graph.blocked_bytes
+        neighbor_rows, weight_rows, _, _ = graph.rows()
+        times = _TravelTimes(*graph.predecessor_rows(), edge_time, goal, blocked, start)
+        h = times(start)
+        if h is None:
+            return None
+
+        waypoints = graph.waypoints
+        table = self.table
+        window = self.window_size
+        push, pop = heapq.heappush, heapq.heappop
+
+        # A state's cost is its time, part of the key: the first time a
+        # state is generated is as cheap as it gets
+        parent: Dict[Tuple[int, float], Optional[Tuple[int, float]]] = {(start, 0.0): None}
+        open_set = [(h, h, 0.0, 0, start)]  # (f, h, elapsed, actions, node), sooner arrival first
+        end = None
+        while open_set:
+            _, _, g, k, node = pop(open_set)
+            if node == goal or k >= window:
+                end = (node, g)
+                break
+            t = start_time + g
+            source = waypoints[node]
+            for neighbor, length in zip(neighbor_rows[node] + (node,), weight_rows[node] + (0.0,)):
+                if neighbor == node:
+                    duration = wait
+                    hold = wait
+                else:
+                    if blocked[neighbor] and neighbor != goal:
+                        continue
+                    duration = edge_time(length)
+                    # The bot stays on the goal after arrival
+                    hold = math.inf if neighbor == goal else duration
+                key = (neighbor, g + duration)
+                if key in parent:
+                    continue
+                # Bots parked on the start or the goal share it (e.g. a pod's location)
+                if (k > 0 and not source.is_queue_waypoint and
+                        not table.is_free(source, t, t + duration, owner, node != start)):
+                    continue
+                if neighbor != node:
+                    target = waypoints[neighbor]
+                    if (not target.is_queue_waypoint and
+                            not table.is_free(target, t, t + hold, owner, neighbor != goal)):
+                        continue
+                    if not table.is_edge_free(source, target, t, t + duration, owner):
+                        continue
+                nh = times(neighbor)
+                if nh is None:
+                    continue
+                parent[key] = (node, g)
+                push(open_set, (g + duration + nh, nh, g + duration, k + 1, neighbor))
+        if end is None:
+            return None
+
+        states = []
+        state = end
+        while state is not None:
+            states.append(state)
+            state = parent[state]
+        states.reverse()
+        return states
+
+    def _reserve_path(self, path: List['Waypoint'], times: List[float], owner: Any, wait: float,
+                      near: Dict['Waypoint', Tuple['Waypoint', ...]], park: bool):
+        """Reserve the waypoints and edges of each move and wait, then the last waypoint.
+
+        ``times[k]`` is when the bot reaches ``path[k]``.
+        """
+        table = self.table
+
+        def hold(waypoint: 'Waypoint', start: float, end: float):
+            for other in (waypoint,) + near.get(waypoint, ()):
+                if not other.is_queue_waypoint:
+                    table.reserve(other, start, end, owner)
+
+        for source, target, t, arrival in zip(path, path[1:], times, times[1:]):
+            hold(source, t, arrival)
+            if target is not source:
+                hold(target, t, arrival)
+                table.reserve_edge(source, target, t, arrival, owner)
+        t = times[-1]
+        if owner is None or not park:
+            hold(path[-1], t, t + wait)
+            return
+        # The bot stays on its goal until it plans its next route
+        for waypoint in (path[-1],) + near.get(path[-1], ()):
+            if not waypoint.is_queue_waypoint:
+                table.park(waypoint, t, owner)
+
     def clear_old_reservations(self, current_time: float):
         """Clear reservations that are in the past."""
-        for waypoint in list(self.reservations.keys()):
-            self.reservations[waypoint] = [
-                (start, end) for start, end in self.reservations[waypoint]
-                if end > current_time
-            ]
-            if not self.reservations[waypoint]:
-                del self.reservations[waypoint]
+        self.table.expire(current_time)
 
     def __repr__(self):
-        return f"WHCAvStar(window={self.window_size}, reservations={len(self.reservations)})"
+        return f"WHCAvStar(window={self.window_size}, reservations={len(self.table)})"
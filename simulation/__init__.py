@@ -2,5 +2,8 @@
 
 from .executor import SimulationExecutor
 from .events import EventType, SimulationEvent
+from .checkpoint import SimulationCheckpoint
+from .sweep import ParameterSweep, SweepResultCache
 
-__all__ = ['SimulationExecutor', 'EventType', 'SimulationEvent']
+__all__ = ['SimulationExecutor', 'EventType', 'SimulationEvent', 'SimulationCheckpoint',
+           'ParameterSweep', 'SweepResultCache']
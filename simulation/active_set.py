@@ -0,0 +1,89 @@
+"""Tracking of moving, waiting and idle bots."""
+
+from typing import Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.instance import Instance
+    from core.bot import Bot
+
+
+class ActiveBotSet:
+    """Partitions the fleet into moving, waiting and idle bots.
+
+    Membership is only recomputed when a bot reports a state transition
+    (path assigned or exhausted, waiting toggled, pod picked up or set down)
+    through the instance bot listeners, so per-tick loops and dispatchers can
+    iterate just the subset they care about instead of the whole fleet.
+
+    The sets are insertion-ordered dicts so iteration order is deterministic.
+    """
+
+    MOVING = 'moving'
+    WAITING = 'waiting'
+    IDLE = 'idle'
+
+    def __init__(self, instance: 'Instance'):
+        self.instance = instance
+        self.moving: Dict['Bot', None] = {}
+        self.waiting: Dict['Bot', None] = {}
+        self.idle: Dict['Bot', None] = {}
+        # Idle, active bots without a pod or task: candidates for new tasks
+        self.available: Dict['Bot', None] = {}
+        # Bots busy with a task, even while standing still (e.g. lifting a pod)
+        self.reserved: Dict['Bot', None] = {}
+        self._state: Dict['Bot', str] = {}
+        self._groups = {self.MOVING: self.moving, self.WAITING: self.waiting, self.IDLE: self.idle}
+
+        for bot in instance.bots:
+            self.update(bot)
+        instance.add_bot_listener(self.update)
+
+    @staticmethod
+    def classify(bot: 'Bot') -> str:
+        """Determine which group a bot belongs to."""
+        if not bot.path:
+            return ActiveBotSet.IDLE
+        if bot.is_active and not bot.is_waiting:
+            return ActiveBotSet.MOVING
+        return ActiveBotSet.WAITING
+
+    def update(self, bot: 'Bot'):
+        """Re-classify a bot after a state transition."""
+        state = self.classify(bot)
+        previous = self._state.get(bot)
+        if state != previous:
+            if previous is not None:
+                del self._groups[previous][bot]
+            self._groups[state][bot] = None
+            self._state[bot] = state
+
+        if state == self.IDLE and bot.is_active and not bot.has_pod() and bot not in self.reserved:
+            self.available[bot] = None
+        else:
+            self.available.pop(bot, None)
+
+    def reserve(self, bot: 'Bot'):
+        """Take a bot out of the available set until it is released."""
+        self.reserved[bot] = None
+        self.available.pop(bot, None)
+
+    def release(self, bot: 'Bot'):
+        """Make a reserved bot available again (if it is idle)."""
+        self.reserved.pop(bot, None)
+        self.update(bot)
+
+    def discard(self, bot: 'Bot'):
+        """Stop tracking a bot."""
+        state = self._state.pop(bot, None)
+        if state is not None:
+            del self._groups[state][bot]
+        self.available.pop(bot, None)
+        self.reserved.pop(bot, None)
+
+    def state_of(self, bot: 'Bot') -> Optional[str]:
+        """Get the group a bot currently belongs to."""
+        return self._state.get(bot)
+
+    def __repr__(self):
+        return (f"ActiveBotSet(moving={len(self.moving)}, waiting={len(self.waiting)}, "
+                f"idle={len(self.idle)}, available={len(self.available)})")
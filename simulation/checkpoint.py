@@ -0,0 +1,77 @@
+"""Checkpointing, restoring and forking of running simulations."""
+
+from typing import Any, Dict, Tuple, TYPE_CHECKING
+from pathlib import Path
+import gzip
+import os
+import pickle
+
+if TYPE_CHECKING:
+    from .executor import SimulationExecutor
+
+
+class SimulationCheckpoint:
+    """Serializes a running simulation to a compact file and back.
+
+    A checkpoint captures the executor together with everything reachable from
+    it: the instance (bots, pods, waypoint occupancy, orders), controller state
+    such as WHCAvStar reservations and the scheduled event queue. Random state
+    comes with the instance's ``RandomizerSimple``, whose named streams are
+    pickled along with it; the global ``random`` module is left untouched.
+    Additional objects that share references with the simulation, like a
+    StatisticsTracker, are passed as extras and pickled in the same pass so
+    their references stay intact.
+
+    Event subscriptions are not part of a checkpoint; subscribe again after
+    restoring.
+    """
+
+    VERSION = 1
+
+    @staticmethod
+    def dumps(executor: 'SimulationExecutor', **extras: Any) -> bytes:
+        """Serialize the simulation state to bytes."""
+        payload = {
+            'version': SimulationCheckpoint.VERSION,
+            'time': executor.current_time,
+            'executor': executor,
+            'extras': extras,
+        }
+        return pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(data: bytes) -> Tuple['SimulationExecutor', Dict[str, Any]]:
+        """Restore a simulation from bytes; returns the executor and the extras."""
+        payload = pickle.loads(data)
+        if payload.get('version') != SimulationCheckpoint.VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {payload.get('version')}")
+        return payload['executor'], payload['extras']
+
+    @staticmethod
+    def save(executor: 'SimulationExecutor', filepath: str, **extras: Any):
+        """Write a compressed checkpoint file.
+
+        The file is written to a temporary path first and then moved into
+        place, so a crash while saving never leaves a truncated checkpoint.
+        """
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(SimulationCheckpoint.dumps(executor, **extras))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(filepath: str) -> Tuple['SimulationExecutor', Dict[str, Any]]:
+        """Read a checkpoint file; returns the executor and the extras."""
+        with gzip.open(filepath, 'rb') as f:
+            return SimulationCheckpoint.loads(f.read())
+
+    @staticmethod
+    def fork(executor: 'SimulationExecutor', **extras: Any) -> Tuple['SimulationExecutor', Dict[str, Any]]:
+        """Create an independent copy of a running simulation.
+
+        The copy shares no state with the original, so both can continue
+        with different settings (what-if runs from a warmed-up state).
+        """
+        return SimulationCheckpoint.loads(SimulationCheckpoint.dumps(executor, **extras))
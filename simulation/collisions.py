@@ -0,0 +1,145 @@
+"""Bot collision detection for fixed-step execution."""
+
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+import numpy as np
+
+from utils.geometry import GeometryHelper
+from utils.spatial_hash import SpatialHash
+from .events import EventType, SimulationEvent
+
+if TYPE_CHECKING:
+    from core.bot import Bot
+    from core.tier import Tier
+    from .executor import SimulationExecutor
+
+
+class CollisionDetector:
+    """Detects bots running into each other and applies the collision penalty.
+
+    Broad phase: bots are kept in one ``SpatialHash`` per tier. Only bots
+    that moved during the tick are re-bucketed and only they look for
+    partners, in the cells covered by their swept path, so a tick costs
+    O(moving bots) instead of O(bots²).
+
+    Narrow phase: all candidate pairs are tested at once with a vectorized
+    swept-circle check over the tick (``GeometryHelper.swept_circles_intersect``),
+    so fast movers cannot tunnel through each other between samples.
+
+    A collision is reported once per contact: the pair has to separate
+    before it can collide again. Both bots publish a COLLISION event, stop
+    and wait for their ``collision_penalty_time``.
+    """
+
+    def __init__(self, executor: 'SimulationExecutor', cell_size: Optional[float] = None):
+        self.executor = executor
+        self.instance = executor.instance
+        bots = self.instance.bots
+        self.max_radius = max((bot.radius for bot in bots), default=0.5)
+        self.max_velocity = max((bot.max_velocity for bot in bots), default=1.0)
+        if cell_size is None:
+            # A contact plus a tick of travel at full speed
+            cell_size = 2.0 * self.max_radius + self.max_velocity * executor.time_step
+        self.cell_size = cell_size
+
+        self._grids: Dict['Tier', SpatialHash] = {}
+        self._positions: Dict['Bot', Tuple[float, float]] = {}
+        for bot in bots:
+            self._track(bot)
+
+        self.contacts: Set[Tuple['Bot', 'Bot']] = set()
+        self._penalized: Dict['Bot', float] = {}
+        self.collisions = 0
+
+    def _track(self, bot: 'Bot'):
+        grid = self._grids.get(bot.tier)
+        if grid is None:
+            grid = self._grids[bot.tier] = SpatialHash(self.cell_size)
+        grid.insert(bot, bot.x, bot.y)
+        self._positions[bot] = (bot.x, bot.y)
+
+    def forget(self, bot: 'Bot'):
+        """Stop tracking a bot that left the simulation."""
+        if self._positions.pop(bot, None) is None:
+            return
+        self._grids[bot.tier].remove(bot)
+        self.contacts = {pair for pair in self.contacts if bot not in pair}
+        self._penalized.pop(bot, None)
+
+    def update(self, moved: List['Bot']):
+        """Check the bots that moved during the last tick for collisions."""
+        if not moved:
+            return
+        pairs: Dict[Tuple['Bot', 'Bot'], None] = {}
+        # Contact distance plus how far a partner may have travelled this tick
+        reach = 2.0 * self.max_radius + self.max_velocity * self.executor.last_step
+        positions = self._positions
+        starts: Dict['Bot', Tuple[float, float]] = {}
+        for bot in moved:
+            start = positions.get(bot)
+            if start is None:
+                self._track(bot)
+                start = positions[bot]
+            starts[bot] = start
+            x, y = bot.x, bot.y
+            positions[bot] = (x, y)
+            grid = self._grids[bot.tier]
+            grid.move(bot, x, y)
+            for other in grid.query_box(min(start[0], x) - reach, min(start[1], y) - reach,
+                                        max(start[0], x) + reach, max(start[1], y) + reach):
+                if other is not bot:
+                    pair = (bot, other) if bot.id < other.id else (other, bot)
+                    pairs[pair] = None
+        if not pairs:
+            return
+
+        # Narrow phase over all candidate pairs at once
+        candidates = list(pairs)
+        rows = []
+        for a, b in candidates:
+            end_a = positions[a]
+            end_b = positions[b]
+            start_a = starts.get(a, end_a)
+            start_b = starts.get(b, end_b)
+            rows.append((start_a[0], start_a[1], end_a[0], end_a[1],
+                         start_b[0], start_b[1], end_b[0], end_b[1], a.radius, b.radius))
+        data = np.array(rows)
+        ax0, ay0, ax1, ay1, bx0, by0, bx1, by1, ra, rb = data.T
+        touched = GeometryHelper.swept_circles_intersect(ax0, ay0, ax1, ay1,
+                                                         bx0, by0, bx1, by1, ra + rb)
+        overlapping = GeometryHelper.circles_overlap(ax1, ay1, ra, bx1, by1, rb)
+
+        for k in np.flatnonzero(touched | overlapping).tolist():
+            pair = candidates[k]
+            if pair not in self.contacts:
+                self.contacts.add(pair)
+                self._collide(*pair)
+        for k in np.flatnonzero(~overlapping).tolist():
+            self.contacts.discard(candidates[k])
+
+    def _collide(self, a: 'Bot', b: 'Bot'):
+        """Report a new contact and penalize both bots."""
+        self.collisions += 1
+        executor = self.executor
+        publish = executor.event_manager.has_subscribers(EventType.COLLISION)
+        for bot, other in ((a, b), (b, a)):
+            if publish:
+                executor.event_manager.publish(SimulationEvent(
+                    EventType.COLLISION, executor.current_time,
+                    {'bot_id': bot.id, 'other_bot_id': other.id, 'x': bot.x, 'y': bot.y}
+                ))
+            release_time = executor.current_time + bot.collision_penalty_time
+            if release_time > self._penalized.get(bot, -1.0):
+                self._penalized[bot] = release_time
+                bot.current_velocity = 0.0
+                bot.is_waiting = True
+                executor.schedule_at(release_time, EventType.COLLISION, self._release, bot, release_time)
+
+    def _release(self, bot: 'Bot', release_time: float):
+        """End a penalty unless a later collision extended it."""
+        if self._penalized.get(bot) == release_time:
+            del self._penalized[bot]
+            bot.is_waiting = False
+
+    def __repr__(self):
+        return (f"CollisionDetector(cell_size={self.cell_size:.2f}, collisions={self.collisions}, "
+                f"contacts={len(self.contacts)})")
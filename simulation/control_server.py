@@ -0,0 +1,214 @@
+"""Asyncio control API for steering a running simulation."""
+
+from typing import Any, Dict, Optional, TYPE_CHECKING
+import asyncio
+import json
+import logging
+import time
+
+if TYPE_CHECKING:
+    from .executor import SimulationExecutor
+    from statistics.tracker import StatisticsTracker
+
+
+class ControlServer:
+    """Serves a line-delimited JSON control protocol next to a running simulation.
+
+    The simulation is driven from the same event loop in short time slices,
+    and client requests are answered between slices, so queries never block
+    or race with a tick. Listens on a loopback TCP port or on a Unix socket.
+
+    Each request is one JSON object per line, e.g. ``{"cmd": "status"}``.
+    Commands:
+
+    - ``run``: run (at the current speed) until the end
+    - ``pause``: pause after the current slice
+    - ``step``: take ``count`` steps (default 1), then pause
+    - ``run_until``: run until simulation ``time``, then pause
+    - ``speed``: set ``value`` simulated seconds per wall-clock second
+      (``null`` runs as fast as possible)
+    - ``status``: clock, state and speed
+    - ``summary``: statistics summary
+    - ``stop``: end the simulation and shut the server down
+
+    Every response is one JSON line with ``"ok": true`` or an ``"error"``.
+    """
+
+    RUNNING = 'running'
+    PAUSED = 'paused'
+    FINISHED = 'finished'
+
+    def __init__(self, executor: 'SimulationExecutor',
+                 stats_tracker: Optional['StatisticsTracker'] = None,
+                 host: str = '127.0.0.1', port: int = 0, unix_path: Optional[str] = None,
+                 start_paused: bool = False, exit_on_finish: bool = True,
+                 slice_seconds: float = 0.02):
+        self.executor = executor
+        self.stats_tracker = stats_tracker
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.exit_on_finish = exit_on_finish
+        self.slice_seconds = slice_seconds
+
+        self.state = self.PAUSED if start_paused else self.RUNNING
+        self.speed: Optional[float] = None
+        self.target_time: Optional[float] = None
+        self.pending_steps = 0
+        self.address = None
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopped = False
+        self._anchor = (0.0, 0.0)  # (wall time, sim time) for speed control
+
+    async def serve(self):
+        """Run the simulation and serve clients until it finishes or is stopped.
+
+        With ``exit_on_finish`` off, clients can keep querying a finished run
+        until they send ``stop``.
+        """
+        self._wake = asyncio.Event()
+        if self.unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.unix_path)
+            self.address = self.unix_path
+        else:
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        logging.info(f"Control server listening on {self.address}")
+
+        try:
+            await self._drive()
+            while not self.exit_on_finish and not self._stopped:
+                self._wake.clear()
+                await self._wake.wait()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _drive(self):
+        """Advance the simulation slice by slice, yielding to clients in between."""
+        executor = self.executor
+        executor.begin()
+        self._reset_anchor()
+        while not self._stopped and not executor.is_finished():
+            if self.state == self.PAUSED:
+                self._wake.clear()
+                await self._wake.wait()
+                self._reset_anchor()
+                continue
+
+            horizon = self.target_time
+            if self.speed is not None:
+                wall, sim = self._anchor
+                paced = sim + self.speed * (time.monotonic() - wall)
+                horizon = paced if horizon is None else min(horizon, paced)
+                if executor.current_time >= horizon:
+                    await asyncio.sleep(min(self.slice_seconds, executor.time_step / self.speed))
+                    continue
+
+            deadline = time.monotonic() + self.slice_seconds
+            while (self.state == self.RUNNING and time.monotonic() < deadline
+                   and not executor.is_finished()):
+                max_steps = self.pending_steps or 16
+                steps = executor.advance(until=horizon, max_steps=max_steps)
+                if self.pending_steps:
+                    self.pending_steps -= steps
+                    if self.pending_steps <= 0:
+                        self.pending_steps = 0
+                        self.state = self.PAUSED
+                        break
+                if self.target_time is not None and executor.current_time >= self.target_time:
+                    self.target_time = None
+                    self.state = self.PAUSED
+                    break
+                if steps == 0:
+                    break
+            await asyncio.sleep(0)
+
+        executor.finish()
+        self.state = self.FINISHED
+
+    def _reset_anchor(self):
+        self._anchor = (time.monotonic(), self.executor.current_time)
+
+    def _resume(self):
+        self.state = self.RUNNING
+        self._reset_anchor()
+        self._wake.set()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while not reader.at_eof():
+                line = await reader.readline()
+                if not line.strip():
+                    continue
+                try:
+                    response = self.handle_command(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {'ok': False, 'error': str(e)}
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle_command(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one command and build its response."""
+        cmd = request.get('cmd')
+        if cmd == 'run':
+            self.target_time = None
+            self.pending_steps = 0
+            self._resume()
+        elif cmd == 'pause':
+            self.state = self.PAUSED
+        elif cmd == 'step':
+            count = int(request.get('count', 1))
+            if count < 1:
+                raise ValueError("count must be at least 1")
+            self.pending_steps = count
+            self._resume()
+        elif cmd == 'run_until':
+            self.target_time = float(request['time'])
+            self.pending_steps = 0
+            self._resume()
+        elif cmd == 'speed':
+            value = request.get('value')
+            if value is not None and float(value) <= 0:
+                raise ValueError("speed must be positive")
+            self.speed = float(value) if value is not None else None
+            self._reset_anchor()
+        elif cmd == 'status':
+            pass
+        elif cmd == 'summary':
+            return {'ok': True, 'status': self.status(), 'summary': self.summary()}
+        elif cmd == 'stop':
+            self._stopped = True
+            self.executor.stop()
+            self._wake.set()
+        else:
+            raise ValueError(f"Unknown command: {cmd!r}")
+        return {'ok': True, 'status': self.status()}
+
+    def status(self) -> Dict[str, Any]:
+        """Current clock, state and speed."""
+        state = self.state
+        if state != self.FINISHED and self.executor.is_finished():
+            state = self.FINISHED
+        return {
+            'time': self.executor.current_time,
+            'max_time': self.executor.max_time,
+            'state': state,
+            'speed': self.speed,
+            'target_time': self.target_time,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Statistics summary of the run so far."""
+        if self.stats_tracker is not None:
+            return self.stats_tracker.get_summary()
+        return self.executor.instance.get_statistics()
+
+    def __repr__(self):
+        return f"ControlServer(address={self.address}, state={self.state})"
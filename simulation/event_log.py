@@ -0,0 +1,250 @@
+"""Compact binary event logs and replay."""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from pathlib import Path
+import gzip
+import math
+import struct
+
+from .events import EventManager, EventType, SimulationEvent, Subscription
+
+if TYPE_CHECKING:
+    from core.instance import Instance
+
+MAGIC = b'RSEL'
+VERSION = 1
+
+# time, type code, presence mask, three integer slots, two float slots
+RECORD = struct.Struct('<dHHiiiff')
+
+# Data keys stored in the integer and float slots of each event type.
+# Keys not listed here are not recorded.
+SCHEMA: Dict[EventType, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    EventType.BOT_MOVED: (('bot_id', 'waypoint_id'), ('x', 'y')),
+    EventType.BOT_PICKUP: (('bot_id', 'pod_id', 'waypoint_id'), ()),
+    EventType.BOT_SETDOWN: (('bot_id', 'pod_id', 'waypoint_id'), ()),
+    EventType.ORDER_CREATED: (('order_id',), ()),
+    EventType.ORDER_COMPLETED: (('order_id', 'station_id'), ()),
+    EventType.ITEM_PICKED: (('station_id', 'order_id', 'count'), ()),
+    EventType.TASK_ASSIGNED: (('bot_id', 'pod_id', 'station_id'), ()),
+    EventType.COLLISION: (('bot_id', 'other_bot_id'), ('x', 'y')),
+    EventType.STATISTICS_SNAPSHOT: (('orders_completed', 'busy_bots', 'bots'), ()),
+}
+
+
+class EventLogWriter:
+    """Appends published events to a binary log file.
+
+    The file starts with a header that interns every event type as a small
+    integer code, followed by fixed-width 32-byte records (see ``RECORD``).
+    Entity ids go into integer slots and positions into float32 slots as laid
+    out by ``SCHEMA``; a bit mask marks which slots are present. Paths ending
+    in ``.gz`` are gzip-compressed.
+    """
+
+    def __init__(self, filepath: str, compress: Optional[bool] = None, buffer_records: int = 4096):
+        self.filepath = filepath
+        if compress is None:
+            compress = str(filepath).endswith('.gz')
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(filepath, 'wb') if compress else open(filepath, 'wb')
+        self._buffer = bytearray()
+        self._buffer_limit = buffer_records * RECORD.size
+        self._codes = {event_type: code for code, event_type in enumerate(EventType)}
+        self._subscriptions: List[Subscription] = []
+        self._event_manager: Optional[EventManager] = None
+        self.records = 0
+        self._write_header()
+
+    def _write_header(self):
+        header = bytearray(MAGIC)
+        header += struct.pack('<BH', VERSION, len(self._codes))
+        for event_type, code in self._codes.items():
+            name = event_type.value.encode()
+            header += struct.pack('<HB', code, len(name)) + name
+        self._file.write(header)
+
+    def attach(self, event_manager: EventManager, event_types: Optional[Iterable[EventType]] = None):
+        """Record the given event types (default: all) published on the manager."""
+        for event_type in (event_types or EventType):
+            self._subscriptions.append(event_manager.subscribe(event_type, self.write))
+        self._event_manager = event_manager
+
+    def write(self, event: SimulationEvent):
+        """Append one event."""
+        int_keys, float_keys = SCHEMA.get(event.event_type, ((), ()))
+        data = event.data
+        mask = 0
+        ints = [-1, -1, -1]
+        floats = [math.nan, math.nan]
+        for slot, key in enumerate(int_keys):
+            if key in data:
+                ints[slot] = data[key]
+                mask |= 1 << slot
+        for slot, key in enumerate(float_keys):
+            if key in data:
+                floats[slot] = data[key]
+                mask |= 1 << (3 + slot)
+        self._buffer += RECORD.pack(event.time, self._codes[event.event_type], mask,
+                                    ints[0], ints[1], ints[2], floats[0], floats[1])
+        self.records += 1
+        if len(self._buffer) >= self._buffer_limit:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to the file."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+
+    def close(self):
+        """Detach from the event manager and close the file."""
+        for subscription in self._subscriptions:
+            self._event_manager.unsubscribe(subscription)
+        self._subscriptions = []
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"EventLogWriter(file={self.filepath}, records={self.records})"
+
+
+class EventLogReader:
+    """Iterates the events stored in a binary event log."""
+
+    def __init__(self, filepath: str, chunk_records: int = 4096):
+        self.filepath = filepath
+        self.chunk_records = chunk_records
+
+    def _open(self):
+        with open(self.filepath, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+        return gzip.open(self.filepath, 'rb') if compressed else open(self.filepath, 'rb')
+
+    @staticmethod
+    def _read_header(f) -> Dict[int, EventType]:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not an event log file")
+        version, count = struct.unpack('<BH', f.read(3))
+        if version != VERSION:
+            raise ValueError(f"Unsupported event log version: {version}")
+        types = {}
+        for _ in range(count):
+            code, length = struct.unpack('<HB', f.read(3))
+            types[code] = EventType(f.read(length).decode())
+        return types
+
+    def __iter__(self) -> Iterator[SimulationEvent]:
+        with self._open() as f:
+            types = self._read_header(f)
+            chunk_size = self.chunk_records * RECORD.size
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                usable = len(chunk) - len(chunk) % RECORD.size  # ignore a torn final record
+                for time, code, mask, a, b, c, x, y in RECORD.iter_unpack(chunk[:usable]):
+                    event_type = types[code]
+                    int_keys, float_keys = SCHEMA.get(event_type, ((), ()))
+                    ints = (a, b, c)
+                    floats = (x, y)
+                    data = {}
+                    for slot, key in enumerate(int_keys):
+                        if mask & (1 << slot):
+                            data[key] = ints[slot]
+                    for slot, key in enumerate(float_keys):
+                        if mask & (1 << (3 + slot)):
+                            data[key] = floats[slot]
+                    yield SimulationEvent(event_type, time, data)
+
+    def __repr__(self):
+        return f"EventLogReader(file={self.filepath})"
+
+
+class EventLogReplayer:
+    """Replays a logged run without re-running any controller.
+
+    Events are re-published on ``event_manager`` in their original order, so
+    anything that subscribes to events (e.g. ``StatisticsTracker.attach``)
+    can be rebuilt from a log. If an instance is given, logged bot movement
+    and pod transfers are applied to it as well, which lets the visualizer
+    play back a run.
+    """
+
+    def __init__(self, filepath: str, event_manager: Optional[EventManager] = None,
+                 instance: Optional['Instance'] = None):
+        self.event_manager = event_manager or EventManager()
+        self.instance = instance
+        self.current_time = 0.0
+        self.finished = False
+        self._events = iter(EventLogReader(filepath))
+        self._pending: Optional[SimulationEvent] = None
+        if instance is not None:
+            self._bots = {bot.id: bot for bot in instance.bots}
+            self._pods = {pod.id: pod for pod in instance.pods}
+            self._waypoints = {waypoint.id: waypoint for waypoint in instance.waypoints}
+
+    def advance_to(self, time: float) -> int:
+        """Replay all events up to and including the given time; returns their count."""
+        count = 0
+        while True:
+            event = self._pending
+            if event is None:
+                event = next(self._events, None)
+                if event is None:
+                    self.finished = True
+                    break
+            if event.time > time:
+                self._pending = event
+                break
+            self._pending = None
+            self._apply(event)
+            self.event_manager.publish(event)
+            count += 1
+        if not self.finished:
+            self.current_time = max(self.current_time, time)
+        return count
+
+    def run(self) -> int:
+        """Replay the whole log; returns the number of events."""
+        return self.advance_to(math.inf)
+
+    def _apply(self, event: SimulationEvent):
+        self.current_time = event.time
+        if self.instance is None:
+            return
+        data = event.data
+        bot = self._bots.get(data.get('bot_id'))
+        if bot is None:
+            return
+        if event.event_type == EventType.BOT_MOVED:
+            bot.x = data.get('x', bot.x)
+            bot.y = data.get('y', bot.y)
+            waypoint = self._waypoints.get(data.get('waypoint_id'))
+            if waypoint is not None:
+                bot.current_waypoint = waypoint
+        elif event.event_type == EventType.BOT_PICKUP:
+            pod = self._pods.get(data.get('pod_id'))
+            if pod is not None and not bot.has_pod():
+                if pod.waypoint is not None:
+                    pod.waypoint.pod = None
+                    pod.waypoint = None
+                bot.pickup_pod(pod)
+        elif event.event_type == EventType.BOT_SETDOWN:
+            pod = bot.current_pod
+            waypoint = self._waypoints.get(data.get('waypoint_id'))
+            if pod is not None:
+                bot.setdown_pod()
+                if waypoint is not None:
+                    pod.x, pod.y = waypoint.x, waypoint.y
+                    waypoint.pod = pod
+                    pod.waypoint = waypoint
+
+    def __repr__(self):
+        return f"EventLogReplayer(t={self.current_time:.2f}, finished={self.finished})"
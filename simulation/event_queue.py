@@ -0,0 +1,100 @@
+"""Future event list for discrete event execution."""
+
+from typing import Any, Callable, List, Optional, Tuple
+import heapq
+
+from .events import EventType
+
+
+class ScheduledEvent:
+    """An event scheduled to fire at a specific simulation time."""
+
+    def __init__(self, time: float, sequence: int, event_type: EventType,
+                 handler: Callable, args: Tuple[Any, ...] = ()):
+        self.time = time
+        self.sequence = sequence
+        self.event_type = event_type
+        self.handler = handler
+        self.args = args
+        self.cancelled = False
+        self._queue: Optional['EventQueue'] = None
+
+    def cancel(self):
+        """Cancel the event; it will be skipped when it reaches the queue head."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._queue is not None:
+            self._queue._cancelled += 1
+
+    def fire(self):
+        """Invoke the event handler."""
+        self.handler(*self.args)
+
+    def __repr__(self):
+        status = " cancelled" if self.cancelled else ""
+        return f"ScheduledEvent({self.event_type.value}, t={self.time:.2f}{status})"
+
+
+class EventQueue:
+    """Binary-heap priority queue of scheduled events ordered by time.
+
+    Events with equal times fire in the order they were scheduled. Cancelled
+    events are removed lazily when they surface at the head of the heap.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, ScheduledEvent]] = []
+        self._sequence = 0
+        self._cancelled = 0
+
+    def push(self, time: float, event_type: EventType, handler: Callable,
+             *args: Any) -> ScheduledEvent:
+        """Schedule handler(*args) at the given simulation time."""
+        event = ScheduledEvent(time, self._sequence, event_type, handler, args)
+        event._queue = self
+        heapq.heappush(self._heap, (time, self._sequence, event))
+        self._sequence += 1
+        return event
+
+    def _discard_cancelled(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)[2]._queue = None
+            self._cancelled -= 1
+
+    def _take(self) -> ScheduledEvent:
+        event = heapq.heappop(self._heap)[2]
+        event._queue = None
+        return event
+
+    def peek_time(self) -> Optional[float]:
+        """Get the time of the next live event, or None if the queue is empty."""
+        self._discard_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self) -> Optional[ScheduledEvent]:
+        """Remove and return the next live event."""
+        self._discard_cancelled()
+        if not self._heap:
+            return None
+        return self._take()
+
+    def pop_due(self, time: float) -> Optional[ScheduledEvent]:
+        """Remove and return the next live event if it is due at or before time."""
+        next_time = self.peek_time()
+        if next_time is None or next_time > time:
+            return None
+        return self._take()
+
+    def clear(self):
+        """Remove all scheduled events."""
+        for _, _, event in self._heap:
+            event._queue = None
+        self._heap.clear()
+        self._cancelled = 0
+
+    def __len__(self):
+        return len(self._heap) - self._cancelled
+
+    def __repr__(self):
+        return f"EventQueue(events={len(self)})"
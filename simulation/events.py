@@ -1,7 +1,7 @@
 """Event system for simulation."""
 
 from enum import Enum
-from typing import Any, Dict, Callable, List
+from typing import Any, Dict, Callable, List, Optional, Union
 
 
 class EventType(Enum):
@@ -12,15 +12,20 @@ class EventType(Enum):
     ORDER_CREATED = "order_created"
     ORDER_COMPLETED = "order_completed"
     ITEM_PICKED = "item_picked"
+    TASK_ASSIGNED = "task_assigned"
     COLLISION = "collision"
     SIMULATION_START = "simulation_start"
     SIMULATION_END = "simulation_end"
     TIME_STEP = "time_step"
+    STATISTICS_SNAPSHOT = "statistics_snapshot"
+    ROUTE_RETRY = "route_retry"
 
 
 class SimulationEvent:
     """Represents a simulation event."""
 
+    __slots__ = ('event_type', 'time', 'data')
+
     def __init__(self, event_type: EventType, time: float, data: Dict[str, Any] = None):
         self.event_type = event_type
         self.time = time
@@ -30,23 +35,141 @@ class SimulationEvent:
         return f"SimulationEvent({self.event_type.value}, t={self.time:.2f})"
 
 
+class Subscription:
+    """A callback registered for one event type, with optional delivery schedule.
+
+    - ``every_seconds``: deliver at most once per interval of simulation time,
+      the first time an event at or after each boundary arrives (boundaries
+      start at ``start``, default one interval in).
+    - ``every_nth``: deliver every nth event only.
+    - ``batch_size``: collect events and call the callback with a list once
+      ``batch_size`` events are pending, on ``EventManager.flush`` and at the
+      end of a simulation run.
+    """
+
+    # Slack for clocks accumulated from floating point steps
+    TIME_EPSILON = 1e-9
+
+    def __init__(self, event_type: EventType, callback: Callable,
+                 every_seconds: Optional[float] = None, every_nth: Optional[int] = None,
+                 batch_size: Optional[int] = None, start: Optional[float] = None):
+        if every_seconds is not None and every_seconds <= 0:
+            raise ValueError("every_seconds must be positive")
+        if every_nth is not None and every_nth < 1:
+            raise ValueError("every_nth must be at least 1")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.event_type = event_type
+        self.callback = callback
+        self.every_seconds = every_seconds
+        self.every_nth = every_nth
+        self.batch_size = batch_size
+        self.next_time = start if start is not None else (every_seconds or 0.0)
+        self.count = 0
+        self.batch: List[SimulationEvent] = []
+
+    def deliver(self, event: SimulationEvent):
+        """Pass an event on if the schedule admits it."""
+        if self.every_seconds is not None:
+            if event.time + self.TIME_EPSILON < self.next_time:
+                return
+            # Advance to the first boundary after this event
+            skipped = int((event.time + self.TIME_EPSILON - self.next_time) // self.every_seconds)
+            self.next_time += (skipped + 1) * self.every_seconds
+        if self.every_nth is not None:
+            self.count += 1
+            if self.count % self.every_nth:
+                return
+
+        if self.batch_size is None:
+            self.callback(event)
+        else:
+            self.batch.append(event)
+            if len(self.batch) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Deliver pending batched events."""
+        if self.batch:
+            batch, self.batch = self.batch, []
+            self.callback(batch)
+
+    def __repr__(self):
+        return f"Subscription({self.event_type.value}, every_seconds={self.every_seconds}, " \
+               f"every_nth={self.every_nth}, batch_size={self.batch_size})"
+
+
 class EventManager:
-    """Manages event subscriptions and dispatching."""
+    """Manages event subscriptions and dispatching.
+
+    Publishers on hot paths should check ``has_subscribers`` (or use ``emit``)
+    so no event object is built for event types nobody listens to.
+    """
 
     def __init__(self):
-        self.subscribers: Dict[EventType, List[Callable]] = {}
+        self.subscribers: Dict[EventType, List[Subscription]] = {}
+        self._batched: List[Subscription] = []
 
-    def subscribe(self, event_type: EventType, callback: Callable):
-        """Subscribe to an event type."""
+    @staticmethod
+    def _event_type(event_type: Union[EventType, str]) -> EventType:
+        """Accept event types given by their string value as well."""
+        if isinstance(event_type, EventType):
+            return event_type
+        try:
+            return EventType(event_type)
+        except ValueError:
+            raise ValueError(f"Unknown event type: {event_type!r}") from None
+
+    def subscribe(self, event_type: Union[EventType, str], callback: Callable,
+                  every_seconds: Optional[float] = None, every_nth: Optional[int] = None,
+                  batch_size: Optional[int] = None, start: Optional[float] = None) -> Subscription:
+        """Subscribe to an event type, optionally sampled or batched (see Subscription)."""
+        event_type = self._event_type(event_type)
+        subscription = Subscription(event_type, callback, every_seconds, every_nth,
+                                    batch_size, start)
         if event_type not in self.subscribers:
             self.subscribers[event_type] = []
-        self.subscribers[event_type].append(callback)
+        self.subscribers[event_type].append(subscription)
+        if batch_size is not None:
+            self._batched.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription, delivering its pending batch first."""
+        subscription.flush()
+        subscriptions = self.subscribers.get(subscription.event_type, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+            if not subscriptions:
+                del self.subscribers[subscription.event_type]
+        if subscription in self._batched:
+            self._batched.remove(subscription)
+
+    def has_subscribers(self, event_type: EventType) -> bool:
+        """Check whether anybody listens to an event type."""
+        return event_type in self.subscribers
+
+    def emit(self, event_type: EventType, time: float, data: Dict[str, Any] = None):
+        """Build and publish an event, unless nobody listens to its type."""
+        if event_type in self.subscribers:
+            self.publish(SimulationEvent(event_type, time, data))
 
     def publish(self, event: SimulationEvent):
         """Publish an event to all subscribers."""
-        if event.event_type in self.subscribers:
-            for callback in self.subscribers[event.event_type]:
-                callback(event)
+        subscriptions = self.subscribers.get(event.event_type)
+        if subscriptions:
+            for subscription in subscriptions:
+                subscription.deliver(event)
+
+    def flush(self):
+        """Deliver all pending batched events."""
+        for subscription in self._batched:
+            subscription.flush()
+
+    def __getstate__(self):
+        # Callbacks are often lambdas or closures; subscriptions are not
+        # carried across checkpoints and have to be re-established.
+        return {'subscribers': {}, '_batched': []}
 
     def __repr__(self):
         total_subscribers = sum(len(subs) for subs in self.subscribers.values())
@@ -1,101 +1,487 @@
 """Main simulation executor."""
 
-from typing import TYPE_CHECKING
+from typing import Any, Callable, Dict, Optional, Union, TYPE_CHECKING
 import logging
 import time
 
 if TYPE_CHECKING:
     from core.instance import Instance
+    from core.pod import Pod
+    from core.waypoint import Waypoint
+    from core.station import OutputStation
+    from core.order import Order
 
+from core.bot import Bot
+from core.order import OrderList
 from .events import EventManager, EventType, SimulationEvent
+from .event_queue import EventQueue, ScheduledEvent
+from .active_set import ActiveBotSet
+from .adaptive_step import AdaptiveStepController
+from .profiler import PhaseProfiler
+from .order_stream import PoissonOrderStream
+from .collisions import CollisionDetector
 from control.task_manager import TaskManager
 from control.pod_selector import PodSelector
 from control.path_planner import PathPlanner
 
 
 class SimulationExecutor:
-    """Executes the discrete event simulation."""
+    """Executes the discrete event simulation.
+
+    Two execution modes are supported:
+
+    - ``fixed_step`` (default): the clock advances by ``time_step`` and every
+      bot is updated on each tick. Scheduled events fire on the first tick at
+      or after their due time.
+    - ``discrete_event``: the clock jumps from one scheduled event to the next.
+      Bot movement is modelled as a chain of waypoint arrival events, so idle
+      periods cost nothing.
+    """
+
+    FIXED_STEP = 'fixed_step'
+    DISCRETE_EVENT = 'discrete_event'
 
     def __init__(self, instance: 'Instance'):
         self.instance = instance
         self.event_manager = EventManager()
-        
+        self.event_queue = EventQueue()
+
         # Controllers
-        pathfinding_method = instance.controller_config.get('pathfinding', {}).get('method', 'WHCAvStar')
+        pathfinding_config = instance.controller_config.get('pathfinding', {})
+        pathfinding_method = pathfinding_config.get('method', 'WHCAvStar')
         task_method = instance.controller_config.get('task_assignment', {}).get('method', 'nearest')
         pod_method = instance.controller_config.get('pod_selection', {}).get('method', 'nearest')
-        
-        self.task_manager = TaskManager(instance, task_method)
+
+        # Moving/waiting/idle partition of the fleet, kept up to date on transitions
+        self.active_bots = ActiveBotSet(instance)
+
+        self.task_manager = TaskManager(instance, task_method, self.active_bots)
         self.pod_selector = PodSelector(instance, pod_method)
-        self.path_planner = PathPlanner(instance, pathfinding_method)
-        
+        self.path_planner = PathPlanner(instance, pathfinding_method, pathfinding_config.get('params'))
+        # Event-driven fulfillment: orders -> stations -> pod trips
+        # (imported here: control.dispatcher itself imports the simulation package)
+        from control.dispatcher import FulfillmentDispatcher
+        self.dispatcher = FulfillmentDispatcher(self)
+
         # Simulation state
         self.is_running = False
         self.current_time = 0.0
         self.time_step = instance.setting_config.get('time_step', 0.1)
         self.max_time = instance.setting_config.get('simulation_duration', 3600.0)
-        
-        logging.info(f"SimulationExecutor initialized: {pathfinding_method}, timestep={self.time_step}")
+        self._wall_start = time.time()
+        self._step_count = 0
+        self._event_count = 0
+        self.mode = instance.setting_config.get('execution_mode', self.FIXED_STEP)
+        if self.mode not in (self.FIXED_STEP, self.DISCRETE_EVENT):
+            raise ValueError(f"Unknown execution mode: {self.mode}")
+
+        if instance.order_list is None:
+            instance.order_list = OrderList()
+
+        # Optional vectorized kinematics for fixed-step execution
+        self.fleet = None
+        self.kinematics_backend = instance.setting_config.get('kinematics_backend', 'python')
+        if self.kinematics_backend == 'numpy' and self.mode == self.FIXED_STEP:
+            from core.fleet import FleetKinematics
+            self.fleet = FleetKinematics(instance.bots)
+            instance.add_bot_listener(self.fleet.refresh)
+        elif self.kinematics_backend not in ('python', 'numpy'):
+            raise ValueError(f"Unknown kinematics backend: {self.kinematics_backend}")
+
+        # Optional adaptive step length for fixed-step execution
+        self.step_controller = None
+        adaptive = instance.setting_config.get('adaptive_step', {})
+        if adaptive.get('enabled', False) and self.mode == self.FIXED_STEP:
+            self.step_controller = AdaptiveStepController(
+                self, self.time_step,
+                max_step=adaptive.get('max_step', 1.0),
+                tolerance=adaptive.get('tolerance', 0.01),
+                interaction_range=adaptive.get('interaction_range', 2.0)
+            )
+        self.last_step = self.time_step
+
+        # Optional collision detection (fixed-step only: discrete event moves are instantaneous)
+        self.collision_detector: Optional[CollisionDetector] = None
+        collisions = instance.setting_config.get('collisions', {})
+        if collisions.get('enabled', False) and self.mode == self.FIXED_STEP:
+            self.collision_detector = CollisionDetector(self, collisions.get('cell_size'))
+
+        # Customer orders from the order_generation settings, drawn lazily
+        self.order_stream: Optional[PoissonOrderStream] = None
+        order_config = instance.setting_config.get('order_generation', {})
+        if order_config.get('enabled', False):
+            self.order_stream = PoissonOrderStream.from_settings(instance, order_config,
+                                                                 self.current_time)
+        self._next_order: Optional[ScheduledEvent] = None
+
+        # Optional per-phase profiling (see enable_profiling)
+        self.profiler: Optional[PhaseProfiler] = None
+
+        # Pending waypoint arrivals (discrete event mode only)
+        self._arrivals: Dict['Bot', ScheduledEvent] = {}
+        instance.add_bot_listener(self._on_bot_changed)
+        instance.add_removal_listener(self._on_removed)
+
+        logging.info(f"SimulationExecutor initialized: {pathfinding_method}, "
+                     f"mode={self.mode}, timestep={self.time_step}")
 
     def execute(self):
         """Execute the simulation."""
+        self.begin()
+        self.advance()
+        self.finish()
+
+    def begin(self):
+        """Start a run; follow with advance() calls and finish()."""
         logging.info("Starting simulation...")
         self.is_running = True
-        
+        self._wall_start = time.time()
+        self._step_count = 0
+        self._event_count = 0
+
         # Publish start event
-        self.event_manager.publish(SimulationEvent(
-            EventType.SIMULATION_START,
-            self.current_time
-        ))
+        self.event_manager.emit(EventType.SIMULATION_START, self.current_time)
+
+        # Only the next order arrival is ever scheduled (a resumed run already has one)
+        if self.order_stream is not None and self._next_order is None:
+            self._schedule_next_order()
+
+        if self.mode == self.DISCRETE_EVENT:
+            # Bots that already hold a path start moving right away
+            for bot in self.instance.bots:
+                if bot.can_move() and bot not in self._arrivals:
+                    self._schedule_arrival(bot)
+
+    def advance(self, until: Optional[float] = None, max_steps: Optional[int] = None) -> int:
+        """Run until the given time (default: the end of the simulation).
+
+        In discrete event mode a step is one event instant. Returns the number
+        of steps taken; stops early after ``max_steps`` or when stop() is called.
+        """
+        horizon = self.max_time if until is None else min(until, self.max_time)
+        if self.mode == self.DISCRETE_EVENT:
+            return self._advance_discrete_event(horizon, max_steps)
+        return self._advance_fixed_step(horizon, max_steps)
 
-        step_count = 0
-        start_time = time.time()
+    def finish(self):
+        """End a run started with begin()."""
+        # Deliver batched events still pending, then publish end event
+        self.event_manager.flush()
+        self.event_manager.emit(EventType.SIMULATION_END, self.current_time)
 
-        while self.is_running and self.current_time < self.max_time:
+        elapsed = time.time() - self._wall_start
+        step_count = self._event_count if self.mode == self.DISCRETE_EVENT else self._step_count
+        logging.info(f"Simulation completed: {step_count} steps in {elapsed:.2f}s")
+        logging.info(f"Simulation time: {self.current_time:.2f}s")
+
+    def is_finished(self) -> bool:
+        """Check whether the simulation reached its end time or was stopped."""
+        return not self.is_running or self.current_time >= self.max_time
+
+    def _advance_fixed_step(self, horizon: float, max_steps: Optional[int]) -> int:
+        """Run the fixed time-step loop; returns the number of steps."""
+        steps = 0
+        while self.is_running and self.current_time < horizon:
+            if max_steps is not None and steps >= max_steps:
+                break
             self.step()
-            step_count += 1
-            
+            steps += 1
+            self._step_count += 1
+
             # Log progress every 1000 steps
-            if step_count % 1000 == 0:
-                elapsed = time.time() - start_time
-                logging.info(f"Step {step_count}, sim_time={self.current_time:.1f}s, "
+            if self._step_count % 1000 == 0:
+                elapsed = time.time() - self._wall_start
+                logging.info(f"Step {self._step_count}, sim_time={self.current_time:.1f}s, "
                            f"real_time={elapsed:.1f}s")
+        return steps
 
-        # Publish end event
-        self.event_manager.publish(SimulationEvent(
-            EventType.SIMULATION_END,
-            self.current_time
-        ))
+    def _advance_discrete_event(self, horizon: float, max_steps: Optional[int]) -> int:
+        """Run the event loop, jumping the clock between events; returns the number of instants."""
+        steps = 0
+        while self.is_running:
+            if max_steps is not None and steps >= max_steps:
+                return steps
+            next_time = self.event_queue.peek_time()
+            if next_time is None or next_time > horizon:
+                break
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_tick(next_time)
+            self._advance_clock(next_time)
+            if profiler is not None:
+                profiler.mark('path_planning')
 
-        elapsed = time.time() - start_time
-        logging.info(f"Simulation completed: {step_count} steps in {elapsed:.2f}s")
-        logging.info(f"Simulation time: {self.current_time:.2f}s")
+            # Fire every event due at this instant, then report the new state
+            event = self.event_queue.pop_due(self.current_time)
+            while event is not None:
+                event.fire()
+                self._event_count += 1
+                # Log progress every 1000 events
+                if self._event_count % 1000 == 0:
+                    elapsed = time.time() - self._wall_start
+                    logging.info(f"Event {self._event_count}, sim_time={self.current_time:.1f}s, "
+                               f"real_time={elapsed:.1f}s")
+                event = self.event_queue.pop_due(self.current_time)
+            if profiler is not None:
+                profiler.mark('decisions')
+            self._publish_time_step()
+            if profiler is not None:
+                profiler.mark('statistics')
+            steps += 1
+
+        # Nothing left to do before the horizon: jump straight to it
+        if self.is_running and self.current_time < horizon:
+            self._advance_clock(horizon)
+            self._publish_time_step()
+            steps += 1
+        return steps
+
+    def _advance_clock(self, new_time: float):
+        """Move the clock forward to the given time."""
+        if new_time <= self.current_time:
+            return
+        delta_time = new_time - self.current_time
+        self.current_time = new_time
+        self.instance.current_time = new_time
+        self.path_planner.update(delta_time)
+
+    def _publish_time_step(self):
+        """Publish a time step event for the current time."""
+        self.event_manager.emit(EventType.TIME_STEP, self.current_time)
+
+    def enable_profiling(self, trace: bool = True) -> PhaseProfiler:
+        """Time every phase of the simulation loop from now on."""
+        self.profiler = PhaseProfiler(trace=trace)
+        return self.profiler
 
     def step(self):
         """Execute one simulation time step."""
-        # Update all bots
-        for bot in self.instance.bots:
-            bot.update(self.time_step)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_tick(self.current_time)
 
-        # Update path planner
-        self.path_planner.update(self.time_step)
+        delta_time = self.time_step
+        if self.step_controller is not None:
+            delta_time = min(self.step_controller.next_step(),
+                             max(self.max_time - self.current_time, self.time_step))
+        self.last_step = delta_time
+
+        # Update moving bots (idle and waiting bots have nothing to do)
+        moving = list(self.active_bots.moving)
+        if self.fleet is not None:
+            self.fleet.step(delta_time)
+        else:
+            for bot in moving:
+                bot.update(delta_time)
+        if profiler is not None:
+            profiler.mark('bot_update')
+
+        # Detect collisions among the bots that just moved
+        if self.collision_detector is not None:
+            self.collision_detector.update(moving)
+            if profiler is not None:
+                profiler.mark('collisions')
 
-        # Process orders (simplified)
-        # In a full implementation, this would involve:
-        # - Generating new orders
-        # - Assigning tasks to bots
-        # - Managing pod movements
-        # - Handling item picking/storing
+        # Update path planner
+        self.path_planner.update(delta_time)
+        if profiler is not None:
+            profiler.mark('path_planning')
 
         # Advance time
-        self.current_time += self.time_step
+        self.current_time += delta_time
         self.instance.current_time = self.current_time
 
+        if self.event_manager.has_subscribers(EventType.BOT_MOVED):
+            for bot in moving:
+                waypoint = bot.current_waypoint
+                self.event_manager.publish(SimulationEvent(
+                    EventType.BOT_MOVED, self.current_time,
+                    {'bot_id': bot.id, 'waypoint_id': waypoint.id if waypoint is not None else -1,
+                     'x': bot.x, 'y': bot.y}
+                ))
+        if profiler is not None:
+            profiler.mark('event_dispatch')
+
+        # Fire scheduled events that became due during this step
+        self._process_due_events()
+        if profiler is not None:
+            profiler.mark('decisions')
+
         # Publish time step event
-        self.event_manager.publish(SimulationEvent(
-            EventType.TIME_STEP,
-            self.current_time
-        ))
+        self._publish_time_step()
+        if profiler is not None:
+            profiler.mark('statistics')
+
+    def _process_due_events(self):
+        """Fire all scheduled events due at or before the current time."""
+        event = self.event_queue.pop_due(self.current_time)
+        while event is not None:
+            event.fire()
+            event = self.event_queue.pop_due(self.current_time)
+
+    # --- Scheduling ---------------------------------------------------------
+
+    def schedule_at(self, event_time: float, event_type: EventType,
+                    handler: Callable, *args: Any) -> ScheduledEvent:
+        """Schedule handler(*args) at an absolute simulation time."""
+        return self.event_queue.push(max(event_time, self.current_time),
+                                     event_type, handler, *args)
+
+    def schedule_in(self, delay: float, event_type: EventType,
+                    handler: Callable, *args: Any) -> ScheduledEvent:
+        """Schedule handler(*args) after a delay relative to the current time."""
+        return self.event_queue.push(self.current_time + max(delay, 0.0),
+                                     event_type, handler, *args)
+
+    def schedule_pod_pickup(self, bot: 'Bot', pod: 'Pod',
+                            on_done: Optional[Callable] = None) -> ScheduledEvent:
+        """Start lifting a pod; the bot holds it after its pod transfer time."""
+        return self.schedule_in(bot.pod_transfer_time, EventType.BOT_PICKUP,
+                                self._complete_pod_pickup, bot, pod, on_done)
+
+    def schedule_pod_setdown(self, bot: 'Bot', waypoint: 'Waypoint',
+                             on_done: Optional[Callable] = None) -> ScheduledEvent:
+        """Start lowering the carried pod onto a waypoint."""
+        return self.schedule_in(bot.pod_transfer_time, EventType.BOT_SETDOWN,
+                                self._complete_pod_setdown, bot, waypoint, on_done)
+
+    def schedule_pick(self, station: 'OutputStation', order: 'Order', item_count: int = 1,
+                      on_done: Optional[Callable] = None) -> ScheduledEvent:
+        """Start picking items for an order at an output station."""
+        duration = station.item_pick_time * item_count
+        return self.schedule_in(duration, EventType.ITEM_PICKED,
+                                self._complete_pick, station, order, item_count, on_done)
+
+    def schedule_order_arrival(self, arrival_time: float, items: Dict[int, int],
+                               priority: int = 0,
+                               on_done: Optional[Callable] = None) -> ScheduledEvent:
+        """Schedule a customer order to enter the order list."""
+        return self.schedule_at(arrival_time, EventType.ORDER_CREATED,
+                                self._complete_order_arrival, items, priority, on_done)
+
+    def _schedule_next_order(self, order: Optional['Order'] = None):
+        """Schedule the next arrival of the order stream."""
+        arrival = next(self.order_stream, None)
+        if arrival is None:
+            self._next_order = None
+            return
+        arrival_time, items = arrival
+        self._next_order = self.schedule_order_arrival(arrival_time, items,
+                                                       on_done=self._schedule_next_order)
+
+    def _complete_pod_pickup(self, bot: 'Bot', pod: 'Pod', on_done: Optional[Callable]):
+        waypoint = pod.waypoint
+        if self.instance.waypoint_graph is not None:
+            self.instance.waypoint_graph.pod_pickup(pod)
+        elif waypoint is not None:
+            waypoint.pod = None
+            pod.waypoint = None
+        bot.pickup_pod(pod)
+        pod.times_moved += 1
+        if self.event_manager.has_subscribers(EventType.BOT_PICKUP):
+            self.event_manager.publish(SimulationEvent(
+                EventType.BOT_PICKUP, self.current_time,
+                {'bot_id': bot.id, 'pod_id': pod.id,
+                 'waypoint_id': waypoint.id if waypoint is not None else -1}
+            ))
+        if on_done is not None:
+            on_done(bot, pod)
+
+    def _complete_pod_setdown(self, bot: 'Bot', waypoint: 'Waypoint', on_done: Optional[Callable]):
+        pod = bot.current_pod
+        bot.setdown_pod()
+        pod.x = waypoint.x
+        pod.y = waypoint.y
+        if self.instance.waypoint_graph is not None:
+            self.instance.waypoint_graph.pod_setdown(pod, waypoint)
+        else:
+            waypoint.pod = pod
+            pod.waypoint = waypoint
+        if self.event_manager.has_subscribers(EventType.BOT_SETDOWN):
+            self.event_manager.publish(SimulationEvent(
+                EventType.BOT_SETDOWN, self.current_time,
+                {'bot_id': bot.id, 'pod_id': pod.id, 'waypoint_id': waypoint.id}
+            ))
+        if on_done is not None:
+            on_done(bot, pod)
+
+    def _complete_pick(self, station: 'OutputStation', order: 'Order', item_count: int,
+                       on_done: Optional[Callable]):
+        for _ in range(item_count):
+            station.pick_item()
+        if self.event_manager.has_subscribers(EventType.ITEM_PICKED):
+            self.event_manager.publish(SimulationEvent(
+                EventType.ITEM_PICKED, self.current_time,
+                {'station_id': station.id, 'order_id': order.id, 'count': item_count}
+            ))
+        if on_done is not None:
+            on_done(station, order)
+
+    def _complete_order_arrival(self, items: Dict[int, int], priority: int,
+                                on_done: Optional[Callable]):
+        order = self.instance.order_list.create_order(
+            items, priority=priority, creation_time=self.current_time
+        )
+        if self.event_manager.has_subscribers(EventType.ORDER_CREATED):
+            self.event_manager.publish(SimulationEvent(
+                EventType.ORDER_CREATED, self.current_time, {'order_id': order.id}
+            ))
+        self.dispatcher.order_created(order)
+        if on_done is not None:
+            on_done(order)
+
+    # --- Bot movement (discrete event mode) ---------------------------------
+
+    def _on_bot_changed(self, bot: 'Bot'):
+        """Keep the bot's pending arrival in line with its path and state."""
+        if self.mode != self.DISCRETE_EVENT:
+            return
+        pending = self._arrivals.get(bot)
+        if pending is not None:
+            if bot.can_move() and pending.args[1] is bot.path[0]:
+                return  # Still heading for the same waypoint
+            pending.cancel()
+            del self._arrivals[bot]
+        if bot.can_move():
+            self._schedule_arrival(bot)
+
+    def _on_removed(self, entity: Union['Bot', 'Pod']):
+        """Forget a bot or pod that was removed from the instance."""
+        if isinstance(entity, Bot):
+            self.active_bots.discard(entity)
+            if self.fleet is not None:
+                self.fleet.remove(entity)
+            if self.collision_detector is not None:
+                self.collision_detector.forget(entity)
+            self.path_planner.forget(entity)
+        else:
+            self.pod_selector.forget(entity)
+        # Trips of the bot, or for the pod, are given up and their items requested again
+        self.dispatcher.forget(entity)
+
+    def _schedule_arrival(self, bot: 'Bot'):
+        """Schedule the bot's arrival at the next waypoint on its path."""
+        target = bot.path[0]
+        if target is bot.current_waypoint:
+            # A wait in the route holds the bot in place
+            duration = bot.wait_time
+        else:
+            duration = bot.travel_time(bot.distance_to(target.x, target.y))
+        self._arrivals[bot] = self.schedule_in(
+            duration, EventType.BOT_MOVED,
+            self._complete_arrival, bot, target
+        )
+
+    def _complete_arrival(self, bot: 'Bot', waypoint: 'Waypoint'):
+        del self._arrivals[bot]
+        bot.arrive_at(waypoint)
+        if self.event_manager.has_subscribers(EventType.BOT_MOVED):
+            self.event_manager.publish(SimulationEvent(
+                EventType.BOT_MOVED, self.current_time,
+                {'bot_id': bot.id, 'waypoint_id': waypoint.id, 'x': bot.x, 'y': bot.y}
+            ))
+        if bot.can_move() and bot not in self._arrivals:
+            self._schedule_arrival(bot)
 
     def stop(self):
         """Stop the simulation."""
@@ -104,4 +490,4 @@ class SimulationExecutor:
 
     def __repr__(self):
         status = "running" if self.is_running else "stopped"
-        return f"SimulationExecutor(time={self.current_time:.2f}, status={status})"
+        return f"SimulationExecutor(time={self.current_time:.2f}, mode={self.mode}, status={status})"
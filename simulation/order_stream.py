@@ -0,0 +1,132 @@
+"""Lazy order arrival streams."""
+
+from typing import Any, Dict, Optional, Sequence, Tuple, TYPE_CHECKING
+import numpy as np
+
+from utils.randomizer import RandomizerSimple
+
+if TYPE_CHECKING:
+    from core.instance import Instance
+
+
+class PoissonOrderStream:
+    """Iterator over ``(arrival_time, items)`` of a (non-homogeneous) Poisson process.
+
+    Arrivals are drawn in NumPy batches of ``batch_size`` candidates, so the
+    stream holds at most one batch no matter how long the horizon is. A
+    time-varying rate ``rate * multipliers[k]`` during the k-th ``interval``
+    (repeating, e.g. 24 hourly multipliers for a daily demand curve) is
+    realized by thinning: candidates are drawn at the peak rate and each is
+    kept with probability ``rate(t) / peak``.
+
+    Each order holds a uniform number of items in
+    ``[items_min, items_max]``, each item an SKU drawn by ``sku_weights``
+    (uniform by default). Times come from the ``order_arrivals`` stream and
+    compositions from ``sku_choice``. The stream is a plain object rather
+    than a Python generator so that it can be checkpointed.
+    """
+
+    def __init__(self, randomizer: RandomizerSimple, rate: float,
+                 items_min: int = 1, items_max: int = 5,
+                 sku_ids: Sequence[int] = (0,), sku_weights: Optional[Sequence[float]] = None,
+                 multipliers: Optional[Sequence[float]] = None, interval: float = 3600.0,
+                 start_time: float = 0.0, batch_size: int = 256):
+        if rate < 0:
+            raise ValueError("Order rate must not be negative")
+        if items_min < 1 or items_max < items_min:
+            raise ValueError("Invalid items per order range")
+        if not len(sku_ids):
+            raise ValueError("At least one SKU is required")
+        self.randomizer = randomizer
+        self.rate = rate
+        self.items_min = items_min
+        self.items_max = items_max
+        self.sku_ids = np.asarray(sku_ids)
+        self.sku_weights = None
+        if sku_weights is not None:
+            weights = np.asarray(sku_weights, dtype=float)
+            self.sku_weights = weights / weights.sum()
+        self.multipliers = np.asarray(multipliers if multipliers else [1.0], dtype=float)
+        self.interval = interval
+        self.peak_rate = rate * float(self.multipliers.max())
+        self.batch_size = batch_size
+        self.generated = 0
+
+        # Current batch: accepted arrival times, SKU draws and each order's offset into them
+        self._last_time = start_time
+        self._times = np.empty(0)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._skus = np.empty(0, dtype=np.int64)
+        self._index = 0
+
+    @classmethod
+    def from_settings(cls, instance: 'Instance', config: Dict[str, Any],
+                      start_time: float = 0.0) -> 'PoissonOrderStream':
+        """Build a stream from an ``order_generation`` settings block."""
+        randomizer = instance.randomizer
+        if randomizer is None:
+            randomizer = instance.randomizer = RandomizerSimple(instance.setting_config.get('seed'))
+        sku_ids = ([item.id for item in instance.item_descriptions]
+                   or list(range(config.get('num_skus', 100))))
+
+        sku_weights = None
+        skew = config.get('sku_skew', 0.0)
+        if skew:
+            sku_weights = 1.0 / np.arange(1, len(sku_ids) + 1, dtype=float) ** skew
+
+        profile = config.get('rate_profile') or {}
+        return cls(randomizer, config.get('rate', 0.5),
+                   items_min=config.get('items_per_order_min', 1),
+                   items_max=config.get('items_per_order_max', 5),
+                   sku_ids=sku_ids, sku_weights=sku_weights,
+                   multipliers=profile.get('multipliers'),
+                   interval=profile.get('interval', 3600.0),
+                   start_time=start_time)
+
+    def rate_at(self, time: float) -> float:
+        """Arrival rate (orders per second) at the given time."""
+        return self.rate * float(self.multipliers[int(time // self.interval) % len(self.multipliers)])
+
+    def _refill(self):
+        """Draw the next batch of accepted arrivals and their compositions."""
+        while True:
+            gaps = self.randomizer.next_exponentials(self.batch_size, 1.0 / self.peak_rate,
+                                                     stream=RandomizerSimple.ORDER_ARRIVALS)
+            times = self._last_time + np.cumsum(gaps)
+            self._last_time = float(times[-1])
+            if len(self.multipliers) > 1:
+                periods = (times // self.interval).astype(np.int64) % len(self.multipliers)
+                keep = self.randomizer.next_floats(self.batch_size,
+                                                   stream=RandomizerSimple.ORDER_ARRIVALS)
+                times = times[keep * self.peak_rate < self.rate * self.multipliers[periods]]
+            if len(times):
+                break
+
+        counts = self.randomizer.next_ints(len(times), self.items_min, self.items_max,
+                                           stream=RandomizerSimple.SKU_CHOICE)
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._skus = self.sku_ids[self.randomizer.choice_indices(
+            int(self._offsets[-1]), len(self.sku_ids), self.sku_weights,
+            stream=RandomizerSimple.SKU_CHOICE)]
+        self._times = times
+        self._index = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Tuple[float, Dict[int, int]]:
+        if self.peak_rate <= 0:
+            raise StopIteration
+        if self._index >= len(self._times):
+            self._refill()
+        index = self._index
+        self._index += 1
+        items: Dict[int, int] = {}
+        for sku in self._skus[self._offsets[index]:self._offsets[index + 1]].tolist():
+            items[sku] = items.get(sku, 0) + 1
+        self.generated += 1
+        return float(self._times[index]), items
+
+    def __repr__(self):
+        return (f"PoissonOrderStream(rate={self.rate}, peak={self.peak_rate}, "
+                f"generated={self.generated})")
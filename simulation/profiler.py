@@ -0,0 +1,122 @@
+"""Per-phase profiling of the simulation loop."""
+
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import json
+import time
+
+
+class PhaseProfiler:
+    """Measures where the simulation loop spends its time.
+
+    The executor calls ``begin_tick`` at the start of a tick and ``mark``
+    after each phase; a mark charges the time since the previous mark to the
+    named phase. Per phase the profiler keeps the cumulative wall time, the
+    call count and a log2 histogram of per-tick durations (in microseconds).
+    Ticks are also recorded as Chrome trace events ("X" complete events),
+    which chrome://tracing and Perfetto can open, up to ``max_trace_events``.
+
+    Phases of a fixed-step tick are ``bot_update``, ``path_planning``,
+    ``decisions`` (scheduled events: task and pod decisions, pickups, picks),
+    ``event_dispatch`` (BOT_MOVED publishing) and ``statistics`` (TIME_STEP
+    subscribers such as snapshots and checkpoints). In discrete-event mode an
+    instant has ``path_planning``, ``decisions`` (which then includes bot
+    arrivals) and ``statistics``.
+    """
+
+    HISTOGRAM_BUCKETS = 32
+
+    def __init__(self, trace: bool = True, max_trace_events: int = 500000):
+        self.trace = trace
+        self.max_trace_events = max_trace_events
+        self.totals: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.histograms: Dict[str, List[int]] = {}
+        self.maxima: Dict[str, float] = {}
+        self.ticks = 0
+        self.trace_events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._last = self._origin
+        self._sim_time = 0.0
+
+    def begin_tick(self, sim_time: float):
+        """Start timing a tick."""
+        self._sim_time = sim_time
+        self.ticks += 1
+        self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        """Charge the time since the previous mark to a phase."""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        if phase in self.totals:
+            self.totals[phase] += elapsed
+            self.calls[phase] += 1
+            if elapsed > self.maxima[phase]:
+                self.maxima[phase] = elapsed
+        else:
+            self.totals[phase] = elapsed
+            self.calls[phase] = 1
+            self.maxima[phase] = elapsed
+            self.histograms[phase] = [0] * self.HISTOGRAM_BUCKETS
+
+        micros = int(elapsed * 1e6)
+        self.histograms[phase][min(micros.bit_length(), self.HISTOGRAM_BUCKETS - 1)] += 1
+
+        if self.trace and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append({
+                'name': phase, 'ph': 'X', 'pid': 1, 'tid': 1,
+                'ts': round((self._last - self._origin) * 1e6, 3), 'dur': round(elapsed * 1e6, 3),
+                'args': {'sim_time': self._sim_time},
+            })
+        self._last = now
+
+    def percentile(self, phase: str, percentile: float) -> float:
+        """Approximate per-tick duration percentile (microseconds) from the histogram."""
+        histogram = self.histograms[phase]
+        target = self.calls[phase] * percentile / 100.0
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if seen >= target and count:
+                return float(1 << bucket) if bucket else 1.0  # Bucket upper bound
+        return float(1 << (len(histogram) - 1))
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Breakdown per phase, sorted by total time."""
+        total = sum(self.totals.values()) or 1.0
+        rows = []
+        for phase in sorted(self.totals, key=self.totals.get, reverse=True):
+            rows.append({
+                'phase': phase,
+                'calls': self.calls[phase],
+                'total_s': self.totals[phase],
+                'share': self.totals[phase] / total,
+                'mean_us': self.totals[phase] / self.calls[phase] * 1e6,
+                'p50_us': self.percentile(phase, 50),
+                'p99_us': self.percentile(phase, 99),
+                'max_us': self.maxima[phase] * 1e6,
+            })
+        return rows
+
+    def format_table(self) -> str:
+        """Breakdown as a plain-text table."""
+        lines = [f"{'phase':<16}{'calls':>10}{'total s':>10}{'share':>8}"
+                 f"{'mean us':>10}{'p50 us':>9}{'p99 us':>9}{'max us':>10}"]
+        for row in self.report():
+            lines.append(f"{row['phase']:<16}{row['calls']:>10}{row['total_s']:>10.3f}"
+                         f"{row['share']:>8.1%}{row['mean_us']:>10.1f}{row['p50_us']:>9.0f}"
+                         f"{row['p99_us']:>9.0f}{row['max_us']:>10.1f}")
+        return '\n'.join(lines)
+
+    def write_trace(self, filepath: str, metadata: Optional[Dict[str, Any]] = None):
+        """Write recorded ticks as a Chrome/Perfetto JSON trace."""
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': 1,
+                   'args': {'name': 'RAWSim-O simulation'}}] + self.trace_events
+        with open(filepath, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': metadata or {}}, f)
+
+    def __repr__(self):
+        return f"PhaseProfiler(ticks={self.ticks}, phases={len(self.totals)})"
@@ -0,0 +1,195 @@
+"""Parameter sweeps with a content-addressed result cache."""
+
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import copy
+import hashlib
+import itertools
+import json
+import os
+
+_PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+_SOURCE_PACKAGES = ('config', 'control', 'core', 'generator', 'pathfinding',
+                    'simulation', 'statistics', 'utils')
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """Hash of the simulator sources, so cached results expire when code changes."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for package in _SOURCE_PACKAGES:
+            for path in sorted((_PACKAGE_ROOT / package).rglob('*.py')):
+                digest.update(str(path.relative_to(_PACKAGE_ROOT)).encode())
+                digest.update(path.read_bytes())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def set_path(config: Dict[str, Any], dotted_path: str, value: Any):
+    """Set a nested value, e.g. ``control.pathfinding.method``."""
+    keys = dotted_path.split('.')
+    node = config
+    for key in keys[:-1]:
+        node = node.setdefault(key, {})
+    node[keys[-1]] = value
+
+
+def run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a single scenario and return its statistics summary.
+
+    Module-level so it can be shipped to process pool workers.
+    """
+    from generator.instance_generator import InstanceGenerator
+    from statistics.tracker import StatisticsTracker
+    from utils.randomizer import RandomizerSimple
+    from .executor import SimulationExecutor
+
+    seed = scenario['seed']
+    instance = InstanceGenerator(seed=seed).generate_simple_warehouse(**scenario['instance'])
+    instance.setting_config.update(scenario['settings'])
+    instance.controller_config.update(scenario['control'])
+    instance.randomizer = RandomizerSimple(seed)
+    instance.setting_config['seed'] = seed
+
+    stats_tracker = StatisticsTracker(instance)
+    executor = SimulationExecutor(instance)
+    stats_tracker.track(executor)
+    executor.execute()
+    return stats_tracker.get_summary()
+
+
+class SweepResultCache:
+    """Stores sweep results as JSON files named by their scenario hash."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(scenario: Dict[str, Any]) -> str:
+        """Hash of everything that determines a result, including the code version."""
+        payload = json.dumps({'scenario': scenario, 'code_version': code_version()},
+                             sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached record, or None if missing."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def put(self, key: str, record: Dict[str, Any]):
+        """Store a record (written to a temporary file first, then moved)."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(record, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def __repr__(self):
+        return f"SweepResultCache(directory={self.directory})"
+
+
+class ParameterSweep:
+    """Runs every combination of a parameter grid, skipping cached results.
+
+    A sweep specification looks like::
+
+        {
+          "base": {"instance": {...}, "settings": {...}, "control": {...}},
+          "grid": {"control.pathfinding.method": ["AStar", "WHCAvStar"],
+                   "instance.num_bots": [5, 10]},
+          "variations": [{"control.task_assignment.method": "balanced"}, ...],
+          "seeds": [42, 43]
+        }
+
+    Parameters are dotted paths into ``base``. Scenarios are the cartesian
+    product of the grid values, the explicit variations (if any) and the seeds.
+    """
+
+    def __init__(self, spec: Dict[str, Any], cache_dir: str, workers: Optional[int] = None):
+        self.spec = spec
+        self.cache = SweepResultCache(cache_dir)
+        self.workers = workers or os.cpu_count() or 1
+
+    def scenarios(self) -> List[Dict[str, Any]]:
+        """Expand the specification into concrete scenarios."""
+        base = self.spec.get('base', {})
+        grid = self.spec.get('grid', {})
+        variations = self.spec.get('variations') or [{}]
+        seeds = self.spec.get('seeds', [42])
+
+        names = list(grid.keys())
+        scenarios = []
+        for values in itertools.product(*(grid[name] for name in names)):
+            for variation in variations:
+                params = dict(zip(names, values))
+                params.update(variation)
+                for seed in seeds:
+                    scenario = {
+                        'instance': copy.deepcopy(base.get('instance', {})),
+                        'settings': copy.deepcopy(base.get('settings', {})),
+                        'control': copy.deepcopy(base.get('control', {})),
+                        'seed': seed,
+                    }
+                    for path, value in params.items():
+                        set_path(scenario, path, value)
+                    scenarios.append({'params': params, 'scenario': scenario})
+        return scenarios
+
+    def run(self, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Run all scenarios that are not cached yet; returns one record per scenario."""
+        records: List[Optional[Dict[str, Any]]] = []
+        pending = []
+        for entry in self.scenarios():
+            key = self.cache.key(entry['scenario'])
+            cached = self.cache.get(key)
+            if cached is not None:
+                cached['cached'] = True
+                records.append(cached)
+                if progress:
+                    progress(cached)
+            else:
+                records.append(None)
+                pending.append((len(records) - 1, key, entry))
+
+        def store(index, key, entry, summary):
+            record = {
+                'key': key,
+                'params': entry['params'],
+                'seed': entry['scenario']['seed'],
+                'scenario': entry['scenario'],
+                'summary': summary,
+                'code_version': code_version(),
+            }
+            self.cache.put(key, record)
+            record['cached'] = False
+            records[index] = record
+            if progress:
+                progress(record)
+
+        workers = min(self.workers, len(pending))
+        if workers <= 1:
+            for index, key, entry in pending:
+                store(index, key, entry, run_scenario(entry['scenario']))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Cache each result as soon as it finishes, so an interrupted
+                # sweep keeps everything completed so far
+                futures = {pool.submit(run_scenario, entry['scenario']): (index, key, entry)
+                           for index, key, entry in pending}
+                for future in as_completed(futures):
+                    index, key, entry = futures[future]
+                    store(index, key, entry, future.result())
+        return records
+
+    def __repr__(self):
+        return f"ParameterSweep(scenarios={len(self.scenarios())}, cache={self.cache.directory})"
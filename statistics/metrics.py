@@ -1,7 +1,8 @@
 """Performance metrics calculation."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import statistics
+import math
 
 
 class PerformanceMetrics:
@@ -46,3 +47,49 @@ class PerformanceMetrics:
             'avg_order_time': data.get('avg_order_time', 0.0),
             'collision_rate': data.get('collisions', 0) / max(data.get('total_movements', 1), 1),
         }
+
+    @staticmethod
+    def confidence_interval(values: List[float], confidence: float = 0.95) -> Tuple[float, float, Optional[float]]:
+        """Calculate mean, sample standard deviation and Student-t CI half-width.
+
+        The standard deviation and half-width are undefined for fewer than two
+        values; they are returned as 0.0 and None in that case.
+        """
+        n = len(values)
+        if n == 0:
+            return 0.0, 0.0, None
+        mean = sum(values) / n
+        if n < 2:
+            return mean, 0.0, None
+        std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+
+        from scipy.stats import t
+        half_width = t.ppf(0.5 + confidence / 2.0, n - 1) * std / math.sqrt(n)
+        return mean, std, float(half_width)
+
+    @staticmethod
+    def aggregate_replications(summaries: List[Dict[str, Any]],
+                               confidence: float = 0.95) -> Dict[str, Dict[str, Any]]:
+        """Aggregate the summaries of independent replications per metric.
+
+        Every numeric metric present in the summaries is reported with its
+        mean, standard deviation and confidence interval across replications.
+        """
+        metrics: Dict[str, List[float]] = {}
+        for summary in summaries:
+            for key, value in summary.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics.setdefault(key, []).append(float(value))
+
+        report = {}
+        for key, values in metrics.items():
+            mean, std, half_width = PerformanceMetrics.confidence_interval(values, confidence)
+            report[key] = {
+                'n': len(values),
+                'mean': mean,
+                'std': std,
+                'ci_low': mean - half_width if half_width is not None else None,
+                'ci_high': mean + half_width if half_width is not None else None,
+                'confidence': confidence,
+            }
+        return report
@@ -0,0 +1,96 @@
+"""Warm-up truncation and steady-state stopping rules."""
+
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+from .metrics import PerformanceMetrics
+
+
+def mser_truncation(series: Sequence[float], batch_size: int = 5) -> int:
+    """Find the warm-up length of a series with MSER-m.
+
+    The series is grouped into batch means of ``batch_size`` observations
+    (MSER-5 by default). For every candidate truncation point d, the squared
+    standard error of the remaining batch means is computed; the minimizing d
+    over the first half of the batches marks the end of the warm-up.
+
+    Returns the number of original observations to discard.
+    """
+    k = len(series) // batch_size
+    if k < 2:
+        return 0
+    batches = np.asarray(series[:k * batch_size], dtype=float).reshape(k, batch_size).mean(axis=1)
+
+    # Suffix sums give mean and sum of squares of batches[d:] for every d
+    suffix_sum = np.cumsum(batches[::-1])[::-1]
+    suffix_sq = np.cumsum((batches * batches)[::-1])[::-1]
+    remaining = np.arange(k, 0, -1, dtype=float)
+    sse = suffix_sq - suffix_sum * suffix_sum / remaining
+    mser = sse / (remaining * remaining)
+
+    candidates = k // 2 + 1
+    return int(np.argmin(mser[:candidates])) * batch_size
+
+
+def batch_means_interval(series: Sequence[float], num_batches: int = 10,
+                         confidence: float = 0.95) -> Tuple[float, Optional[float]]:
+    """Estimate the mean of a stationary series with non-overlapping batch means.
+
+    Returns the mean and the confidence interval half-width (None if the
+    series is too short for ``num_batches`` batches).
+    """
+    batch_length = len(series) // num_batches
+    if batch_length < 1:
+        mean = float(np.mean(series)) if len(series) else 0.0
+        return mean, None
+    used = np.asarray(series[len(series) - num_batches * batch_length:], dtype=float)
+    batch_means = used.reshape(num_batches, batch_length).mean(axis=1)
+    mean, _, half_width = PerformanceMetrics.confidence_interval(batch_means.tolist(), confidence)
+    return mean, half_width
+
+
+class SteadyStateDetector:
+    """Relative-precision stopping rule on a warm-up truncated series.
+
+    After each new observation, ``check`` truncates the warm-up with MSER and
+    builds a batch-means confidence interval on the rest. The rule is met once
+    the half-width is at most ``relative_precision`` times the mean.
+    """
+
+    def __init__(self, relative_precision: float = 0.05, confidence: float = 0.95,
+                 num_batches: int = 10, min_batch_length: int = 5, mser_batch_size: int = 5):
+        self.relative_precision = relative_precision
+        self.confidence = confidence
+        self.num_batches = num_batches
+        self.min_batch_length = min_batch_length
+        self.mser_batch_size = mser_batch_size
+
+        # Latest estimate
+        self.truncation = 0
+        self.estimate = 0.0
+        self.half_width: Optional[float] = None
+        self.converged = False
+
+    def check(self, series: List[float]) -> bool:
+        """Update the estimate from the full series; returns whether precision is reached."""
+        self.truncation = mser_truncation(series, self.mser_batch_size)
+        steady = series[self.truncation:]
+        self.estimate, self.half_width = batch_means_interval(steady, self.num_batches,
+                                                              self.confidence)
+        if len(steady) < self.num_batches * self.min_batch_length or self.half_width is None:
+            self.converged = False
+        elif self.estimate == 0.0:
+            self.converged = False
+        else:
+            self.converged = self.half_width <= self.relative_precision * abs(self.estimate)
+        return self.converged
+
+    def relative_half_width(self) -> Optional[float]:
+        """Current half-width relative to the estimate."""
+        if self.half_width is None or self.estimate == 0.0:
+            return None
+        return self.half_width / abs(self.estimate)
+
+    def __repr__(self):
+        return (f"SteadyStateDetector(estimate={self.estimate:.4g}, "
+                f"truncation={self.truncation}, converged={self.converged})")
@@ -1,22 +1,40 @@
 """Statistics tracking for simulation."""
 
-from typing import Dict, List, Any, TYPE_CHECKING
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
 from collections import defaultdict
+import logging
+import math
+
+from .steady_state import SteadyStateDetector, mser_truncation
 
 if TYPE_CHECKING:
     from core.instance import Instance
+    from simulation.events import EventManager, SimulationEvent
+    from simulation.executor import SimulationExecutor
+    from pathfinding.path_cache import PathCache
+
+
+def _new_bot_stats() -> Dict[str, Any]:
+    """Create the per-bot statistics record (module level so trackers pickle)."""
+    return {
+        'distance': 0.0,
+        'tasks_completed': 0,
+        'idle_time': 0.0,
+        'active_time': 0.0,
+    }
 
 
 class StatisticsTracker:
     """Tracks simulation statistics over time."""
 
-    def __init__(self, instance: 'Instance'):
+    def __init__(self, instance: Optional['Instance']):
         self.instance = instance
         
         # Time series data
         self.time_points: List[float] = []
         self.orders_completed: List[int] = []
         self.throughput: List[float] = []
+        self.interval_throughput: List[float] = []
         self.bot_utilization: List[float] = []
         
         # Counters
@@ -26,20 +44,119 @@ class StatisticsTracker:
         self.total_collisions = 0
         
         # Bot statistics
-        self.bot_stats = defaultdict(lambda: {
-            'distance': 0.0,
-            'tasks_completed': 0,
-            'idle_time': 0.0,
-            'active_time': 0.0,
-        })
+        self.bot_stats = defaultdict(_new_bot_stats)
+        
+        # Optional stopping rule and path cache counters (see track)
+        self.detector: Optional[SteadyStateDetector] = None
+        self.path_cache: Optional['PathCache'] = None
+        
+        # Event-driven bookkeeping (see attach)
+        self.last_event_time = 0.0
+        self._bot_positions: Dict[int, Tuple[float, float]] = {}
+
+    def track(self, executor: 'SimulationExecutor'):
+        """Follow a run: event counters, snapshots and the configured stopping rule.
+
+        Attaches to the executor's events (see ``attach``), so do not attach
+        separately. Snapshots are taken every ``statistics.snapshot_interval``
+        simulated seconds and published as ``STATISTICS_SNAPSHOT`` events,
+        which event logs record for replay. If
+        ``statistics.stopping_rule.enabled`` is set, the run is stopped once
+        the steady-state throughput estimate reaches the requested relative
+        precision (see SteadyStateDetector). The summary then also reports
+        the path planner's cache counters.
+        """
+        from simulation.events import EventType, SimulationEvent
+        self.attach(executor.event_manager)
+        self.path_cache = executor.path_planner.cache
+        config = executor.instance.setting_config.get('statistics', {})
+        interval = config.get('snapshot_interval', 10.0)
+        rule = config.get('stopping_rule', {})
+        if rule.get('enabled', False):
+            self.detector = SteadyStateDetector(
+                relative_precision=rule.get('relative_precision', 0.05),
+                confidence=rule.get('confidence', 0.95),
+                num_batches=rule.get('num_batches', 10)
+            )
+        min_time = rule.get('min_time', 0.0)
+
+        def on_snapshot(event: 'SimulationEvent'):
+            executor.event_manager.publish(SimulationEvent(
+                EventType.STATISTICS_SNAPSHOT, event.time, self.snapshot()))
+            if (self.detector is not None and event.time >= min_time
+                    and self.detector.check(self.interval_throughput)):
+                logging.info(f"Steady-state throughput {self.detector.estimate:.4g} reached "
+                             f"{self.detector.relative_precision:.0%} precision at t={event.time:.1f}s")
+                executor.stop()
+
+        executor.event_manager.subscribe(
+            EventType.TIME_STEP, on_snapshot, every_seconds=interval,
+            start=(int(executor.current_time // interval) + 1) * interval
+        )
+
+    def attach(self, event_manager: 'EventManager'):
+        """Update counters from published events.
+
+        Works on live runs as well as on replayed event logs, where no
+        instance state is available: snapshots then come from the logged
+        ``STATISTICS_SNAPSHOT`` events.
+        """
+        from simulation.events import EventType
+        event_manager.subscribe(EventType.STATISTICS_SNAPSHOT, self._on_snapshot)
+        event_manager.subscribe(EventType.BOT_MOVED, self._on_bot_moved)
+        event_manager.subscribe(EventType.ITEM_PICKED, self._on_item_picked)
+        event_manager.subscribe(EventType.ORDER_COMPLETED, self._on_order_completed)
+        event_manager.subscribe(EventType.COLLISION, self._on_collision)
+        event_manager.subscribe(EventType.SIMULATION_END, self._on_time)
+
+    def _on_time(self, event: 'SimulationEvent'):
+        self.last_event_time = max(self.last_event_time, event.time)
+
+    def _on_bot_moved(self, event: 'SimulationEvent'):
+        self._on_time(event)
+        bot_id = event.data['bot_id']
+        position = (event.data['x'], event.data['y'])
+        previous = self._bot_positions.get(bot_id)
+        self._bot_positions[bot_id] = position
+        if previous is not None:
+            distance = math.hypot(position[0] - previous[0], position[1] - previous[1])
+            self.bot_stats[bot_id]['distance'] += distance
+            self.total_distance_traveled += distance
+
+    def _on_item_picked(self, event: 'SimulationEvent'):
+        self._on_time(event)
+        for _ in range(event.data.get('count', 1)):
+            self.record_item_pick()
+
+    def _on_order_completed(self, event: 'SimulationEvent'):
+        self._on_time(event)
+        self.record_order_completion(event.data.get('order_id', -1), event.time)
+
+    def _on_collision(self, event: 'SimulationEvent'):
+        self._on_time(event)
+        self.record_collision(event.data.get('bot_id', -1))
+
+    def _on_snapshot(self, event: 'SimulationEvent'):
+        self._on_time(event)
+        data = event.data
+        self._append_snapshot(event.time, data['orders_completed'], data['busy_bots'], data['bots'])
+
+    def snapshot(self) -> Dict[str, int]:
+        """Completed orders and busy bots of the instance right now."""
+        bots = self.instance.bots
+        return {
+            'orders_completed': sum(station.orders_completed for station in self.instance.output_stations),
+            'busy_bots': sum(1 for bot in bots if bot.has_pod() or len(bot.path) > 0),
+            'bots': len(bots),
+        }
 
     def record_snapshot(self, current_time: float):
         """Record a snapshot of current statistics."""
+        data = self.snapshot()
+        self._append_snapshot(current_time, data['orders_completed'], data['busy_bots'], data['bots'])
+
+    def _append_snapshot(self, current_time: float, completed: int, busy_bots: int, bots: int):
         self.time_points.append(current_time)
-        
-        # Count completed orders
-        completed = sum(1 for station in self.instance.output_stations 
-                       for _ in range(station.orders_completed))
         self.orders_completed.append(completed)
         
         # Calculate throughput (orders per second)
@@ -49,14 +166,17 @@ class StatisticsTracker:
         else:
             self.throughput.append(0.0)
         
-        # Calculate bot utilization
-        if self.instance.bots:
-            active_bots = sum(1 for bot in self.instance.bots 
-                            if bot.has_pod() or len(bot.path) > 0)
-            utilization = active_bots / len(self.instance.bots)
-            self.bot_utilization.append(utilization)
+        # Throughput within the interval since the previous snapshot
+        if len(self.time_points) > 1:
+            elapsed = current_time - self.time_points[-2]
+            delta = completed - self.orders_completed[-2]
         else:
-            self.bot_utilization.append(0.0)
+            elapsed = current_time
+            delta = completed
+        self.interval_throughput.append(delta / elapsed if elapsed > 0 else 0.0)
+        
+        # Calculate bot utilization
+        self.bot_utilization.append(busy_bots / bots if bots else 0.0)
 
     def record_order_completion(self, order_id: int, completion_time: float):
         """Record order completion."""
@@ -71,18 +191,30 @@ class StatisticsTracker:
         self.total_collisions += 1
 
     def get_summary(self) -> Dict[str, Any]:
-        """Get summary statistics."""
-        avg_throughput = sum(self.throughput) / len(self.throughput) if self.throughput else 0
-        avg_utilization = sum(self.bot_utilization) / len(self.bot_utilization) if self.bot_utilization else 0
+        """Get summary statistics.
+
+        Averages exclude the warm-up period found by MSER truncation of the
+        interval throughput series.
+        """
+        warmup = mser_truncation(self.interval_throughput)
+        steady_throughput = self.interval_throughput[warmup:]
+        steady_utilization = self.bot_utilization[warmup:]
+        avg_throughput = sum(steady_throughput) / len(steady_throughput) if steady_throughput else 0
+        avg_utilization = sum(steady_utilization) / len(steady_utilization) if steady_utilization else 0
         
-        return {
+        summary = {
             'total_orders': self.total_orders,
             'total_items_picked': self.total_items_picked,
             'total_collisions': self.total_collisions,
+            'total_distance_traveled': self.total_distance_traveled,
             'average_throughput': avg_throughput,
             'average_bot_utilization': avg_utilization,
-            'simulation_time': self.time_points[-1] if self.time_points else 0,
+            'warmup_time': self.time_points[warmup - 1] if warmup > 0 else 0.0,
+            'simulation_time': self.time_points[-1] if self.time_points else self.last_event_time,
         }
+        if self.path_cache is not None:
+            summary.update(self.path_cache.metrics())
+        return summary
 
     def __repr__(self):
         return f"StatisticsTracker(orders={self.total_orders}, snapshots={len(self.time_points)})"
@@ -1,5 +1,6 @@
 """Basic tests for core functionality."""
 
+import math
 import sys
 sys.path.insert(0, '.')
 
@@ -8,6 +9,7 @@ from core.bot import BotNormal
 from core.pod import Pod
 from core.waypoint import Waypoint
 from generator.instance_generator import InstanceGenerator
+from utils.randomizer import RandomizerSimple
 
 
 def test_instance_creation():
@@ -72,6 +74,19 @@ def test_instance_generation():
     assert len(instance.bots) == 5
     assert len(instance.pods) <= 20  # May be limited by storage locations
     assert len(instance.waypoints) > 0
+    assert instance.setting_config['order_generation']['enabled']
+
+    # The column-only layout of earlier versions is still available
+    columns = InstanceGenerator(seed=42).generate_simple_warehouse(
+        length=30.0, width=20.0, num_bots=5, num_pods=20, cross_aisles=False)
+    assert sum(wp.pod_storage_location for wp in columns.waypoints) == 110
+    # Stations connect to an aisle in either layout
+    wide = InstanceGenerator(seed=42).generate_simple_warehouse(
+        length=40.0, width=20.0, num_bots=5, num_pods=20, cross_aisles=False)
+    for layout in (instance, columns, wide):
+        stations = layout.input_stations + layout.output_stations
+        assert all(not neighbor.pod_storage_location
+                   for station in stations for neighbor in station.waypoint.paths)
     print("✓ Instance generation test passed")
 
 
@@ -93,6 +108,389 @@ def test_bot_pod_interaction():
     print("✓ Bot-Pod interaction test passed")
 
 
+def test_randomizer_streams():
+    """Test that named random streams are reproducible and independent."""
+    a = RandomizerSimple(7)
+    b = RandomizerSimple(7)
+    b.next_floats(1000, stream=RandomizerSimple.CONTROLLER)  # Extra draws elsewhere
+    orders_a = a.next_exponentials(5, 2.0, stream=RandomizerSimple.ORDER_ARRIVALS)
+    orders_b = b.next_exponentials(5, 2.0, stream=RandomizerSimple.ORDER_ARRIVALS)
+    assert orders_a.shape == (5,) and (orders_a == orders_b).all()
+    assert (RandomizerSimple(8).next_ints(5, 0, 100, stream='sku_choice') !=
+            a.next_ints(5, 0, 100, stream='sku_choice')).any()
+
+    state = a.get_state()
+    first = [a.next_int(0, 1000, stream='sku_choice') for _ in range(3)]
+    a.set_state(state)
+    assert [a.next_int(0, 1000, stream='sku_choice') for _ in range(3)] == first
+    assert a.choice([]) is None and len(a.sample([1, 2, 3], 5)) == 3
+    print("✓ Randomizer streams test passed")
+
+
+def test_slotted_entities_pickle():
+    """Test that slotted entities carry no instance dict and survive pickling."""
+    import pickle
+    from benchmarks.memory import bytes_per_entity
+    instance = InstanceGenerator(seed=42).generate_simple_warehouse(
+        length=20.0, width=10.0, num_bots=2, num_pods=4)
+    bot, pod = instance.bots[0], instance.pods[0]
+    waypoint = next(wp for wp in instance.waypoints if wp.paths)
+    for entity in (bot, pod, waypoint):
+        assert not hasattr(entity, '__dict__')
+    assert isinstance(waypoint.paths, tuple) and len(waypoint.paths) == len(waypoint.path_distances)
+
+    restored = pickle.loads(pickle.dumps(instance))
+    twin = restored.waypoints[instance.waypoints.index(waypoint)]
+    assert [wp.id for wp in twin.paths] == [wp.id for wp in waypoint.paths]
+    assert twin.paths[0] in restored.waypoints
+    assert restored.bots[0].x == bot.x and restored.bots[0].current_waypoint in restored.waypoints
+
+    assert all(size > 0 for size in bytes_per_entity(200).values())
+    print("✓ Slotted entities test passed")
+
+
+def test_entity_removal_and_id_reuse():
+    """Test that removed bots and pods free their volatile IDs and leave the run."""
+    from simulation.executor import SimulationExecutor
+    instance = InstanceGenerator(seed=42).generate_simple_warehouse(
+        length=20.0, width=10.0, num_bots=3, num_pods=4)
+    instance.setting_config.update({'kinematics_backend': 'numpy', 'collisions': {'enabled': True},
+                                    'order_generation': {'enabled': False}})
+    executor = SimulationExecutor(instance)
+    tier = instance.compound.get_tier_by_id(0)
+    assert tier is instance.compound.tiers[0]
+
+    bot, pod = instance.bots[0], instance.pods[1]
+    removed = []
+    instance.add_removal_listener(removed.append)
+    instance.remove_bot(bot)
+    instance.remove_pod(pod)
+    assert removed == [bot, pod]
+    assert bot not in instance.bots and bot not in tier.bots and not bot.is_active
+    assert pod not in instance.pods and pod not in tier.pods and pod.waypoint is None
+    assert bot not in executor.active_bots.idle and bot not in executor.fleet.bots
+    assert all(wp.pod is not pod for wp in instance.waypoints)
+
+    # Freed volatile IDs are handed out again before new ones
+    new_bot = instance.create_bot(10, tier, 1.0, 1.0, 0.35)
+    new_pod = instance.create_pod(10, tier, 1.0, 1.0, 0.5)
+    assert new_bot.volatile_id == bot.volatile_id and new_pod.volatile_id == pod.volatile_id
+    assert sorted(b.volatile_id for b in instance.bots) == list(range(len(instance.bots)))
+    try:
+        instance.remove_bot(bot)
+        assert False, "removing a bot twice should fail"
+    except ValueError:
+        pass
+    executor.advance(until=5.0)
+
+    # Removing a bot or pod in the middle of a trip cancels the trip; its items are requested again
+    from control.dispatcher import FulfillmentTask
+    instance = InstanceGenerator(seed=42).generate_simple_warehouse(
+        length=30.0, width=20.0, num_bots=4, num_pods=30, num_output_stations=1)
+    instance.randomizer = RandomizerSimple(42)
+    instance.setting_config.update({'simulation_duration': 900.0, 'execution_mode': 'discrete_event',
+                                    'order_generation': {'enabled': True, 'rate': 0.01}})
+    executor = SimulationExecutor(instance)
+    dispatcher, table = executor.dispatcher, executor.path_planner.pathfinder.table
+
+    def fetching(spare=False):
+        """A trip on its way to a pod (whose items other pods also hold, if spare)."""
+        return next((task for task in dispatcher.tasks.values()
+                     if task.stage == FulfillmentTask.TO_POD and task.bot.path and
+                     (not spare or all(any(other is not task.pod and other.has_item(item_id, 1)
+                                           for other in instance.pods) for item_id in task.items))),
+                    None)
+
+    executor.begin()
+    while fetching() is None:
+        executor.step()
+    task = fetching()
+    instance.remove_bot(task.bot)
+    assert task.bot not in dispatcher.tasks and task.bot.id not in table._owned
+    assert task.pod not in dispatcher.busy_pods or any(
+        other.pod is task.pod for other in dispatcher.tasks.values())
+    while fetching(spare=True) is None:
+        executor.step()
+    fetch = fetching(spare=True)
+    instance.remove_pod(fetch.pod)
+    assert fetch.bot not in dispatcher.tasks and fetch.pod not in dispatcher.busy_pods
+    executor.advance()
+    executor.finish()
+    assert task.order.is_completed and fetch.order.is_completed
+    assert fetch.bot.current_pod is not fetch.pod
+    print("✓ Entity removal test passed")
+
+
+def test_csr_graph_and_astar_kernel():
+    """Test the CSR waypoint graph, its blocked mask and the integer A* kernel."""
+    import pickle
+    from pathfinding.astar import AStar
+    from pathfinding.graph import WaypointGraph
+    instance = InstanceGenerator(seed=42).generate_simple_warehouse(
+        length=30.0, width=20.0, num_bots=2, num_pods=20)
+    graph = WaypointGraph.for_instance(instance)
+    waypoint = next(wp for wp in instance.waypoints if len(wp.paths) > 2)
+    i = graph.index[waypoint]
+    row = graph.neighbors[graph.offsets[i]:graph.offsets[i + 1]]
+    assert [graph.waypoints[j] for j in row] == list(waypoint.paths)
+    assert list(graph.weights[graph.offsets[i]:graph.offsets[i + 1]]) == list(waypoint.path_distances)
+    # Backward searches see the same edges and lengths from the other end
+    predecessors, lengths = graph.predecessor_rows()
+    assert all(lengths[j][predecessors[j].index(i)] == distance
+               for j, distance in zip(row, waypoint.path_distances))
+
+    # Occupied storage locations are blocked until their pod is picked up
+    pod = instance.pods[0]
+    storage = pod.waypoint
+    assert graph.blocked[graph.index[storage]]
+    graph.pod_pickup(pod)
+    assert not graph.blocked[graph.index[storage]]
+    graph.pod_setdown(pod, storage)
+    assert graph.blocked_bytes[graph.index[storage]]
+
+    # Same path lengths as the object-based search, with and without the mask
+    def length(path):
+        return sum(a.distance_to(b) for a, b in zip(path, path[1:]))
+    astar = AStar()
+    aisles = [wp for wp in instance.waypoints if not wp.pod_storage_location and wp.paths]
+    for start, goal in zip(aisles[::7], aisles[::-5]):
+        path = astar.find_path(start, goal, blocked=graph.blocked_bytes)
+        reference = astar.find_path(start, goal, is_blocked=graph.is_waypoint_blocked)
+        assert path[0] is start and path[-1] is goal
+        assert abs(length(path) - length(reference)) < 1e-9
+        assert not any(graph.is_waypoint_blocked(wp) for wp in path[1:-1])
+
+    # Layout changes rebuild the graph; pickling keeps the mask a view of its buffer
+    extra = instance.create_waypoint(10000, instance.compound.tiers[0], 0.0, -2.0)
+    extra.add_path(aisles[0])
+    rebuilt = WaypointGraph.for_instance(instance)
+    assert rebuilt is not graph and rebuilt.index[extra] == len(rebuilt) - 1
+    assert astar.find_path(extra, aisles[3])[1] is aisles[0]
+    restored = pickle.loads(pickle.dumps(instance)).waypoint_graph
+    restored.blocked_bytes[0] = 1
+    assert restored.blocked[0] and len(restored) == len(rebuilt)
+    print("✓ CSR graph and A* kernel test passed")
+
+
+def test_landmark_heuristic():
+    """Test that ALT search finds optimal paths while expanding fewer nodes."""
+    from pathfinding.astar import AStar
+    from pathfinding.graph import WaypointGraph
+    instance = InstanceGenerator(seed=7).generate_simple_warehouse(
+        length=60.0, width=40.0, num_bots=2, num_pods=40)
+    graph = WaypointGraph.for_instance(instance)
+    table = graph.landmark_table(6)
+    assert len(table) == 6 and graph.landmark_table(6) is table
+
+    def length(path):
+        return sum(a.distance_to(b) for a, b in zip(path, path[1:]))
+    euclidean, landmarks = AStar(), AStar(heuristic='landmarks', landmarks=6)
+    nodes = [wp for wp in instance.waypoints if wp.paths]
+    for start, goal in zip(nodes[::11], nodes[::-13]):
+        reference = euclidean.find_path(start, goal, blocked=graph.blocked_bytes)
+        path = landmarks.find_path(start, goal, blocked=graph.blocked_bytes)
+        assert abs(length(path) - length(reference)) < 1e-9
+        assert table.bound(graph.index[start], graph.index[goal]) <= length(path) + 1e-9
+    assert landmarks.nodes_expanded * 3 < euclidean.nodes_expanded
+
+    # Layout changes drop the table; it is recomputed on the next search
+    extra = instance.create_waypoint(10000, instance.compound.tiers[0], 0.0, -2.0)
+    extra.add_path(nodes[0])
+    assert landmarks.find_path(extra, nodes[5])[1] is nodes[0]
+    rebuilt = WaypointGraph.for_instance(instance)
+    assert rebuilt.landmark_table(6) is not table
+    assert rebuilt.landmark_table(6).from_landmark.shape == (6, len(rebuilt))
+    print("✓ Landmark heuristic test passed")
+
+
+def test_contraction_hierarchy():
+    """Test that contraction-hierarchy queries match A* on the layout."""
+    import math
+    from control.path_planner import PathPlanner
+    from pathfinding.astar import AStar
+    from pathfinding.contraction import ContractionHierarchy
+    from pathfinding.graph import WaypointGraph
+    instance = InstanceGenerator(seed=3).generate_simple_warehouse(
+        length=40.0, width=30.0, num_bots=2, num_pods=30)
+    graph = WaypointGraph.for_instance(instance)
+    hierarchy = graph.contraction_hierarchy()
+    assert graph.contraction_hierarchy() is hierarchy and hierarchy.shortcuts > 0
+
+    def length(path):
+        return sum(a.distance_to(b) for a, b in zip(path, path[1:]))
+    astar = AStar()
+    planner = PathPlanner(instance, 'CH')
+    nodes = instance.waypoints
+    for start, goal in zip(nodes[::9], nodes[::-7]):
+        path = planner.plan_path(None, start, goal)
+        reference = astar.find_path(start, goal)
+        assert path[0] is start and path[-1] is goal
+        assert all(b in a.paths for a, b in zip(path, path[1:]))
+        assert abs(length(path) - length(reference)) < 1e-9
+        assert abs(planner.pathfinder.distance(start, goal) - length(reference)) < 1e-9
+
+    # One-way edges are respected
+    a, b, c = (instance.create_waypoint(20000 + i, instance.compound.tiers[0], 100.0 + i, 100.0)
+               for i in range(3))
+    one_way = WaypointGraph()
+    one_way.add_edge(a, b, bidirectional=False)
+    one_way.add_edge(b, c)
+    one_way = ContractionHierarchy(one_way)
+    assert one_way.query(0, 2) == (2.0, [0, 1, 2])
+    assert one_way.distance(2, 0) == math.inf
+    print("✓ Contraction hierarchy test passed")
+
+
+def test_path_cache_invalidation():
+    """Test that cached routes follow pod occupancy and the cache stays bounded."""
+    from control.path_planner import PathPlanner
+    from pathfinding.graph import WaypointGraph
+    instance = InstanceGenerator(seed=5).generate_simple_warehouse(
+        length=40.0, width=30.0, num_bots=2, num_pods=60)
+    graph = WaypointGraph.for_instance(instance)
+    planner = PathPlanner(instance, 'Simple')
+    cache = planner.cache
+
+    # A storage location between two opposite neighbours, freed by picking up its pod
+    pod, a, b = next((pod, n1, n2) for pod in instance.pods for n1 in pod.waypoint.paths
+                     for n2 in pod.waypoint.paths
+                     if n1.x - pod.waypoint.x == pod.waypoint.x - n2.x != 0 and n1.y == n2.y)
+    storage = pod.waypoint
+    graph.pod_pickup(pod)
+    assert planner.plan_path(None, a, b) == [a, storage, b]
+    assert planner.plan_path(None, a, b) == [a, storage, b]
+    assert cache.hits == 1 and cache.misses == 1
+
+    # Setting the pod down on the route drops it; picking it up again drops the detour
+    graph.pod_setdown(pod, storage)
+    assert cache.invalidations == 1
+    detour = planner.plan_path(None, a, b)
+    assert detour is None or storage not in detour
+    graph.pod_pickup(pod)
+    assert planner.plan_path(None, a, b) == [a, storage, b]
+
+    # Occupancy changes elsewhere keep the route; capacity bounds the cache
+    other = next(p for p in instance.pods if p is not pod and abs(p.x - storage.x) + abs(p.y - storage.y) > 10)
+    location = other.waypoint
+    graph.pod_pickup(other)
+    graph.pod_setdown(other, location)
+    hits = cache.hits
+    assert planner.plan_path(None, a, b) == [a, storage, b] and cache.hits == hits + 1
+    small = PathPlanner(instance, 'AStar', {'cache_size': 2})
+    aisles = [wp for wp in instance.waypoints if not wp.pod_storage_location and wp.paths]
+    for goal in aisles[-3:]:
+        small.plan_path(None, aisles[0], goal)
+    metrics = small.cache.metrics()
+    assert metrics['path_cache_size'] == 2 and metrics['path_cache_evictions'] == 1
+    assert PathPlanner(instance, 'WHCAvStar').cache is None
+
+    # A diagonal shortcut through an occupied location, where the Manhattan
+    # distance would overestimate what freeing it can save
+    instance = Instance.create_instance()
+    tier = instance.create_tier(0, 10.0, 10.0)
+    start, goal = instance.create_waypoint(0, tier, 0.0, 0.0), instance.create_waypoint(1, tier, 2.0, 2.0)
+    corner = instance.create_waypoint(2, tier, 0.0, 2.0)
+    shortcut = instance.create_waypoint(3, tier, 1.0, 1.0, pod_storage_location=True)
+    start.add_path(corner, 1.5)
+    corner.add_path(goal, 1.5)
+    start.add_path(shortcut)
+    shortcut.add_path(goal)
+    pod = instance.create_pod(0, tier, 1.0, 1.0, 0.5)
+    graph = WaypointGraph.for_instance(instance)
+    graph.pod_setdown(pod, shortcut)
+    planner = PathPlanner(instance, 'Simple')
+    assert planner.plan_path(None, start, goal) == [start, corner, goal]
+    graph.pod_pickup(pod)
+    assert planner.plan_path(None, start, goal) == [start, shortcut, goal]
+    print("✓ Path cache invalidation test passed")
+
+
+def test_space_time_reservations():
+    """Test that WHCAvStar plans in space and time around other bots' reservations."""
+    from pathfinding.reservations import ReservationTable
+    from pathfinding.whcav_star import WHCAvStar
+    table = ReservationTable()
+    table.reserve('a', 0.0, 1.0, owner=1)
+    table.reserve_edge('a', 'b', 0.0, 1.0, owner=1)
+    assert not table.is_free('a', 0.5, 2.0) and table.is_free('a', 1.0, 2.0)
+    assert table.is_free('a', 0.0, 1.0, owner=1)
+    assert not table.is_edge_free('b', 'a', 0.0, 1.0, owner=2)
+    table.release(1)
+    assert len(table) == 0 and table.is_edge_free('b', 'a', 0.0, 1.0)
+
+    instance = InstanceGenerator(seed=4).generate_simple_warehouse(
+        length=40.0, width=30.0, num_bots=3, num_pods=20)
+    bots = instance.bots
+    aisles = [wp for wp in instance.waypoints if not wp.pod_storage_location]
+    a = aisles[0]
+    b = next(wp for wp in a.paths if not wp.pod_storage_location)
+
+    def occupancy(bot, path, start_time=0.0):
+        """(waypoint, start, end) held by each move and wait of a route."""
+        held, t = [], start_time
+        for source, target in zip(path, path[1:]):
+            distance = math.hypot(target.x - source.x, target.y - source.y)
+            duration = bot.wait_time if target is source else bot.travel_time(distance)
+            held += [(source, t, t + duration), (target, t, t + duration)]
+            t += duration
+        return held, t
+
+    def overlap(first, second):
+        return any(wp is other and s < e2 and s2 < e for wp, s, e in first for other, s2, e2 in second)
+
+    # Two bots heading for each other's waypoint: the second one waits or steps aside
+    planner = WHCAvStar(window_size=10)
+    first = planner.find_path_cooperative(bots[0], a, b, 0.0)
+    second = planner.find_path_cooperative(bots[1], b, a, 0.0)
+    assert first == [a, b] and second[0] is b and len(second) > 2
+    assert all(wp is next_wp or next_wp in wp.paths for wp, next_wp in zip(second, second[1:]))
+    held, arrival = occupancy(bots[0], first)
+    assert arrival == bots[0].travel_time(2.0)
+    # Apart from the waypoint it starts on, the second bot keeps clear of the first
+    assert not overlap(held + [(b, arrival, float('inf'))], occupancy(bots[1], second)[0][2:])
+    assert not planner.is_waypoint_available(b, 100.0) and planner.is_waypoint_available(aisles[-1], 1.5)
+
+    # Replanning replaces the bot's own reservations
+    replanned = planner.find_path_cooperative(bots[0], a, b, 0.0)
+    reserved = len(planner.table)
+    assert planner.find_path_cooperative(bots[0], a, b, 0.0) == replanned
+    assert len(planner.table) == reserved
+
+    # A route stops at the end of the window; reservations beyond it are left to later replanning
+    goal = aisles[-1]
+    straight = WHCAvStar(window_size=100).find_path_cooperative(bots[0], a, goal, 0.0)
+    blocker = straight[5]
+    busy = [(blocker, 8.0, 11.0)]
+    for window, reaches in ((3, False), (100, True)):
+        planner = WHCAvStar(window_size=window)
+        planner.reserve_waypoint(blocker, 8.0, 3.0, owner=bots[2].id)
+        path = planner.find_path_cooperative(bots[0], a, goal, 0.0)
+        assert (path[-1] is goal) == reaches and not overlap(busy, occupancy(bots[0], path)[0])
+        if not reaches:
+            assert path == straight[:4]
+    print("✓ Space-time reservation test passed")
+
+
+def test_reservation_expiry_buckets():
+    """Test that reservation expiry pops elapsed time buckets and keeps the table bounded."""
+    from pathfinding.reservations import ReservationTable
+    table = ReservationTable(bucket_width=1.0)
+    for tick in range(1000):
+        now = float(tick)
+        table.reserve(('wp', tick % 7), now, now + 2.0, owner=tick % 3)
+        table.reserve_edge(('wp', tick % 7), ('wp', tick % 5), now, now + 1.0, owner=tick % 3)
+        if tick % 50 == 0:
+            table.release(tick % 3)
+        table.expire(now)
+        # Only reservations ending in the last bucket or later survive
+        assert len(table) <= 6 and len(table._buckets) <= 4
+    assert table.is_free(('wp', 998 % 7), 1000.0, 1001.0)
+    assert not table.is_free(('wp', 999 % 7), 1000.0, 1001.0)
+    table.expire(1002.0)
+    assert len(table) == 0 and not table._owned and not table._bucket_heap
+    print("✓ Reservation expiry bucket test passed")
+
+
 if __name__ == '__main__':
     print("Running basic tests...\n")
     
@@ -103,5 +501,14 @@ if __name__ == '__main__':
     test_waypoint_creation()
     test_instance_generation()
     test_bot_pod_interaction()
+    test_randomizer_streams()
+    test_slotted_entities_pickle()
+    test_entity_removal_and_id_reuse()
+    test_csr_graph_and_astar_kernel()
+    test_landmark_heuristic()
+    test_contraction_hierarchy()
+    test_path_cache_invalidation()
+    test_space_time_reservations()
+    test_reservation_expiry_buckets()
     
     print("\n✓ All basic tests passed!")
@@ -0,0 +1,600 @@
+"""Tests for the simulation executor and event handling."""
+
+import sys
+sys.path.insert(0, '.')
+
+from core.instance import Instance
+from generator.instance_generator import InstanceGenerator
+from simulation.executor import SimulationExecutor
+from simulation.checkpoint import SimulationCheckpoint
+from simulation.sweep import ParameterSweep
+from simulation.event_log import EventLogWriter, EventLogReader, EventLogReplayer
+from simulation.control_server import ControlServer
+from statistics.tracker import StatisticsTracker
+import asyncio
+import json
+from simulation.event_queue import EventQueue
+from simulation.events import EventManager, EventType, SimulationEvent
+
+
+def _make_line_instance(mode: str, duration: float = 100.0, spacing: float = 2.0, **settings):
+    """Create a single bot on a straight line of waypoints."""
+    setting_config = {'time_step': 0.1, 'simulation_duration': duration, 'execution_mode': mode}
+    setting_config.update(settings)
+    instance = Instance.create_instance(
+        setting_config=setting_config,
+        controller_config={'pathfinding': {'method': 'AStar'}}
+    )
+    tier = instance.create_tier(0, 6 * spacing, 10.0)
+    waypoints = [instance.create_waypoint(i, tier, spacing * i, 5.0) for i in range(6)]
+    for a, b in zip(waypoints, waypoints[1:]):
+        a.add_path(b)
+    bot = instance.create_bot(0, tier, waypoints[0].x, waypoints[0].y, 0.3)
+    bot.current_waypoint = waypoints[0]
+    return instance, bot, waypoints
+
+
+def test_event_queue_ordering():
+    """Test that events pop in time order and cancelled events are skipped."""
+    queue = EventQueue()
+    fired = []
+    queue.push(5.0, EventType.BOT_MOVED, fired.append, 'late')
+    early = queue.push(1.0, EventType.BOT_MOVED, fired.append, 'early')
+    queue.push(1.0, EventType.BOT_MOVED, fired.append, 'tie')
+    queue.push(3.0, EventType.BOT_MOVED, fired.append, 'cancelled').cancel()
+    assert len(queue) == 3
+    assert queue.peek_time() == 1.0
+
+    while len(queue) > 0:
+        queue.pop().fire()
+    assert fired == ['early', 'tie', 'late']
+    assert early.time == 1.0
+    print("✓ Event queue ordering test passed")
+
+
+def test_event_manager_subscriptions():
+    """Test sampled, batched and string-typed subscriptions."""
+    manager = EventManager()
+    assert not manager.has_subscribers(EventType.TIME_STEP)
+
+    sampled, nth, batches = [], [], []
+    manager.subscribe('time_step', lambda e: sampled.append(round(e.time, 1)), every_seconds=1.0)
+    manager.subscribe(EventType.TIME_STEP, lambda e: nth.append(round(e.time, 1)), every_nth=5)
+    batched = manager.subscribe(EventType.BOT_MOVED, batches.append, batch_size=4)
+    assert manager.has_subscribers(EventType.TIME_STEP)
+
+    t = 0.0
+    for _ in range(30):
+        t += 0.1
+        manager.emit(EventType.TIME_STEP, t)
+        manager.emit(EventType.BOT_MOVED, t, {'bot_id': 0})
+    assert sampled == [1.0, 2.0, 3.0]
+    assert nth == [0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
+    assert [len(batch) for batch in batches] == [4] * 7
+
+    manager.flush()
+    assert len(batches[-1]) == 2 and isinstance(batches[-1][0], SimulationEvent)
+    manager.unsubscribe(batched)
+    assert not manager.has_subscribers(EventType.BOT_MOVED)
+    print("✓ Event manager subscriptions test passed")
+
+
+def test_discrete_event_bot_travel():
+    """Test that a bot follows its path through arrival events."""
+    instance, bot, waypoints = _make_line_instance('discrete_event')
+    executor = SimulationExecutor(instance)
+    arrivals = []
+    executor.event_manager.subscribe(EventType.BOT_MOVED,
+                                     lambda e: arrivals.append(e.data['waypoint_id']))
+    bot.path = list(waypoints[1:])
+    executor.execute()
+
+    assert bot.current_waypoint is waypoints[-1]
+    assert bot.path == []
+    assert arrivals == [1, 2, 3, 4, 5]
+    assert executor.current_time == 100.0
+    print("✓ Discrete event bot travel test passed")
+
+
+def test_discrete_event_matches_fixed_step():
+    """Test that both modes agree on when a bot reaches its goal."""
+    arrival_times = {}
+    for mode in ('fixed_step', 'discrete_event'):
+        instance, bot, waypoints = _make_line_instance(mode, duration=20.0)
+        executor = SimulationExecutor(instance)
+        bot.path = list(waypoints[1:])
+
+        def on_time(event, bot=bot, mode=mode):
+            if not bot.path and mode not in arrival_times:
+                arrival_times[mode] = event.time
+        executor.event_manager.subscribe(EventType.TIME_STEP, on_time)
+        executor.execute()
+
+    assert abs(arrival_times['fixed_step'] - arrival_times['discrete_event']) < 1.0
+    print("✓ Discrete event vs fixed step test passed")
+
+
+def test_scheduled_events_in_fixed_step():
+    """Test that scheduled events fire during fixed-step execution."""
+    generator = InstanceGenerator(seed=42)
+    instance = generator.generate_simple_warehouse(length=20.0, width=10.0,
+                                                   num_bots=2, num_pods=5)
+    instance.setting_config.update({'simulation_duration': 5.0, 'order_generation': {'enabled': False}})
+    executor = SimulationExecutor(instance)
+    executor.schedule_order_arrival(2.0, {0: 1})
+    executor.execute()
+
+    assert len(instance.order_list.orders) == 1
+    assert 2.0 <= instance.order_list.orders[0].creation_time < 2.2
+    print("✓ Scheduled events in fixed step test passed")
+
+
+def test_numpy_kinematics_matches_python():
+    """Test that the vectorized fleet backend reproduces scalar bot updates."""
+    final_positions = {}
+    for backend in ('python', 'numpy'):
+        generator = InstanceGenerator(seed=7)
+        instance = generator.generate_simple_warehouse(length=20.0, width=10.0,
+                                                       num_bots=4, num_pods=0)
+        instance.setting_config['simulation_duration'] = 15.0
+        instance.setting_config['kinematics_backend'] = backend
+        executor = SimulationExecutor(instance)
+        grid = [wp for wp in instance.waypoints if wp.paths]
+        for bot in instance.bots:
+            start = min(grid, key=lambda wp: bot.distance_to(wp.x, wp.y))
+            goal = grid[-1 - 3 * bot.id]
+            bot.path = executor.path_planner.pathfinder.astar.find_path(start, goal)
+        executor.execute()
+        final_positions[backend] = [(bot.x, bot.y, len(bot.path)) for bot in instance.bots]
+
+    for (px, py, pn), (nx, ny, nn) in zip(final_positions['python'], final_positions['numpy']):
+        assert abs(px - nx) < 1e-9 and abs(py - ny) < 1e-9
+        assert pn == nn
+    print("✓ NumPy kinematics test passed")
+
+
+def test_active_set_transitions():
+    """Test that bots move between moving, waiting and idle sets on transitions."""
+    instance, bot, waypoints = _make_line_instance('fixed_step', duration=30.0)
+    pod = instance.create_pod(0, instance.compound.tiers[0], 0.0, 0.0, 0.5)
+    executor = SimulationExecutor(instance)
+    active = executor.active_bots
+    assert bot in active.idle and bot in active.available
+
+    bot.path = list(waypoints[1:3])
+    assert bot in active.moving and bot not in active.available
+    bot.is_waiting = True
+    assert bot in active.waiting
+    bot.is_waiting = False
+    assert bot in active.moving
+
+    executor.execute()
+    assert bot in active.idle and bot.current_waypoint is waypoints[2]
+    bot.pickup_pod(pod)
+    assert bot in active.idle and bot not in active.available
+    assert executor.task_manager.assign_task(None, None) is None
+    bot.setdown_pod()
+    assert bot in active.available
+
+    # Urgent orders go to the bot nearest to their station
+    from control.task_manager import TaskManager
+    from core.order import Order
+    order = Order(0)
+    order.priority = 9
+    station = instance.create_output_station(0, bot.tier, waypoints[-1].x, 5.0, 1.0)
+    assert TaskManager(instance, 'priority', active).assign_task(order, station) is bot
+    print("✓ Active set transitions test passed")
+
+
+def test_adaptive_step_on_long_segments():
+    """Test that adaptive steps cut the tick count while keeping arrival times."""
+    results = {}
+    for enabled in (False, True):
+        instance, bot, waypoints = _make_line_instance(
+            'fixed_step', duration=40.0, spacing=10.0,
+            adaptive_step={'enabled': enabled, 'max_step': 1.0, 'tolerance': 0.01})
+        executor = SimulationExecutor(instance)
+        bot.path = list(waypoints[1:])
+        ticks = []
+        arrivals = {}
+
+        def on_time(event, bot=bot, ticks=ticks, arrivals=arrivals):
+            ticks.append(event.time)
+            arrivals.setdefault(bot.current_waypoint.id, event.time)
+        executor.event_manager.subscribe(EventType.TIME_STEP, on_time)
+        executor.execute()
+        results[enabled] = (len(ticks), arrivals)
+
+    fixed_ticks, fixed_arrivals = results[False]
+    adaptive_ticks, adaptive_arrivals = results[True]
+    assert adaptive_ticks * 2 < fixed_ticks
+    assert set(adaptive_arrivals) == set(fixed_arrivals) == {0, 1, 2, 3, 4, 5}
+    for waypoint_id, arrival in fixed_arrivals.items():
+        assert abs(arrival - adaptive_arrivals[waypoint_id]) < 0.25
+    print("✓ Adaptive step test passed")
+
+
+def test_checkpoint_fork_continues_identically():
+    """Test that a restored checkpoint continues exactly like the original run."""
+    generator = InstanceGenerator(seed=3)
+    instance = generator.generate_simple_warehouse(length=20.0, width=10.0,
+                                                   num_bots=3, num_pods=0)
+    instance.setting_config.update({'simulation_duration': 4.0, 'order_generation': {'enabled': False}})
+    executor = SimulationExecutor(instance)
+    grid = [wp for wp in instance.waypoints if wp.paths]
+    for bot in instance.bots:
+        start = min(grid, key=lambda wp: bot.distance_to(wp.x, wp.y))
+        bot.path = executor.path_planner.pathfinder.astar.find_path(start, grid[-1 - bot.id])
+    executor.schedule_order_arrival(6.0, {0: 2})
+    executor.execute()
+
+    data = SimulationCheckpoint.dumps(executor)
+    # Loading does not touch the caller's global random state
+    import random
+    random.random()
+    state = random.getstate()
+    fork, _ = SimulationCheckpoint.loads(data)
+    assert random.getstate() == state
+    assert fork.instance is not instance and fork.current_time == executor.current_time
+    assert fork.instance.randomizer is not instance.randomizer
+
+    results = []
+    for run in (executor, fork):
+        run.max_time = 12.0
+        run.execute()
+        results.append(([(bot.x, bot.y, bot.orientation, len(bot.path)) for bot in run.instance.bots],
+                         len(run.instance.order_list.orders)))
+    assert results[0] == results[1]
+    assert results[0][1] == 1
+    print("✓ Checkpoint fork test passed")
+
+
+def test_sweep_reuses_cached_results(tmp_path):
+    """Test that a repeated sweep is served from the result cache."""
+    spec = {
+        'base': {'instance': {'length': 20.0, 'width': 10.0, 'num_bots': 2, 'num_pods': 5},
+                 'settings': {'simulation_duration': 2.0}},
+        'grid': {'control.pathfinding.method': ['AStar', 'Simple']},
+        'seeds': [1, 2],
+    }
+    sweep = ParameterSweep(spec, str(tmp_path), workers=1)
+    scenarios = sweep.scenarios()
+    assert len(scenarios) == 4
+    assert scenarios[0]['scenario']['control'] == {'pathfinding': {'method': 'AStar'}}
+
+    first = sweep.run()
+    assert not any(record['cached'] for record in first)
+    second = ParameterSweep(spec, str(tmp_path), workers=1).run()
+    assert all(record['cached'] for record in second)
+    assert [r['summary'] for r in first] == [r['summary'] for r in second]
+    assert len({r['key'] for r in second}) == 4
+    print("✓ Sweep cache test passed")
+
+
+def test_event_log_replay(tmp_path):
+    """Test that a logged run replays its movement and statistics."""
+    instance, bot, waypoints = _make_line_instance('fixed_step', duration=20.0)
+    pod = instance.create_pod(0, instance.compound.tiers[0], waypoints[3].x, waypoints[3].y, 0.5)
+    pod.waypoint = waypoints[3]
+    waypoints[3].pod = pod
+    executor = SimulationExecutor(instance)
+    instance.setting_config['statistics'] = {'snapshot_interval': 2.0}
+    live = StatisticsTracker(instance)
+    live.track(executor)
+    bot.path = list(waypoints[1:4])
+    executor.schedule_at(8.0, EventType.BOT_PICKUP, executor.schedule_pod_pickup, bot, pod)
+
+    log_path = tmp_path / 'run.rsel.gz'
+    with EventLogWriter(str(log_path)) as log:
+        log.attach(executor.event_manager)
+        executor.execute()
+    assert bot.has_pod()
+
+    events = list(EventLogReader(str(log_path)))
+    assert len(events) == log.records
+    assert events[0].event_type == EventType.SIMULATION_START
+    moved = [e for e in events if e.event_type == EventType.BOT_MOVED]
+    assert moved[-1].data['waypoint_id'] == 3
+
+    replay_instance, replay_bot, _ = _make_line_instance('fixed_step')
+    replay_pod = replay_instance.create_pod(0, replay_instance.compound.tiers[0], 0.0, 0.0, 0.5)
+    replayed = StatisticsTracker(None)
+    replayer = EventLogReplayer(str(log_path), instance=replay_instance)
+    replayed.attach(replayer.event_manager)
+    replayer.advance_to(5.0)
+    assert not replayer.finished and replayer.current_time == 5.0
+    replayer.run()
+
+    assert abs(replay_bot.x - bot.x) < 1e-4 and replay_bot.current_pod is replay_pod
+    assert abs(replayed.total_distance_traveled - live.total_distance_traveled) < 1e-3
+    live_summary, replayed_summary = live.get_summary(), replayed.get_summary()
+    assert live_summary['average_bot_utilization'] > 0
+    for key in ('simulation_time', 'average_throughput', 'average_bot_utilization'):
+        assert replayed_summary[key] == live_summary[key]
+    assert replayed.bot_utilization == live.bot_utilization
+    print("✓ Event log replay test passed")
+
+
+def test_control_server_commands():
+    """Test stepping, running to a time and stopping through the control socket."""
+    instance, bot, waypoints = _make_line_instance('fixed_step', duration=100.0)
+    executor = SimulationExecutor(instance)
+    bot.path = list(waypoints[1:])
+    server = ControlServer(executor, StatisticsTracker(instance), start_paused=True)
+
+    async def client():
+        while server.address is None:
+            await asyncio.sleep(0.001)
+        reader, writer = await asyncio.open_connection(*server.address)
+
+        async def request(**command):
+            writer.write((json.dumps(command) + '\n').encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        status = (await request(cmd='status'))['status']
+        assert status['state'] == 'paused' and status['time'] == 0.0
+        await request(cmd='step', count=3)
+        while (await request(cmd='status'))['status']['state'] != 'paused':
+            await asyncio.sleep(0.001)
+        assert abs(executor.current_time - 0.3) < 1e-9
+
+        await request(cmd='run_until', time=5.0)
+        while (await request(cmd='status'))['status']['state'] != 'paused':
+            await asyncio.sleep(0.001)
+        assert 5.0 <= executor.current_time < 5.2
+
+        assert (await request(cmd='bogus'))['ok'] is False
+        assert 'summary' in await request(cmd='summary')
+        assert (await request(cmd='stop'))['ok']
+        writer.close()
+
+    async def main():
+        await asyncio.gather(server.serve(), client())
+
+    asyncio.run(main())
+    assert server.state == ControlServer.FINISHED
+    assert executor.current_time < 5.2
+    print("✓ Control server test passed")
+
+
+def test_profiler_phase_breakdown(tmp_path):
+    """Test that profiling times every phase of each tick and writes a trace."""
+    import json
+    instance, bot, waypoints = _make_line_instance('fixed_step', duration=5.0)
+    executor = SimulationExecutor(instance)
+    profiler = executor.enable_profiling()
+    bot.path = list(waypoints[1:])
+    executor.execute()
+
+    rows = {row['phase']: row for row in profiler.report()}
+    assert set(rows) == {'bot_update', 'path_planning', 'event_dispatch', 'decisions', 'statistics'}
+    assert all(row['calls'] == profiler.ticks for row in rows.values())
+    assert abs(sum(row['share'] for row in rows.values()) - 1.0) < 1e-9
+    assert 'bot_update' in profiler.format_table()
+
+    trace_file = tmp_path / 'trace.json'
+    profiler.write_trace(str(trace_file))
+    events = json.loads(trace_file.read_text())['traceEvents']
+    assert sum(1 for event in events if event['ph'] == 'X') == 5 * profiler.ticks
+    print("✓ Profiler test passed")
+
+
+def test_benchmark_measure_and_compare():
+    """Test that a benchmark scenario is measured and regressions are flagged."""
+    from benchmarks.runner import measure, compare_results, METRICS
+    result = measure('tiny')
+    assert result['steps'] > 0 and result['routes'] > 0
+    assert result['sim_speed'] > 0 and result['startup_s'] > 0
+
+    baseline = {'results': {'tiny': result}}
+    slower = dict(result, steps_per_sec=result['steps_per_sec'] * 0.5)
+    rows = compare_results(baseline, {'results': {'tiny': slower}}, threshold=0.1)
+    status = {row['metric']: row['status'] for row in rows}
+    assert status['steps_per_sec'] == 'regression'
+    assert status['startup_s'] == 'ok'
+    assert set(status) <= set(METRICS)
+    print("✓ Benchmark test passed")
+
+
+def test_poisson_order_stream():
+    """Test order arrival rates, thinning and lazy feeding of the order list."""
+    from utils.randomizer import RandomizerSimple
+    from simulation.order_stream import PoissonOrderStream
+
+    stream = PoissonOrderStream(RandomizerSimple(1), rate=1.0, items_min=1, items_max=3,
+                                sku_ids=range(10), multipliers=[0.25, 1.0], interval=100.0)
+    counts = [0, 0]
+    for arrival_time, items in stream:
+        if arrival_time > 20000.0:
+            break
+        counts[int(arrival_time // 100.0) % 2] += 1
+        assert 1 <= sum(items.values()) <= 3
+        assert all(0 <= sku < 10 for sku in items)
+    assert abs(counts[0] - 2500) < 250 and abs(counts[1] - 10000) < 500
+
+    instance, bot, waypoints = _make_line_instance(
+        'discrete_event', duration=200.0,
+        seed=7, order_generation={'enabled': True, 'rate': 0.5, 'num_skus': 20})
+    executor = SimulationExecutor(instance)
+    executor.begin()
+    executor.advance(until=100.0)
+    orders = instance.order_list.orders
+    assert orders and all(order.creation_time <= 100.0 for order in orders)
+    assert len(executor.event_queue) == 1  # only the next arrival is pending
+    executor.advance()
+    executor.finish()
+    assert 60 < len(instance.order_list.orders) < 140
+    print("✓ Poisson order stream test passed")
+
+
+def test_dispatcher_fulfills_orders():
+    """Test that generated orders are fulfilled by event-driven pod trips."""
+    from generator.instance_generator import InstanceGenerator
+    from utils.randomizer import RandomizerSimple
+    for mode in ('fixed_step', 'discrete_event'):
+        instance = InstanceGenerator(seed=42).generate_simple_warehouse(
+            length=30.0, width=20.0, num_bots=6, num_pods=30, num_output_stations=2)
+        instance.randomizer = RandomizerSimple(42)
+        instance.setting_config.update({
+            'simulation_duration': 600.0, 'execution_mode': mode,
+            'order_generation': {'enabled': True, 'rate': 0.05},
+        })
+        executor = SimulationExecutor(instance)
+        completed = []
+        executor.event_manager.subscribe(EventType.ORDER_COMPLETED, completed.append)
+        stats_tracker = StatisticsTracker(instance)
+        stats_tracker.track(executor)
+
+        calls = []
+        select_pod = executor.pod_selector.select_pod
+        def counting_select_pod(*args, **kwargs):
+            calls.append(1)
+            return select_pod(*args, **kwargs)
+        executor.pod_selector.select_pod = counting_select_pod
+        executor.execute()
+
+        dispatcher = executor.dispatcher
+        assert completed and dispatcher.trips_completed >= len(completed)
+        summary = stats_tracker.get_summary()
+        assert summary['total_orders'] == len(completed) and summary['total_items_picked'] > 0
+        assert sum(station.orders_completed for station in instance.output_stations) == len(completed)
+        assert all(order.is_completed for order in instance.order_list.orders
+                   if order.id in {event.data['order_id'] for event in completed})
+        # Busy bots are never offered new tasks
+        assert set(executor.active_bots.reserved) == set(dispatcher.tasks)
+        assert not set(dispatcher.tasks) & set(executor.active_bots.available)
+        # Decisions follow state changes, not ticks
+        assert len(calls) < 4 * (dispatcher.trips_completed + len(dispatcher.tasks)) + 20
+    print("✓ Dispatcher test passed")
+
+
+def test_collision_detection_and_penalty():
+    """Test that bots meeting head-on collide once and wait out the penalty."""
+    instance, bot, waypoints = _make_line_instance('fixed_step', duration=30.0,
+                                                   collisions={'enabled': True})
+    other = instance.create_bot(1, bot.tier, waypoints[-1].x, waypoints[-1].y, 0.3)
+    other.current_waypoint = waypoints[-1]
+    for a, b in zip(waypoints, waypoints[1:]):
+        b.add_path(a)
+    bot.path = waypoints[1:]
+    other.path = waypoints[-2::-1]
+
+    executor = SimulationExecutor(instance)
+    stats = StatisticsTracker(instance)
+    stats.attach(executor.event_manager)
+    events = []
+    executor.event_manager.subscribe(EventType.COLLISION, events.append)
+    executor.begin()
+    while not events:
+        executor.step()
+    assert {event.data['bot_id'] for event in events} == {0, 1}
+    assert bot.is_waiting and other.is_waiting and bot.current_velocity == 0.0
+    collided_at = executor.current_time
+
+    # Still in contact during the penalty: no further collisions
+    executor.advance(until=collided_at + bot.collision_penalty_time - 0.5)
+    assert len(events) == 2 and bot.is_waiting
+    executor.advance(until=collided_at + bot.collision_penalty_time + 0.2)
+    assert not bot.is_waiting and not other.is_waiting
+    assert stats.total_collisions == len(events)
+    assert executor.collision_detector.collisions == len(events) // 2
+    print("✓ Collision detection test passed")
+
+
+def test_cooperative_planning_reduces_collisions():
+    """Test that bots following WHCAvStar reservations collide far less than with plain A*."""
+    from utils.randomizer import RandomizerSimple
+    results = {}
+    for method in ('AStar', 'WHCAvStar'):
+        instance = InstanceGenerator(seed=42).generate_simple_warehouse(num_bots=10)
+        instance.randomizer = RandomizerSimple(42)
+        instance.controller_config['pathfinding'] = {'method': method}
+        instance.setting_config.update({'simulation_duration': 600.0, 'collisions': {'enabled': True}})
+        executor = SimulationExecutor(instance)
+        executor.execute()
+        results[method] = (executor.collision_detector.collisions, executor.dispatcher.trips_completed)
+    (astar_collisions, astar_trips), (collisions, trips) = results['AStar'], results['WHCAvStar']
+    assert astar_collisions > 0 and collisions < astar_collisions / 2
+    assert trips >= 0.9 * astar_trips
+    print("✓ Cooperative planning collision test passed")
+
+
+def test_numpy_fleet_binds_late_bots():
+    """Test that bots created after the executor join the fleet arrays and active sets."""
+    import pickle
+    from core.bot import BotNormal
+    instance, bot, waypoints = _make_line_instance('fixed_step', duration=10.0,
+                                                   kinematics_backend='numpy')
+    executor = SimulationExecutor(instance)
+    fleet, active = executor.fleet, executor.active_bots
+    assert isinstance(bot, BotNormal) and type(bot) is not BotNormal
+
+    late = instance.create_bot(1, instance.compound.tiers[0], waypoints[5].x, waypoints[5].y, 0.3)
+    late.current_waypoint = waypoints[5]
+    assert late in fleet.bots and late in active.available
+    late.path = [waypoints[4], waypoints[3]]
+    assert late in active.moving
+    executor.execute()
+    assert late.current_waypoint is waypoints[3] and late.x == waypoints[3].x
+
+    # Bound bots survive pickling; unbinding restores the plain class and state
+    restored = pickle.loads(pickle.dumps(instance))
+    assert restored.bots[1].x == late.x
+    fleet.remove(late)
+    assert type(late) is BotNormal and late.x == waypoints[3].x
+    print("✓ NumPy fleet late bot test passed")
+
+
+def test_dispatcher_skips_unplaced_bots():
+    """Test that bots without a current waypoint do not stall dispatching."""
+    from utils.randomizer import RandomizerSimple
+    instance = InstanceGenerator(seed=42).generate_simple_warehouse(
+        length=30.0, width=20.0, num_bots=3, num_pods=30, num_output_stations=1)
+    instance.randomizer = RandomizerSimple(42)
+    instance.setting_config.update({
+        'simulation_duration': 300.0, 'execution_mode': 'discrete_event',
+        'order_generation': {'enabled': True, 'rate': 0.05},
+    })
+    # Two unroutable bots parked right at the station, where 'nearest' picks them first
+    station = instance.output_stations[0]
+    unplaced = instance.bots[:2]
+    for bot in unplaced:
+        bot.current_waypoint = None
+        bot.x, bot.y = station.x, station.y
+    executor = SimulationExecutor(instance)
+    completed = []
+    executor.event_manager.subscribe(EventType.ORDER_COMPLETED, completed.append)
+    executor.execute()
+    assert completed and executor.dispatcher.trips_completed > 0
+    assert all(bot not in executor.dispatcher.tasks and not bot.path for bot in unplaced)
+    print("✓ Dispatcher unplaced bots test passed")
+
+
+if __name__ == '__main__':
+    print("Running simulation tests...\n")
+
+    test_event_queue_ordering()
+    test_event_manager_subscriptions()
+    test_discrete_event_bot_travel()
+    test_discrete_event_matches_fixed_step()
+    test_scheduled_events_in_fixed_step()
+    test_numpy_kinematics_matches_python()
+    test_numpy_fleet_binds_late_bots()
+    test_active_set_transitions()
+    test_adaptive_step_on_long_segments()
+    test_checkpoint_fork_continues_identically()
+    test_control_server_commands()
+    test_benchmark_measure_and_compare()
+    test_poisson_order_stream()
+    test_dispatcher_fulfills_orders()
+    test_dispatcher_skips_unplaced_bots()
+    test_collision_detection_and_penalty()
+    test_cooperative_planning_reduces_collisions()
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_sweep_reuses_cached_results(pathlib.Path(tmp))
+        test_event_log_replay(pathlib.Path(tmp))
+        test_profiler_phase_breakdown(pathlib.Path(tmp))
+
+    print("\n✓ All simulation tests passed!")
@@ -0,0 +1,80 @@
+"""Tests for statistics tracking and aggregation."""
+
+import sys
+sys.path.insert(0, '.')
+
+import random
+
+from generator.instance_generator import InstanceGenerator
+from statistics.metrics import PerformanceMetrics
+from statistics.steady_state import SteadyStateDetector, mser_truncation
+from statistics.tracker import StatisticsTracker
+
+
+def test_replication_confidence_intervals():
+    """Test per-metric aggregation of replication summaries."""
+    summaries = [
+        {'average_throughput': 10.0, 'total_orders': 4, 'seed': True},
+        {'average_throughput': 12.0, 'total_orders': 6, 'seed': True},
+        {'average_throughput': 14.0, 'total_orders': 5, 'seed': True},
+    ]
+    report = PerformanceMetrics.aggregate_replications(summaries, confidence=0.95)
+
+    assert set(report) == {'average_throughput', 'total_orders'}
+    throughput = report['average_throughput']
+    assert throughput['n'] == 3
+    assert abs(throughput['mean'] - 12.0) < 1e-12
+    assert abs(throughput['std'] - 2.0) < 1e-12
+    # t(0.975, 2) = 4.3027 -> half width 4.3027 * 2 / sqrt(3)
+    assert abs((throughput['ci_high'] - throughput['mean']) - 4.9683) < 1e-3
+    assert abs(throughput['mean'] - throughput['ci_low'] - 4.9683) < 1e-3
+
+    single = PerformanceMetrics.aggregate_replications(summaries[:1])
+    assert single['total_orders']['ci_low'] is None
+    print("✓ Replication confidence interval test passed")
+
+
+def test_mser_truncation_and_stopping_rule():
+    """Test warm-up detection and the relative-precision stopping rule."""
+    rng = random.Random(1)
+    warmup = [2.0 * (1 - i / 50) + rng.gauss(0, 0.1) for i in range(50)]
+    steady = [rng.gauss(1.0, 0.1) for _ in range(450)]
+    series = warmup + steady
+
+    truncation = mser_truncation(series)
+    assert 30 <= truncation <= 80
+
+    detector = SteadyStateDetector(relative_precision=0.02)
+    assert not detector.check(series[:60])
+    assert detector.check(series)
+    assert abs(detector.estimate - 1.0) < 0.02
+    assert detector.relative_half_width() <= 0.02
+    print("✓ MSER truncation and stopping rule test passed")
+
+
+def test_summary_excludes_warmup():
+    """Test that average throughput is taken over the steady state only."""
+    instance = InstanceGenerator(seed=1).generate_simple_warehouse(length=20.0, width=10.0,
+                                                                   num_bots=2, num_pods=0)
+    tracker = StatisticsTracker(instance)
+    station = instance.output_stations[0]
+    for snapshot in range(1, 101):
+        if snapshot > 20:
+            station.orders_completed += 5
+        tracker.record_snapshot(10.0 * snapshot)
+
+    summary = tracker.get_summary()
+    assert abs(summary['average_throughput'] - 0.5) < 1e-9
+    assert 150.0 <= summary['warmup_time'] <= 250.0
+    assert tracker.throughput[-1] < 0.5  # Cumulative average still carries the warm-up
+    print("✓ Summary warm-up exclusion test passed")
+
+
+if __name__ == '__main__':
+    print("Running statistics tests...\n")
+
+    test_replication_confidence_intervals()
+    test_mser_truncation_and_stopping_rule()
+    test_summary_excludes_warmup()
+
+    print("\n✓ All statistics tests passed!")
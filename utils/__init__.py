@@ -1,7 +1,8 @@
 """Utility functions and helpers."""
 
 from .geometry import GeometryHelper
+from .spatial_hash import SpatialHash
 from .randomizer import RandomizerSimple
 from .logger import setup_logger
 
-__all__ = ['GeometryHelper', 'RandomizerSimple', 'setup_logger']
+__all__ = ['GeometryHelper', 'SpatialHash', 'RandomizerSimple', 'setup_logger']
@@ -3,6 +3,8 @@
 import math
 from typing import Tuple
 
+import numpy as np
+
 
 class GeometryHelper:
     """Helper functions for geometric calculations."""
@@ -38,6 +40,40 @@ class GeometryHelper:
         distance = GeometryHelper.distance(x1, y1, x2, y2)
         return distance < (r1 + r2)
 
+    @staticmethod
+    def circles_overlap(x1: np.ndarray, y1: np.ndarray, r1: np.ndarray,
+                        x2: np.ndarray, y2: np.ndarray, r2: np.ndarray) -> np.ndarray:
+        """Vectorized circles_intersect over arrays of circle pairs."""
+        dx = x2 - x1
+        dy = y2 - y1
+        reach = r1 + r2
+        return dx * dx + dy * dy < reach * reach
+
+    @staticmethod
+    def swept_circles_intersect(ax0: np.ndarray, ay0: np.ndarray, ax1: np.ndarray, ay1: np.ndarray,
+                                bx0: np.ndarray, by0: np.ndarray, bx1: np.ndarray, by1: np.ndarray,
+                                reach: np.ndarray) -> np.ndarray:
+        """Check whether pairs of circles touch while moving linearly from 0 to 1.
+
+        Circle a moves from (ax0, ay0) to (ax1, ay1) and b from (bx0, by0)
+        to (bx1, by1) over the same interval. Pairs touch if the smallest
+        center distance during the motion is below ``reach`` (the sum of
+        radii), so fast movers cannot pass through each other between two
+        samples. All arguments are arrays of equal length (or scalars).
+        """
+        # Relative position and its change over the interval
+        dx = bx0 - ax0
+        dy = by0 - ay0
+        vx = (bx1 - bx0) - (ax1 - ax0)
+        vy = (by1 - by0) - (ay1 - ay0)
+        vv = vx * vx + vy * vy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(vv > 0.0, -(dx * vx + dy * vy) / vv, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        cx = dx + t * vx
+        cy = dy + t * vy
+        return cx * cx + cy * cy < reach * reach
+
     @staticmethod
     def point_in_rectangle(px: float, py: float,
                           rect_x: float, rect_y: float,
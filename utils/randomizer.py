@@ -1,44 +1,117 @@
 """Random number generation for simulation."""
 
-import random
-from typing import List, TypeVar, Optional
+from typing import Any, Dict, List, TypeVar, Optional
+import zlib
+
+import numpy as np
 
 T = TypeVar('T')
 
 
 class RandomizerSimple:
-    """Simple randomizer for deterministic simulation."""
+    """Deterministic randomizer with named, independent random streams.
+
+    Every stream is a NumPy ``Generator`` seeded from the master seed and the
+    stream name, so draws on one stream never shift another: adding a random
+    decision to a controller leaves order arrivals and bot placement intact.
+    Streams are created on first use and do not depend on creation order.
+
+    Well-known streams are ``order_arrivals``, ``sku_choice``,
+    ``bot_placement`` and ``controller``; any other name works as well. The
+    scalar helpers draw from the ``default`` stream unless told otherwise,
+    and ``stream(name)`` exposes the generator for bulk draws.
+    """
+
+    ORDER_ARRIVALS = 'order_arrivals'
+    SKU_CHOICE = 'sku_choice'
+    BOT_PLACEMENT = 'bot_placement'
+    CONTROLLER = 'controller'
+    DEFAULT = 'default'
 
     def __init__(self, seed: int = None):
         self.seed = seed
-        if seed is not None:
-            random.seed(seed)
+        self._entropy = np.random.SeedSequence(seed).entropy
+        self._streams: Dict[str, np.random.Generator] = {}
 
-    def next_int(self, min_val: int, max_val: int) -> int:
+    def stream(self, name: str = DEFAULT) -> np.random.Generator:
+        """Get the generator of a named stream."""
+        generator = self._streams.get(name)
+        if generator is None:
+            sequence = np.random.SeedSequence(self._entropy,
+                                              spawn_key=(zlib.crc32(name.encode()),))
+            generator = np.random.Generator(np.random.PCG64(sequence))
+            self._streams[name] = generator
+        return generator
+
+    def next_int(self, min_val: int, max_val: int, stream: str = DEFAULT) -> int:
         """Generate random integer in range [min_val, max_val]."""
-        return random.randint(min_val, max_val)
+        return int(self.stream(stream).integers(min_val, max_val, endpoint=True))
 
-    def next_float(self, min_val: float = 0.0, max_val: float = 1.0) -> float:
+    def next_float(self, min_val: float = 0.0, max_val: float = 1.0, stream: str = DEFAULT) -> float:
         """Generate random float in range [min_val, max_val]."""
-        return random.uniform(min_val, max_val)
+        return float(self.stream(stream).uniform(min_val, max_val))
 
-    def next_bool(self, probability: float = 0.5) -> bool:
+    def next_bool(self, probability: float = 0.5, stream: str = DEFAULT) -> bool:
         """Generate random boolean with given probability of True."""
-        return random.random() < probability
+        return bool(self.stream(stream).random() < probability)
 
-    def choice(self, items: List[T]) -> Optional[T]:
+    def choice(self, items: List[T], stream: str = DEFAULT) -> Optional[T]:
         """Choose random item from list."""
         if not items:
             return None
-        return random.choice(items)
+        return items[int(self.stream(stream).integers(len(items)))]
 
-    def shuffle(self, items: List[T]) -> List[T]:
+    def shuffle(self, items: List[T], stream: str = DEFAULT) -> List[T]:
         """Shuffle list in-place and return it."""
-        random.shuffle(items)
+        order = self.stream(stream).permutation(len(items))
+        items[:] = [items[i] for i in order]
         return items
 
-    def sample(self, items: List[T], k: int) -> List[T]:
+    def sample(self, items: List[T], k: int, stream: str = DEFAULT) -> List[T]:
         """Sample k items from list without replacement."""
         if k > len(items):
             k = len(items)
-        return random.sample(items, k)
+        indices = self.stream(stream).choice(len(items), size=k, replace=False)
+        return [items[i] for i in indices]
+
+    # --- Bulk draws ---------------------------------------------------------
+
+    def next_ints(self, count: int, min_val: int, max_val: int, stream: str = DEFAULT) -> np.ndarray:
+        """Generate count random integers in range [min_val, max_val]."""
+        return self.stream(stream).integers(min_val, max_val, size=count, endpoint=True)
+
+    def next_floats(self, count: int, min_val: float = 0.0, max_val: float = 1.0,
+                    stream: str = DEFAULT) -> np.ndarray:
+        """Generate count random floats in range [min_val, max_val]."""
+        return self.stream(stream).uniform(min_val, max_val, size=count)
+
+    def next_exponentials(self, count: int, mean: float, stream: str = DEFAULT) -> np.ndarray:
+        """Generate count exponentially distributed values with the given mean."""
+        return self.stream(stream).exponential(mean, size=count)
+
+    def choice_indices(self, count: int, size: int, probabilities: Optional[np.ndarray] = None,
+                       stream: str = DEFAULT) -> np.ndarray:
+        """Draw count indices in [0, size), optionally weighted."""
+        return self.stream(stream).choice(size, size=count, p=probabilities)
+
+    # --- State --------------------------------------------------------------
+
+    def get_state(self) -> Dict[str, Any]:
+        """Capture the state of all streams created so far."""
+        return {
+            'seed': self.seed,
+            'entropy': self._entropy,
+            'streams': {name: generator.bit_generator.state
+                        for name, generator in self._streams.items()},
+        }
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restore a state captured with get_state."""
+        self.seed = state['seed']
+        self._entropy = state['entropy']
+        self._streams = {}
+        for name, stream_state in state['streams'].items():
+            self.stream(name).bit_generator.state = stream_state
+
+    def __repr__(self):
+        return f"RandomizerSimple(seed={self.seed}, streams={sorted(self._streams)})"
@@ -0,0 +1,99 @@
+"""Uniform-grid spatial hashing."""
+
+from typing import Dict, Hashable, Iterator, Optional, Tuple
+import math
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """Buckets keyed objects by position in a uniform grid of square cells.
+
+    Objects are stored per cell, so a neighbourhood query only visits the
+    cells overlapping the query box. ``move`` only touches the grid when an
+    object changes cells, which makes incremental per-tick updates O(moved
+    objects). Choose a cell size around the typical query extent.
+    """
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Dict[Hashable, None]] = {}
+        self._where: Dict[Hashable, Cell] = {}
+
+    def cell(self, x: float, y: float) -> Cell:
+        """Grid cell containing a point."""
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def insert(self, key: Hashable, x: float, y: float):
+        """Add an object (or move it if already present)."""
+        self.move(key, x, y)
+
+    def move(self, key: Hashable, x: float, y: float) -> bool:
+        """Update the position of an object; returns whether it changed cells."""
+        cell = self.cell(x, y)
+        previous = self._where.get(key)
+        if previous == cell:
+            return False
+        if previous is not None:
+            bucket = self._cells[previous]
+            del bucket[key]
+            if not bucket:
+                del self._cells[previous]
+        self._cells.setdefault(cell, {})[key] = None
+        self._where[key] = cell
+        return True
+
+    def remove(self, key: Hashable):
+        """Remove an object."""
+        cell = self._where.pop(key, None)
+        if cell is not None:
+            bucket = self._cells[cell]
+            del bucket[key]
+            if not bucket:
+                del self._cells[cell]
+
+    def query_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Iterator[Hashable]:
+        """Objects in all cells overlapping a box (a superset of those inside it)."""
+        min_cx, min_cy = self.cell(min_x, min_y)
+        max_cx, max_cy = self.cell(max_x, max_y)
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query(self, x: float, y: float, radius: float) -> Iterator[Hashable]:
+        """Objects in the cells around a point (a superset of those within radius)."""
+        return self.query_box(x - radius, y - radius, x + radius, y + radius)
+
+    def candidate_pairs(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        """Every pair of objects in the same or adjacent cells, each pair once."""
+        cells = self._cells
+        for (cx, cy), bucket in cells.items():
+            keys = list(bucket)
+            for i, a in enumerate(keys):
+                for b in keys[i + 1:]:
+                    yield a, b
+            # Forward half of the neighbourhood so each cell pair is visited once
+            for dx, dy in ((1, -1), (1, 0), (1, 1), (0, 1)):
+                neighbour = cells.get((cx + dx, cy + dy))
+                if neighbour:
+                    for a in keys:
+                        for b in neighbour:
+                            yield a, b
+
+    def cell_of(self, key: Hashable) -> Optional[Cell]:
+        """Cell an object is stored in."""
+        return self._where.get(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __repr__(self):
+        return f"SpatialHash(cell_size={self.cell_size}, objects={len(self._where)}, cells={len(self._cells)})"
@@ -7,6 +7,7 @@ import argparse
 from config.loader import ConfigLoader
 from generator.instance_generator import InstanceGenerator
 from visualization.pygame_renderer import PygameRenderer
+from simulation.event_log import EventLogReplayer
 from utils.logger import setup_logger
 from utils.randomizer import RandomizerSimple
 
@@ -23,6 +24,8 @@ def main():
     parser.add_argument('--width', type=int, default=1200, help='Window width')
     parser.add_argument('--height', type=int, default=800, help='Window height')
     parser.add_argument('--generate', action='store_true', help='Generate default instance')
+    parser.add_argument('--replay', type=str, metavar='LOG',
+                        help='Play back an event log recorded with cli.py --event-log')
     
     args = parser.parse_args()
     
@@ -54,8 +57,14 @@ def main():
         logger.info(f"Bots: {len(instance.bots)}, Pods: {len(instance.pods)}")
         logger.info("Starting visualization...")
         
+        # Replays only need the layout; controllers are never run
+        replay = None
+        if args.replay:
+            logger.info(f"Replaying event log {args.replay}")
+            replay = EventLogReplayer(args.replay, instance=instance)
+        
         # Create and run renderer
-        renderer = PygameRenderer(instance, width=args.width, height=args.height)
+        renderer = PygameRenderer(instance, width=args.width, height=args.height, replay=replay)
         renderer.run()
         
     except Exception as e:
@@ -2,10 +2,11 @@
 
 import pygame
 import sys
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from core.instance import Instance
+    from simulation.event_log import EventLogReplayer
 
 from simulation.executor import SimulationExecutor
 from statistics.tracker import StatisticsTracker
@@ -14,8 +15,10 @@ from statistics.tracker import StatisticsTracker
 class PygameRenderer:
     """2D visualization using Pygame."""
 
-    def __init__(self, instance: 'Instance', width: int = 1200, height: int = 800):
+    def __init__(self, instance: 'Instance', width: int = 1200, height: int = 800,
+                 replay: Optional['EventLogReplayer'] = None):
         self.instance = instance
+        self.replay = replay
         self.width = width
         self.height = height
         
@@ -91,8 +94,15 @@ class PygameRenderer:
             # Update simulation
             if not self.paused:
                 for _ in range(int(self.speed)):
-                    self.executor.step()
-                    if self.executor.current_time >= self.executor.max_time:
+                    if self.replay is not None:
+                        # Play back logged movement instead of simulating
+                        self.executor.current_time += self.executor.time_step
+                        self.replay.advance_to(self.executor.current_time)
+                        finished = self.replay.finished
+                    else:
+                        self.executor.step()
+                        finished = self.executor.current_time >= self.executor.max_time
+                    if finished:
                         running = False
                         break
                 